@@ -0,0 +1,184 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+from app_logging import get_logger
+
+log = get_logger("allan")
+
+GAS_VARIABLES = ("CH4 (ppb)", "CO2 (ppm)", "H2O (ppm)")
+GAP_FACTOR = 1.5  # Samples further apart than this many sample intervals start a new segment
+POLL_MS = 100
+
+
+def sample_interval(seconds):
+    """Median spacing of `seconds`, the instrument's nominal sample period (1.0 if unknown)."""
+    dt = np.diff(seconds)
+    dt = dt[dt > 0]
+    return float(np.median(dt)) if dt.size else 1.0
+
+
+def allan_deviation(values, breaks=(), overlapping=True):
+    """
+    Allan deviation of evenly sampled `values` at every octave averaging factor m = 1, 2, 4, ...
+
+    NaNs and the row indices in `breaks` split the data into contiguous segments; no difference
+    spans two segments. Each segment's phase is one cumulative sum, after which every m costs a
+    single vectorized pass. Returns (m, adev, count) arrays, count being the number of second
+    differences averaged for each m; multiply m by the sample interval to get tau.
+    """
+    y = np.asarray(values, dtype=float)
+    valid = ~np.isnan(y)
+    new_segment = valid.copy()
+    new_segment[1:] &= ~valid[:-1]
+    breaks = np.asarray(breaks, dtype=int)
+    breaks = breaks[(breaks > 0) & (breaks < len(y))]
+    new_segment[breaks] = valid[breaks]
+
+    v = y[valid]
+    if not v.size:
+        return np.empty(0, dtype=int), np.empty(0), np.empty(0, dtype=int)
+    v = v - v.mean()  # Keeps the running sums small; ADEV ignores a constant offset
+
+    starts = np.flatnonzero(new_segment[valid])
+    lengths = np.diff(np.r_[starts, v.size])
+
+    # Phase of each segment: x_j = sum of its first j values, j = 0..length
+    cumulative = np.r_[0.0, np.cumsum(v)]
+    base = np.repeat(starts, lengths + 1)
+    offset = np.arange(base.size) - np.repeat(np.r_[0, np.cumsum(lengths + 1)[:-1]], lengths + 1)
+    phase = cumulative[base + offset] - cumulative[base]
+    room = np.repeat(lengths, lengths + 1) - offset  # Samples left in the segment after each phase point
+
+    factors, adev, counts = [], [], []
+    m = 1
+    while 2 * m <= lengths.max():
+        usable = room >= 2 * m
+        if not overlapping:
+            usable &= offset % m == 0
+        i = np.flatnonzero(usable)
+        if i.size:
+            second = phase[i + 2 * m] - 2 * phase[i + m] + phase[i]
+            factors.append(m)
+            adev.append(np.sqrt(np.dot(second, second) / (2.0 * m * m * i.size)))
+            counts.append(i.size)
+        m *= 2
+    return np.asarray(factors, dtype=int), np.asarray(adev), np.asarray(counts, dtype=int)
+
+
+def span_allan_deviation(dataset, variable, spans, within=None, overlapping=True):
+    """
+    Allan deviation of `variable` over the running periods of `spans` (optionally clipped to the
+    (t0, t1) window `within`). Periods and time gaps longer than GAP_FACTOR sample intervals are
+    separate segments. Returns {"tau", "adev", "count"}, empty when there is too little data.
+    """
+    ranges = dataset.span_ranges(spans, within=within)
+    seconds = np.concatenate([dataset.seconds[a:b] for a, b in ranges]) if ranges else np.empty(0)
+    values = np.asarray(dataset.take(variable, ranges), dtype=float)
+
+    tau0 = sample_interval(seconds)
+    range_starts = np.cumsum([0] + [b - a for a, b in ranges[:-1]])
+    gaps = np.flatnonzero(np.diff(seconds) > GAP_FACTOR * tau0) + 1
+    factors, adev, counts = allan_deviation(values, np.r_[range_starts, gaps], overlapping)
+    log.debug("Allan deviation of %s: %d rows, %d segment break(s), %d tau value(s)",
+              variable, values.size, len(range_starts) + gaps.size, factors.size)
+    return {"tau": factors * tau0, "adev": adev, "count": counts}
+
+
+def compute_allan(dataset, variables, spans, within=None, overlapping=True):
+    """span_allan_deviation for each of `variables`, as {variable: result}."""
+    return {var: span_allan_deviation(dataset, var, spans, within, overlapping) for var in variables}
+
+
+def embed_allan_plot(parent_frame, dataset, spans, variables=None, within=None):
+    """
+    Log-log Allan deviation window for `variables` (the gas channels by default) over running periods.
+    The deviations are computed on a worker thread so the viewer stays responsive.
+    """
+    if variables is None:
+        variables = [var for var in GAS_VARIABLES if var in dataset]
+    if not variables:
+        raise ValueError("None of the gas channels are in the loaded data.")
+
+    fig = plt.figure(figsize=(7, 5))
+    ax = fig.add_subplot(111)
+
+    controls = tk.Frame(parent_frame)
+    controls.pack(side='top', fill='x', padx=5, pady=5)
+    overlapping_var = tk.BooleanVar(value=True)
+    status_var = tk.StringVar()
+    tk.Label(controls, textvariable=status_var).pack(side='right', padx=5)
+
+    canvas = FigureCanvasTkAgg(fig, master=parent_frame)
+    canvas.get_tk_widget().pack(fill='both', expand=True)
+    toolbar = NavigationToolbar2Tk(canvas, parent_frame)
+    toolbar.update()
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    pending = None
+    rerun = False
+    closed = False  # Set once the window is destroyed; a late result is then dropped
+
+    def draw(results):
+        ax.clear()
+        for var, result in results.items():
+            if not result["tau"].size:
+                continue
+            best = int(np.argmin(result["adev"]))
+            line, = ax.loglog(result["tau"], result["adev"], marker='o', markersize=3,
+                              label=f"{var}: min {result['adev'][best]:.3g} at {result['tau'][best]:g} s")
+            ax.plot(result["tau"][best], result["adev"][best], marker='*', markersize=12, color=line.get_color())
+        ax.set_xlabel("Averaging time τ (s)")
+        ax.set_ylabel("Allan deviation")
+        kind = "Overlapping Allan" if overlapping_var.get() else "Allan"
+        ax.set_title(f"{kind} deviation over running periods")
+        ax.grid(True, which='both', alpha=0.4)
+        if ax.get_lines():
+            ax.legend(fontsize=8)
+        canvas.draw_idle()
+
+    def poll():
+        nonlocal pending, rerun
+        if closed:
+            return
+        if not pending.done():
+            parent_frame.after(POLL_MS, poll)
+            return
+        future, pending = pending, None
+        if rerun:  # Settings changed while computing; only the latest result is drawn
+            rerun = False
+            recompute()
+            return
+        try:
+            results = future.result()
+        except Exception as e:
+            log.error("❌ Allan deviation failed: %s", e)
+            status_var.set(f"Failed: {e}")
+            return
+        status_var.set("")
+        draw(results)
+
+    def recompute():
+        nonlocal pending, rerun
+        if pending is not None:
+            rerun = True
+            return
+        status_var.set("Computing…")
+        pending = pool.submit(compute_allan, dataset, list(variables), list(spans), within, overlapping_var.get())
+        parent_frame.after(POLL_MS, poll)
+
+    tk.Checkbutton(controls, text="Overlapping", variable=overlapping_var, command=recompute).pack(side='left')
+
+    def on_destroy(event):
+        nonlocal closed
+        if event.widget is parent_frame:
+            closed = True
+            pool.shutdown(wait=False, cancel_futures=True)
+            plt.close(fig)
+
+    parent_frame.bind("<Destroy>", on_destroy, add="+")
+
+    recompute()
+    return fig
@@ -0,0 +1,53 @@
+import os
+import logging
+from logging.handlers import RotatingFileHandler
+
+LOGGER_NAME = "li7800"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+# Environment overrides, e.g. LI7800_LOG_LEVEL=DEBUG LI7800_LOG_FILE=viewer.log
+LEVEL_ENV = "LI7800_LOG_LEVEL"
+FILE_ENV = "LI7800_LOG_FILE"
+
+
+def get_logger(name=None):
+    """Return the application logger, or a child of it (e.g. get_logger('parsing'))."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def configure_logging(level=None, log_file=None, max_bytes=5 * 1024 * 1024, backup_count=3):
+    """
+    Configure the application logger. Only warnings reach the console by default; pass a level
+    (or set LI7800_LOG_LEVEL) for more detail, and a path (or LI7800_LOG_FILE) for a rotating file sink.
+    """
+    level = level or os.getenv(LEVEL_ENV, "WARNING")
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.WARNING
+    log_file = log_file or os.getenv(FILE_ENV)
+
+    logger = get_logger()
+    logger.setLevel(level)
+    logger.propagate = False
+
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    console = logging.StreamHandler()
+    console.setFormatter(formatter)
+    logger.addHandler(console)
+
+    if log_file:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+            file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            file_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
+        except OSError as e:
+            logger.warning("⚠️ Could not open log file %s: %s", log_file, e)
+
+    return logger
@@ -0,0 +1,14 @@
+"""
+Benchmark suite for the 7800 Data Viewer.
+
+Run from the `scripts` directory:
+
+    python -m benchmarks.run --rows 10000 100000 --output bench.json
+"""
+import os
+import sys
+
+# The viewer modules live next to this package and import each other as top-level modules
+_SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
@@ -0,0 +1,183 @@
+import os
+import io
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+import statistics
+import contextlib
+
+import matplotlib
+matplotlib.use("Agg")  # Headless: no Tk window is ever created
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from benchmarks.synthetic import generate_file_set, load_model_columns
+from benchmarks.startup import measure_startup
+from file_parsing import parse_7800_data_file, load_and_merge_files, clean_error_codes
+from manipulation import (insert_nan_gaps, identify_operational_spans, identify_spans_per_file, update_spec_checks,
+                          build_stats_index, rolling_stats, span_boundaries)
+from dataset import Dataset
+
+TIME_COL = "SECONDS (secs)"
+
+
+def time_call(func, setup=None, repeat=3):
+    """Time `func(*setup())` `repeat` times, excluding setup, with the viewer's console output discarded."""
+    times = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func(*args)
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def bench_size(workdir, rows, n_files, repeat, seed):
+    """Run every benchmark against one generated file set of `rows` total rows."""
+    rows_per_file = max(rows // n_files, 1)
+    paths = generate_file_set(os.path.join(workdir, str(rows)), n_files=n_files, rows_per_file=rows_per_file,
+                              seed=seed, n_cycles=2)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        merged, model, _ = load_and_merge_files(paths)
+        cleaned = clean_error_codes(merged.copy())
+        spans = identify_operational_spans(cleaned)
+        cleaned_frames = [clean_error_codes(parse_7800_data_file(p)[0]) for p in paths]
+    config = load_model_columns(model)
+
+    fig = Figure()
+    ax = fig.add_subplot()
+    ax.set_xlim(cleaned[TIME_COL].min(), cleaned[TIME_COL].max())
+
+    stats_index = build_stats_index(cleaned, config)
+    dataset = Dataset(cleaned, TIME_COL)
+
+    x = cleaned[TIME_COL].to_numpy()
+    y = cleaned["CH4 (ppb)"].to_numpy()
+    first = cleaned_frames[0][TIME_COL]
+    hour = (first.median(), first.median() + 3600)  # One hour from the middle of the first file
+
+    cases = {
+        "parse_7800_data_file": (lambda: parse_7800_data_file(paths[0]), None),
+        "load_and_merge_files": (lambda: load_and_merge_files(paths), None),
+        "parse_7800_data_file[1h]": (lambda: parse_7800_data_file(paths[0], time_range=hour), None),
+        "load_and_merge_files[1h]": (lambda: load_and_merge_files(paths, time_range=hour), None),
+        "clean_error_codes": (clean_error_codes, lambda: (merged.copy(),)),
+        "insert_nan_gaps": (lambda: insert_nan_gaps(x, y, threshold=2), None),
+        "rolling_stats[1h]": (lambda: rolling_stats(x, y, 3600, span_boundaries(spans)), None),
+        "identify_operational_spans": (lambda: identify_operational_spans(cleaned), None),
+        "identify_spans_per_file": (lambda: identify_spans_per_file(cleaned_frames), None),
+        "update_spec_checks[None]": (lambda: update_spec_checks(ax, cleaned, config, spans, {}, "None"), None),
+        "update_spec_checks[Running]": (lambda: update_spec_checks(ax, cleaned, config, spans, {}, "Running"), None),
+        "update_spec_checks[IQR]": (lambda: update_spec_checks(ax, cleaned, config, spans, {}, "IQR"), None),
+        "Dataset": (lambda: Dataset(cleaned, TIME_COL), None),
+        "update_spec_checks[IQR,dataset]": (
+            lambda: update_spec_checks(ax, dataset, config, spans, {}, "IQR"), None),
+        "build_stats_index": (lambda: build_stats_index(cleaned, config), None),
+        "update_spec_checks[None,indexed]": (
+            lambda: update_spec_checks(ax, cleaned, config, spans, {}, "None", stats_index=stats_index), None),
+        "update_spec_checks[Running,indexed]": (
+            lambda: update_spec_checks(ax, cleaned, config, spans, {}, "Running", stats_index=stats_index), None),
+    }
+
+    results = []
+    for name, (func, setup) in cases.items():
+        times = time_call(func, setup, repeat)
+        results.append({
+            "name": name,
+            "rows": int(len(merged)),
+            "files": n_files,
+            "repeat": repeat,
+            "best": min(times),
+            "median": statistics.median(times),
+            "times": times,
+        })
+        print(f"  {name:<36} rows={len(merged):>9}  best={min(times):9.4f}s  median={statistics.median(times):9.4f}s")
+    return results
+
+
+def run_suite(sizes, n_files=3, repeat=3, seed=0, workdir=None):
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        results = []
+        for rows in sizes:
+            print(f"📏 {rows} rows across {n_files} files")
+            results += bench_size(tmp, rows, n_files, repeat, seed)
+
+    startup = measure_startup(show_window=False, repeat=repeat)
+    results.append({"name": "launcher_import", "rows": 0, "files": 0, "repeat": repeat,
+                    "best": startup["import"], "median": startup["import"], "times": [startup["import"]]})
+    print(f"  {'launcher_import':<36} best={startup['import']:9.4f}s")
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": {"numpy": np.__version__, "pandas": pd.__version__, "matplotlib": matplotlib.__version__},
+        "results": results,
+    }
+
+
+def compare_results(current, baseline, tolerance):
+    """Print per-benchmark ratios against a previous run and return the names that regressed."""
+    previous = {(r["name"], r["rows"]): r for r in baseline.get("results", [])}
+    regressions = []
+    print(f"\n🔁 Compared with {baseline.get('commit') or 'baseline'}:")
+    for r in current["results"]:
+        old = previous.get((r["name"], r["rows"]))
+        if not old or not old["best"]:
+            continue
+        ratio = r["best"] / old["best"]
+        flag = ""
+        if ratio > tolerance:
+            flag = "  ❌ regression"
+            regressions.append(f"{r['name']}@{r['rows']}")
+        print(f"  {r['name']:<36} rows={r['rows']:>9}  {old['best']:9.4f}s -> {r['best']:9.4f}s  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the 7800 Data Viewer processing pipeline")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000], help="Total rows per file set")
+    parser.add_argument("--files", type=int, default=3, help="Files per file set")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="Slowdown ratio above which a benchmark counts as a regression")
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.rows, args.files, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare_results(current, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
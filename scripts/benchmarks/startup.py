@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+from benchmarks import _SCRIPTS_DIR
+
+# Modules that must not be imported before the first plot is opened
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "pytz", "data_processing"]
+
+# Runs in a fresh interpreter so nothing is already cached in sys.modules
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import sim_gui
+imported = time.perf_counter() - start
+shown = None
+if sys.argv[1] == "1":
+    import tkinter as tk
+    root = tk.Tk()
+    sim_gui.App(root)
+    root.update()
+    shown = time.perf_counter() - start
+    root.destroy()
+print(json.dumps({"import": imported, "shown": shown, "loaded": [m for m in sys.argv[2:] if m in sys.modules]}))
+"""
+
+
+def has_display():
+    return sys.platform in ("win32", "darwin") or bool(os.getenv("DISPLAY") or os.getenv("WAYLAND_DISPLAY"))
+
+
+def measure_startup(show_window=None, repeat=3):
+    """Return the best launcher import (and, with a display, first-draw) time over `repeat` fresh processes."""
+    show_window = has_display() if show_window is None else show_window
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _PROBE, "1" if show_window else "0", *HEAVY_MODULES],
+                             capture_output=True, text=True, cwd=_SCRIPTS_DIR, check=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    best = min(runs, key=lambda r: r["import"])
+    return {
+        "import": min(r["import"] for r in runs),
+        "shown": min(r["shown"] for r in runs) if show_window else None,
+        "loaded": best["loaded"],
+    }
+
+
+def check_startup(budget, repeat=3, show_window=None):
+    """Return a list of budget violations (empty when the launcher starts within budget)."""
+    result = measure_startup(show_window, repeat)
+    problems = []
+    elapsed = result["shown"] if result["shown"] is not None else result["import"]
+    if elapsed > budget:
+        problems.append(f"launcher took {elapsed:.3f}s (budget {budget:.3f}s)")
+    if result["loaded"]:
+        problems.append(f"heavy modules imported at startup: {', '.join(result['loaded'])}")
+    return result, problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the launcher startup-time budget")
+    parser.add_argument("--budget", type=float, default=0.5, help="Seconds allowed until the launcher is ready")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--headless", action="store_true", help="Only time the imports, never create a window")
+    args = parser.parse_args(argv)
+
+    result, problems = check_startup(args.budget, args.repeat, False if args.headless else None)
+    print(f"🚀 import={result['import']:.3f}s" + (f" shown={result['shown']:.3f}s" if result["shown"] else ""))
+    for problem in problems:
+        print(f"❌ {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+import os
+import re
+import json
+import numpy as np
+import pandas as pd
+
+from file_parsing import resource_path
+
+# Columns written ahead of the model's configured variables, as (name, unit)
+LEADING_COLUMNS = [
+    ("SECONDS", "secs"),
+    ("NANOSECONDS", "nsecs"),
+    ("NDX", "index"),
+    ("DIAG", "diag"),
+    ("REMARK", "remark"),
+    ("DATE", "date"),
+    ("TIME", "time"),
+]
+
+# Columns written after the configured variables, as (name, unit, mean, noise)
+TRAILING_COLUMNS = [
+    ("CAVITY_P", "kPa", 39.9, 0.05),
+    ("RESIDUAL", "counts", 2.0, 0.5),
+    ("INPUT_VOLTAGE", "V", 24.0, 0.1),
+    ("CHK", "chk", 100.0, 0.0),
+]
+
+# Temperatures that must ramp through the warm-up thresholds used by identify_operational_spans
+WARMUP_TARGETS = {
+    "CAVITY_T (°C)": 55.2,
+    "THERMAL_ENCLOSURE_T (°C)": 55.0,
+}
+
+ERROR_CODES = [-9999, -8888, -7777]
+
+
+def split_column(col):
+    """Split a configured column such as 'CH4 (ppb)' into ('CH4', 'ppb')."""
+    match = re.match(r"^(.*?)\s*\((.*)\)$", col)
+    if not match:
+        return col, ""
+    return match.group(1), match.group(2)
+
+
+def load_model_columns(model="TG10"):
+    path = resource_path(os.path.join("assets", "defaults", f"{model}.json"))
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_timestamps(rng, n_rows, n_cycles, start, gap_rate, power_off):
+    """Return 1 Hz timestamps with random short gaps and a long power-off gap between cycles."""
+    steps = np.ones(n_rows, dtype=np.int64)
+    gaps = rng.random(n_rows) < gap_rate
+    steps[gaps] = rng.integers(3, 9, size=gaps.sum())
+
+    cycle_of_row = np.minimum(np.arange(n_rows) * n_cycles // max(n_rows, 1), n_cycles - 1)
+    cycle_starts = np.flatnonzero(np.diff(cycle_of_row)) + 1
+    steps[cycle_starts] = power_off
+    steps[0] = 0
+
+    return start + np.cumsum(steps), cycle_of_row
+
+
+def generate_frame(n_rows=10000, n_cycles=2, model="TG10", start=1749636000, seed=0, gap_rate=0.002,
+                   error_rate=0.0005, boot_rows=5, warmup_fraction=0.1, power_off=900, timezone="UTC"):
+    """
+    Build a synthetic LI-7800 data block as a DataFrame of raw (unitless) columns.
+
+    Each power cycle starts with `boot_rows` rows without NDX, then warms the cavity and
+    enclosure temperatures up through the running thresholds over `warmup_fraction` of the cycle.
+    """
+    rng = np.random.default_rng(seed)
+    config = load_model_columns(model)
+
+    seconds, cycle_of_row = build_timestamps(rng, n_rows, n_cycles, start, gap_rate, power_off)
+    row_in_cycle = np.arange(n_rows) - np.searchsorted(cycle_of_row, cycle_of_row)
+    cycle_lengths = np.bincount(cycle_of_row, minlength=n_cycles)[cycle_of_row]
+    warmup_rows = np.maximum((cycle_lengths * warmup_fraction).astype(np.int64), 1)
+    ramp = np.clip(row_in_cycle / warmup_rows, 0.0, 1.0)
+
+    stamps = pd.to_datetime(seconds, unit="s", utc=True).tz_convert(timezone)
+
+    ndx = pd.array(row_in_cycle - boot_rows, dtype="Int64")
+    ndx[row_in_cycle < boot_rows] = pd.NA
+
+    columns = {
+        "SECONDS": seconds,
+        "NANOSECONDS": rng.integers(0, 1_000_000_000, size=n_rows),
+        "NDX": ndx,
+        "DIAG": np.zeros(n_rows, dtype=np.int64),
+        "REMARK": np.full(n_rows, "", dtype=object),
+        "DATE": stamps.strftime("%Y-%m-%d"),
+        "TIME": stamps.strftime("%H:%M:%S"),
+    }
+
+    measured = []
+    for col, settings in config.items():
+        name, _ = split_column(col)
+        low, high = settings.get("typical", [0.0, 1.0])
+        noise = rng.normal(0.0, (high - low) * 0.02 or 0.01, size=n_rows)
+        if col in WARMUP_TARGETS:
+            target = WARMUP_TARGETS[col]
+            values = 25.0 + (target - 25.0) * ramp + noise * 0.01
+        else:
+            values = (low + high) / 2 + noise
+        columns[name] = values
+        measured.append(name)
+
+    for name, _, mean, noise in TRAILING_COLUMNS:
+        columns[name] = mean + rng.normal(0.0, noise, size=n_rows) if noise else np.full(n_rows, mean)
+        measured.append(name)
+
+    df = pd.DataFrame(columns)
+
+    # Sprinkle instrument error codes into the measured columns
+    for name in measured:
+        if name in [split_column(c)[0] for c in WARMUP_TARGETS]:
+            continue  # Keep span detection deterministic
+        hits = rng.random(n_rows) < error_rate
+        if hits.any():
+            df.loc[hits, name] = rng.choice(ERROR_CODES, size=hits.sum())
+
+    return df
+
+
+def header_columns(model="TG10"):
+    config = load_model_columns(model)
+    columns = list(LEADING_COLUMNS)
+    columns += [split_column(col) for col in config]
+    columns += [(name, unit) for name, unit, _, _ in TRAILING_COLUMNS]
+    return columns
+
+
+def write_data_file(path, df, model="TG10", serial=None, version="2.3.8", timezone="UTC"):
+    """Write `df` as a .data file with a metadata block, DATAH/DATAU lines and DATA rows."""
+    serial = serial or f"{model}-01001"
+    columns = header_columns(model)
+    names = [name for name, _ in columns]
+    units = [unit for _, unit in columns]
+
+    first = pd.to_datetime(int(df["SECONDS"].iloc[0]), unit="s", utc=True).tz_convert(timezone)
+
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write("Model:\tLI-7810 CH4/CO2/H2O Trace Gas Analyzer\n")
+        f.write(f"SN:\t{serial}\n")
+        f.write(f"Software Version:\t{version}\n")
+        f.write(f"Timestamp:\t{first.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Timezone:\t{timezone}\n")
+        f.write("DATAH\t" + "\t".join(names) + "\n")
+        f.write("DATAU\t" + "\t".join(units) + "\n")
+
+        body = df[names].copy()
+        body.insert(0, "DATA", "DATA")
+        body.to_csv(f, sep="\t", header=False, index=False, float_format="%.6g", na_rep="", lineterminator="\n")
+
+    return path
+
+
+def generate_data_file(path, n_rows=10000, model="TG10", serial=None, version="2.3.8", timezone="UTC", **kwargs):
+    df = generate_frame(n_rows=n_rows, model=model, timezone=timezone, **kwargs)
+    return write_data_file(path, df, model=model, serial=serial, version=version, timezone=timezone)
+
+
+def generate_file_set(directory, n_files=3, rows_per_file=10000, model="TG10", serial=None, seed=0, **kwargs):
+    """Write `n_files` consecutive files from one instrument and return their paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    start = kwargs.pop("start", 1749636000)
+    for i in range(n_files):
+        df = generate_frame(n_rows=rows_per_file, model=model, start=start, seed=seed + i, **kwargs)
+        path = os.path.join(directory, f"{model}_synthetic_{rows_per_file}_{i:02d}.data")
+        write_data_file(path, df, model=model, serial=serial,
+                        timezone=kwargs.get("timezone", "UTC"))
+        paths.append(path)
+        start = int(df["SECONDS"].iloc[-1]) + kwargs.get("power_off", 900)
+    return paths
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write synthetic LI-7800 .data files")
+    parser.add_argument("directory")
+    parser.add_argument("--files", type=int, default=1)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--cycles", type=int, default=2)
+    parser.add_argument("--model", default="TG10")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for p in generate_file_set(args.directory, args.files, args.rows, args.model, seed=args.seed, n_cycles=args.cycles):
+        print(p)
@@ -0,0 +1,237 @@
+import os
+import sqlite3
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+from app_logging import get_logger
+from file_parsing import read_file_summary, get_local_config_dir, COMPRESSED_EXTENSIONS
+
+log = get_logger("catalog")
+
+CATALOG_VERSION = 1
+DATA_EXTENSIONS = (".data",) + tuple(".data" + ext for ext in COMPRESSED_EXTENSIONS)
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+RESULT_COLUMNS = ("serial", "model", "version", "start", "end", "path")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    serial TEXT,
+    model TEXT,
+    version TEXT,
+    timezone TEXT,
+    start REAL,
+    end REAL,
+    compression TEXT
+);
+CREATE INDEX IF NOT EXISTS files_serial_time ON files (serial, start, end);
+CREATE INDEX IF NOT EXISTS files_model_version ON files (model, version);
+"""
+
+
+def get_catalog_path():
+    return os.path.join(os.path.dirname(get_local_config_dir()), "catalog.sqlite3")
+
+
+def open_catalog(db_path=None):
+    """Connect to the catalog database, creating (or, after a format change, recreating) it."""
+    db_path = db_path or get_catalog_path()
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != CATALOG_VERSION:
+        conn.execute("DROP TABLE IF EXISTS files")
+        conn.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def find_data_files(root):
+    """Every .data file (plain or compressed) below `root`."""
+    found = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith(DATA_EXTENSIONS):
+                found.append(os.path.abspath(os.path.join(dirpath, name)))
+    return found
+
+
+def _summarize(path):
+    try:
+        return read_file_summary(path)
+    except (OSError, ValueError, UnicodeDecodeError, EOFError) as e:
+        log.warning("⚠️ Skipping %s: %s", path, e)
+        return None
+
+
+def scan_directory(root, db_path=None, max_workers=None):
+    """
+    Add every .data file below `root` to the catalog, reading only headers and tails.
+
+    Files whose size and modification time match their catalog entry are not reopened, and entries
+    for files under `root` that no longer exist are removed. Returns (scanned, unchanged, removed).
+    """
+    paths = find_data_files(root)
+    conn = open_catalog(db_path)
+    try:
+        prefix = os.path.join(os.path.abspath(root), "")
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in conn.execute(
+            "SELECT path, mtime_ns, size FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))}
+
+        stale = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if known.get(path) != (stat.st_mtime_ns, stat.st_size):
+                stale.append((path, stat.st_mtime_ns, stat.st_size))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            summaries = list(pool.map(_summarize, [path for path, _, _ in stale]))
+
+        rows = [(path, mtime_ns, size, s["serial"], s["model"], s["version"], s["timezone"],
+                 s["start"], s["end"], s["compression"])
+                for (path, mtime_ns, size), s in zip(stale, summaries) if s is not None]
+        removed = [(path,) for path in set(known) - set(paths)]
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany("DELETE FROM files WHERE path = ?", removed)
+    finally:
+        conn.close()
+
+    log.info("🗂 Cataloged %s: %d scanned, %d unchanged, %d removed", root, len(rows),
+             len(paths) - len(stale), len(removed))
+    return len(rows), len(paths) - len(stale), len(removed)
+
+
+def query_catalog(serial=None, t0=None, t1=None, model=None, version=None, db_path=None):
+    """
+    Catalog entries matching every given filter, ordered by serial and start time.
+
+    A file matches the [t0, t1] window (epoch seconds, either end open) if its time range overlaps it.
+    Returns a list of dicts with the catalog columns.
+    """
+    clauses, params = [], []
+    for column, value in (("serial", serial), ("model", model), ("version", version)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if t0 is not None:
+        clauses.append("end >= ?")
+        params.append(float(t0))  # numpy scalars would not bind as REAL
+    if t1 is not None:
+        clauses.append("start <= ?")
+        params.append(float(t1))
+
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    conn = open_catalog(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(f"SELECT * FROM files{where} ORDER BY serial, start", params).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+def catalog_serials(db_path=None):
+    conn = open_catalog(db_path)
+    try:
+        return [row[0] for row in conn.execute(
+            "SELECT DISTINCT serial FROM files WHERE serial IS NOT NULL ORDER BY serial")]
+    finally:
+        conn.close()
+
+
+def parse_time(text):
+    """Epoch seconds of a 'YYYY-MM-DD[ HH:MM[:SS]]' UTC time, or None for an empty field."""
+    text = text.strip()
+    if not text:
+        return None
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc).timestamp()
+
+
+def format_time(seconds):
+    if seconds is None:
+        return "-"
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime(TIME_FORMAT)
+
+
+def embed_catalog_browser(parent_frame, on_select, db_path=None):
+    """
+    Search the catalog by serial and UTC time window; `on_select(paths)` receives the chosen files.
+    """
+    controls = tk.Frame(parent_frame)
+    controls.pack(side='top', fill='x', padx=5, pady=5)
+
+    tk.Label(controls, text="Serial:").pack(side='left')
+    serial_var = tk.StringVar()
+    serial_box = ttk.Combobox(controls, textvariable=serial_var, state='readonly', width=14)
+    serial_box.pack(side='left', padx=5)
+
+    tk.Label(controls, text="From (UTC):").pack(side='left', padx=(10, 0))
+    start_var = tk.StringVar()
+    tk.Entry(controls, textvariable=start_var, width=20).pack(side='left', padx=5)
+    tk.Label(controls, text="To (UTC):").pack(side='left')
+    end_var = tk.StringVar()
+    tk.Entry(controls, textvariable=end_var, width=20).pack(side='left', padx=5)
+
+    tree = ttk.Treeview(parent_frame, columns=RESULT_COLUMNS, show='headings', selectmode='extended')
+    for col in RESULT_COLUMNS:
+        tree.heading(col, text=col.title())
+        tree.column(col, width=420 if col == "path" else 130, anchor='w' if col == "path" else 'center')
+    tree.pack(side='top', fill='both', expand=True, padx=5, pady=5)
+
+    status_var = tk.StringVar()
+    tk.Label(parent_frame, textvariable=status_var, anchor='w').pack(side='bottom', fill='x', padx=5)
+
+    def refresh_serials():
+        serials = catalog_serials(db_path)
+        serial_box["values"] = [""] + serials
+        status_var.set(f"{len(serials)} serial(s) in catalog")
+
+    def search():
+        try:
+            t0, t1 = parse_time(start_var.get()), parse_time(end_var.get())
+        except ValueError:
+            messagebox.showerror("Invalid Time", "Enter times as YYYY-MM-DD or YYYY-MM-DD HH:MM:SS.")
+            return
+        rows = query_catalog(serial=serial_var.get() or None, t0=t0, t1=t1, db_path=db_path)
+        tree.delete(*tree.get_children())
+        for row in rows:
+            tree.insert("", "end", iid=row["path"], values=(
+                row["serial"], row["model"], row["version"], format_time(row["start"]),
+                format_time(row["end"]), row["path"]))
+        status_var.set(f"{len(rows)} file(s) found")
+
+    def scan_folder():
+        root = filedialog.askdirectory()
+        if not root:
+            return
+        parent_frame.config(cursor="watch")
+        parent_frame.update_idletasks()
+        try:
+            scanned, unchanged, removed = scan_directory(root, db_path)
+        finally:
+            parent_frame.config(cursor="")
+        refresh_serials()
+        status_var.set(f"Scanned {scanned} file(s), {unchanged} unchanged, {removed} removed")
+
+    def use_selected():
+        paths = list(tree.selection()) or list(tree.get_children())
+        missing = [p for p in paths if not os.path.exists(p)]
+        if missing:
+            messagebox.showerror("Missing Files", "Rescan the folder; these files are gone:\n" + "\n".join(missing))
+            return
+        if paths:
+            on_select(paths)
+
+    tk.Button(controls, text="Search", command=search).pack(side='left', padx=5)
+    tk.Button(controls, text="Scan Folder", command=scan_folder).pack(side='left', padx=5)
+    tk.Button(controls, text="Use Selected", command=use_selected).pack(side='left', padx=5)
+
+    refresh_serials()
+    search()
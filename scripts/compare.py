@@ -0,0 +1,261 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+import tkinter as tk
+from tkinter import ttk
+from concurrent.futures import ThreadPoolExecutor
+
+from app_logging import get_logger
+from dataset import Dataset
+from time_axis import HumanTimeFormatter, set_time_axis
+from file_parsing import load_instruments, clean_error_codes, compile_variable_config, set_icon
+from manipulation import identify_operational_spans, minmax_decimate_indices, spec_status
+
+log = get_logger("compare")
+
+DEFAULT_VARIABLE = "CH4 (ppb)"
+MAX_POINTS = 4000  # Per instrument and per redraw
+STAT_COLUMNS = ("serial", "mean", "min", "max", "in_typical", "in_absolute", "status")
+HIDDEN_COLUMNS = ['NANOSECONDS (nsecs)', 'DATE (date)', 'TIME (time)', 'NDX (index)']
+
+
+def _prepare_instrument(serial, df, model, metadata):
+    df = clean_error_codes(df)
+    time_col = next((col for col in df.columns if "SECONDS" in col.upper()), df.columns[0])
+    dataset = Dataset(df, time_col)
+    return {
+        "serial": serial,
+        "model": model,
+        "metadata": metadata,
+        "time_col": time_col,
+        "dataset": dataset,
+        "spans": identify_operational_spans(dataset, time_col=time_col),
+    }
+
+
+def load_comparison(filepaths, master=None, max_workers=None):
+    """
+    Load every instrument in `filepaths` concurrently and prepare it for overlaying.
+
+    Returns one dict per serial (serial, model, metadata, time_col, dataset, spans and the compiled
+    config), in the order the serials first appear.
+    """
+    instruments = load_instruments(filepaths, max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        prepared = list(pool.map(lambda item: _prepare_instrument(item[0], *item[1]), instruments.items()))
+
+    # Config loading may prompt for a missing version, so it stays on the calling (Tk) thread
+    for inst in prepared:
+        version = inst["metadata"].get("Software Version", "0.0.0")
+        inst["compiled"] = compile_variable_config(inst["model"], version, list(inst["dataset"].columns), master)
+
+    log.info("Loaded %d instrument(s) for comparison: %s", len(prepared), ", ".join(i["serial"] for i in prepared))
+    return prepared
+
+
+def shared_time_range(instruments, overlap=False):
+    """Union (or, with `overlap`, intersection) of the instruments' time ranges; None when empty."""
+    ranges = [(np.nanmin(i["dataset"].seconds), np.nanmax(i["dataset"].seconds))
+              for i in instruments if len(i["dataset"])]
+    if not ranges:
+        return None
+    starts, ends = zip(*ranges)
+    start, end = (max(starts), min(ends)) if overlap else (min(starts), max(ends))
+    return (start, end) if start < end else None
+
+
+def _bounds(instruments, variable, key):
+    rows = []
+    for inst in instruments:
+        names = inst["compiled"]["names"]
+        if variable in names:
+            rows.append(inst["compiled"][key][names.index(variable)])
+        else:
+            rows.append((np.nan, np.nan))
+    return np.asarray(rows, dtype=float).reshape(-1, 2)
+
+
+def comparison_stats(instruments, variable, xlim, mode="None"):
+    """
+    Spec stats of `variable` for every instrument within `xlim` (running spans only for "Running").
+
+    Each instrument's rows are reduced on their own, so memory stays at one instrument's window
+    however uneven the file lengths are. Returns ({serial: status}, {serial: stat}) with the same
+    stat keys as compute_spec_stats.
+    """
+    # Comparisons against NaN (unset) bounds are False, so those count as in-bounds
+    typical = _bounds(instruments, variable, "typical")
+    absolute = _bounds(instruments, variable, "absolute")
+
+    results, stats = {}, {}
+    for i, inst in enumerate(instruments):
+        dataset = inst["dataset"]
+        if variable not in dataset:
+            continue
+        if mode == "Running":
+            ranges = dataset.span_ranges(inst["spans"], within=xlim)
+        else:
+            ranges = [dataset.row_range(*xlim)]
+        values = np.asarray(dataset.take(variable, ranges), dtype=float)
+        values = values[~np.isnan(values)]
+        if not values.size:
+            continue
+
+        with np.errstate(invalid="ignore"):
+            out_typical = int(np.count_nonzero((values < typical[i, 0]) | (values > typical[i, 1])))
+            out_absolute = int(np.count_nonzero((values < absolute[i, 0]) | (values > absolute[i, 1])))
+        config = inst["compiled"]["variable_config"].get(variable, {})
+        stats[inst["serial"]] = {
+            "mean": values.mean(),
+            "min": values.min(),
+            "max": values.max(),
+            "total": values.size,
+            "in_typical": values.size - out_typical if not np.isnan(typical[i]).any() else None,
+            "in_absolute": values.size - out_absolute if not np.isnan(absolute[i]).any() else None,
+        }
+        results[inst["serial"]] = spec_status(config, out_typical, out_absolute)
+    return results, stats
+
+
+def decimated_xy(inst, variable, xlim, max_points=MAX_POINTS):
+    """Min/max-decimated (x, y) of `variable` within `xlim`, plus one row either side so lines reach the edges."""
+    dataset = inst["dataset"]
+    a, b = dataset.row_range(*xlim)
+    a, b = max(a - 1, 0), min(b + 1, len(dataset))
+    y = dataset[variable].to_numpy(dtype=float)[a:b]
+    idx = minmax_decimate_indices([y], max_points)
+    return dataset.seconds[a:b][idx], y[idx]
+
+
+def embed_comparison_plot(parent_frame, filepaths, variable=DEFAULT_VARIABLE):
+    instruments = load_comparison(filepaths, parent_frame)
+    if not instruments:
+        raise ValueError("No instruments to compare.")
+
+    variables = []
+    for inst in instruments:
+        time_col = inst["time_col"]
+        for col in inst["dataset"].columns:
+            if col != time_col and col not in HIDDEN_COLUMNS and col not in variables:
+                variables.append(col)
+    if variable not in variables:
+        variable = variables[0]
+
+    full_range = shared_time_range(instruments)
+    human_time_formatter = HumanTimeFormatter(instruments[0]["metadata"].get("Timezone", "UTC"))
+
+    fig = plt.figure(figsize=(8, 5))
+    fig.suptitle(f"Instrument Comparison: {len(instruments)} serials", fontsize=14)
+    ax = fig.add_subplot(111)
+    ax.grid(True)
+    set_time_axis(ax, human_time_formatter)
+
+    colormap = plt.get_cmap('tab10' if len(instruments) <= 10 else 'tab20')
+    lines = {}
+    for i, inst in enumerate(instruments):
+        line, = ax.plot([], [], label=inst["serial"], linewidth=1.2, color=colormap(i % colormap.N))
+        lines[inst["serial"]] = line
+    ax.legend(loc="upper right", fontsize=8)
+
+    set_icon(parent_frame)
+
+    controls = tk.Frame(parent_frame)
+    controls.pack(side='top', fill='x', padx=5, pady=5)
+
+    tk.Label(controls, text="Variable:").pack(side='left')
+    variable_var = tk.StringVar(value=variable)
+    variable_box = ttk.Combobox(controls, textvariable=variable_var, values=variables, state='readonly', width=40)
+    variable_box.pack(side='left', padx=5)
+
+    tk.Label(controls, text="Stats:").pack(side='left', padx=(10, 0))
+    mode_var = tk.StringVar(value="None")
+    mode_box = ttk.Combobox(controls, textvariable=mode_var, values=["None", "Running"], state='readonly', width=10)
+    mode_box.pack(side='left', padx=5)
+
+    canvas_frame = tk.Frame(parent_frame)
+    canvas_frame.pack(side='top', fill='both', expand=True)
+
+    canvas = FigureCanvasTkAgg(fig, master=canvas_frame)
+    canvas.get_tk_widget().pack(fill='both', expand=True)
+
+    toolbar = NavigationToolbar2Tk(canvas, canvas_frame)
+    toolbar.update()
+    toolbar.pack(side='bottom', fill='x')
+
+    stats_tree = ttk.Treeview(parent_frame, columns=STAT_COLUMNS, show='headings', height=min(len(instruments), 8))
+    for col in STAT_COLUMNS:
+        stats_tree.heading(col, text=col.replace("_", " ").title())
+        stats_tree.column(col, width=110, anchor='center')
+    stats_tree.pack(side='bottom', fill='x', padx=5, pady=5)
+
+    redrawing = False
+
+    def redraw(event=None):
+        nonlocal redrawing
+        if redrawing:
+            return
+        redrawing = True
+        try:
+            var = variable_var.get()
+            xlim = ax.get_xlim()
+            for inst in instruments:
+                line = lines[inst["serial"]]
+                if var in inst["dataset"]:
+                    line.set_data(*decimated_xy(inst, var, xlim))
+                else:
+                    line.set_data([], [])
+
+            results, stats = comparison_stats(instruments, var, xlim, mode_var.get())
+            stats_tree.delete(*stats_tree.get_children())
+            for inst in instruments:
+                serial = inst["serial"]
+                stat = stats.get(serial)
+                if stat is None:
+                    stats_tree.insert("", "end", values=(serial, "-", "-", "-", "-", "-", "no data"))
+                    continue
+                in_typical = f"{stat['in_typical']}/{stat['total']}" if stat["in_typical"] is not None else "-"
+                in_absolute = f"{stat['in_absolute']}/{stat['total']}" if stat["in_absolute"] is not None else "-"
+                stats_tree.insert("", "end", values=(serial, f"{stat['mean']:.2f}", f"{stat['min']:.2f}",
+                                                     f"{stat['max']:.2f}", in_typical, in_absolute, results[serial]))
+            canvas.draw_idle()
+        finally:
+            redrawing = False
+
+    def change_variable(event=None):
+        ax.set_ylabel(variable_var.get())
+        redraw()
+        ax.relim()
+        ax.autoscale_view(scalex=False)
+        canvas.draw_idle()
+
+    def fit_range(overlap):
+        time_range = shared_time_range(instruments, overlap)
+        if time_range is None:
+            log.info("ℹ️ Instruments have no overlapping time range")
+            return
+        toolbar.push_current()
+        ax.set_xlim(time_range)  # Triggers redraw through xlim_changed
+        ax.relim()
+        ax.autoscale_view(scalex=False)
+        canvas.draw_idle()
+
+    def toggle_human_time():
+        set_time_axis(ax, human_time_formatter if human_time_var.get() else None)
+        canvas.draw_idle()
+
+    tk.Button(controls, text="Full Range", command=lambda: fit_range(False)).pack(side='left', padx=5)
+    tk.Button(controls, text="Overlap Only", command=lambda: fit_range(True)).pack(side='left', padx=5)
+    human_time_var = tk.BooleanVar(value=True)
+    tk.Checkbutton(controls, text="Human Time", variable=human_time_var,
+                   command=toggle_human_time).pack(side='left', padx=5)
+
+    variable_box.bind("<<ComboboxSelected>>", change_variable)
+    mode_box.bind("<<ComboboxSelected>>", redraw)
+
+    if full_range is not None:
+        ax.set_xlim(full_range)
+    ax.callbacks.connect("xlim_changed", redraw)
+    change_variable()
+    toolbar.update()  # Make the loaded view the toolbar's home view
+
+    return instruments
@@ -0,0 +1,287 @@
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.colors as mcolors
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+import tkinter as tk
+from tkinter import ttk
+from concurrent.futures import ThreadPoolExecutor
+
+from app_logging import get_logger
+
+log = get_logger("correlation")
+
+METHODS = ("Pearson", "Spearman")
+DENSITY_BINS = 200
+MAX_ANNOTATED = 12  # Matrix cells are labelled with r up to this many variables
+POLL_MS = 100
+BLOCK_ROWS = 1_000_000  # Rows per block of the Pearson sums
+
+
+def running_rows(dataset, variables, spans, within=None):
+    """
+    (rows, k) float matrix of `variables` over the running periods of `spans` (optionally clipped
+    to the (t0, t1) window `within`), gathered once from the merged row ranges.
+    """
+    ranges = dataset.span_ranges(spans, within=within)
+    n = sum(b - a for a, b in ranges)
+    matrix = np.empty((n, len(variables)), order="F")  # Contiguous columns for filling and ranking
+    for j, var in enumerate(variables):
+        matrix[:, j] = dataset.take(var, ranges)
+    return matrix
+
+
+def pearson_matrix(matrix, block_rows=BLOCK_ROWS):
+    """
+    Pairwise-complete Pearson r and pair counts between the columns of `matrix`, NaN-aware.
+
+    Every pair uses only the rows where both columns are valid; the sums over those rows come from
+    four (k, k) matrix products, accumulated over blocks of `block_rows` rows so the temporaries
+    stay a fixed size however long the matrix is.
+    """
+    n, k = matrix.shape
+    totals, valid_counts = np.zeros(k), np.zeros(k)
+    for a in range(0, n, block_rows):
+        block = matrix[a:a + block_rows]
+        valid = ~np.isnan(block)
+        totals += np.where(valid, block, 0.0).sum(axis=0)
+        valid_counts += valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = totals / valid_counts  # Centering limits cancellation
+
+    counts, sums, squares, products = (np.zeros((k, k)) for _ in range(4))
+    for a in range(0, n, block_rows):
+        block = matrix[a:a + block_rows]
+        valid = ~np.isnan(block)
+        mask = valid.astype(float)
+        centered = np.where(valid, block - means, 0.0)
+        counts += mask.T @ mask
+        sums += centered.T @ mask  # [i, j]: sum of column i over the rows where j is valid too
+        squares += (centered * centered).T @ mask
+        products += centered.T @ centered
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = products - sums * sums.T / counts
+        var_i = squares - sums * sums / counts
+        r = cov / np.sqrt(var_i * var_i.T)
+    r[counts < 3] = np.nan
+    return np.clip(r, -1.0, 1.0), counts.astype(np.int64)
+
+
+def _tied_ranks(values):
+    """1-based ranks of already sorted `values`, ties sharing their mean rank."""
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    ends = np.r_[starts[1:], values.size]
+    return np.repeat((starts + ends + 1) / 2.0, ends - starts)
+
+
+def _pair_spearman(matrix, orders, i, j):
+    """Spearman r of columns `i` and `j` ranked over only the rows where both are valid."""
+    both = ~(np.isnan(matrix[:, i]) | np.isnan(matrix[:, j]))
+    ranks = []
+    for col in (i, j):
+        rows = orders[col][both[orders[col]]]  # The pair's rows, still in the column's sorted order
+        ranked = np.empty(matrix.shape[0])
+        ranked[rows] = _tied_ranks(matrix[rows, col])
+        ranks.append(ranked[both] - (rows.size + 1) / 2.0)
+    x, y = ranks
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return float(np.clip(x @ y / np.sqrt((x @ x) * (y @ y)), -1.0, 1.0))
+
+
+def spearman_matrix(matrix):
+    """
+    Pairwise-complete Spearman r and pair counts between the columns of `matrix`, as pandas gives.
+
+    Each column is sorted once and ranked over its valid rows; Pearson on those ranks is exact for
+    pairs missing the same rows. Any other pair is re-ranked over just its complete rows by
+    filtering the two sorted orders, so no pair needs a sort of its own.
+    """
+    n, k = matrix.shape
+    index = np.int32 if n < 2 ** 31 else np.int64
+    orders, ranks = [], np.full(matrix.shape, np.nan, order="F")
+    for j in range(k):
+        order = np.argsort(matrix[:, j])  # NaNs sort last
+        order = order[:np.count_nonzero(~np.isnan(matrix[:, j]))].astype(index)
+        ranks[order, j] = _tied_ranks(matrix[order, j])
+        orders.append(order)
+
+    r, counts = pearson_matrix(ranks)
+    for i in range(k):
+        for j in range(i + 1, k):
+            if counts[i, j] >= 3 and not counts[i, j] == counts[i, i] == counts[j, j]:
+                r[i, j] = r[j, i] = _pair_spearman(matrix, orders, i, j)
+    return r, counts
+
+
+def correlation_matrix(matrix, method="Pearson"):
+    """(r, counts) between the columns of `matrix`, each pair over the rows where both are valid."""
+    if method == "Spearman":
+        return spearman_matrix(matrix)
+    if method != "Pearson":
+        raise ValueError(f"Unknown correlation method '{method}'")
+    return pearson_matrix(matrix)
+
+
+def density(x, y, bins=DENSITY_BINS):
+    """
+    2-D histogram of the rows where both `x` and `y` are valid: (counts[bins_y, bins_x], x_edges,
+    y_edges). One bincount over flat bin indices, so ten million points take well under a second.
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    if not x.size:
+        return np.zeros((bins, bins)), np.linspace(0, 1, bins + 1), np.linspace(0, 1, bins + 1)
+
+    edges = []
+    index = np.zeros(x.size, dtype=np.int64)
+    for values, stride in ((y, bins), (x, 1)):
+        lo, hi = float(values.min()), float(values.max())
+        if hi <= lo:
+            lo, hi = lo - 0.5, hi + 0.5
+        edges.append(np.linspace(lo, hi, bins + 1))
+        index += stride * ((values - lo) * (bins / (hi - lo))).astype(np.int64).clip(0, bins - 1)
+    counts = np.bincount(index, minlength=bins * bins).reshape(bins, bins)
+    return counts, edges[1], edges[0]
+
+
+def compute_correlation(dataset, variables, spans, within=None, method="Pearson"):
+    """Running-period rows of `variables` and their correlation, as {"rows", "r", "counts"}."""
+    rows = running_rows(dataset, variables, spans, within)
+    r, counts = correlation_matrix(rows, method)
+    log.debug("%s correlation of %d variable(s) over %d running row(s)", method, len(variables), len(rows))
+    return {"rows": rows, "r": r, "counts": counts}
+
+
+def embed_correlation_plot(parent_frame, dataset, spans, variables, selected=None, within=None):
+    """
+    Correlation matrix of the selected `variables` over running periods, with a density scatter of
+    the pair under the last clicked cell. Both are computed on a worker thread.
+    """
+    variables = [var for var in variables if var in dataset and np.issubdtype(dataset[var].dtype, np.number)]
+    if len(variables) < 2:
+        raise ValueError("At least two numeric variables are needed for a correlation.")
+    selected = [var for var in (selected or []) if var in variables] or variables[:min(len(variables), 6)]
+
+    sidebar = tk.Frame(parent_frame)
+    sidebar.pack(side='left', fill='y', padx=5, pady=5)
+    tk.Label(sidebar, text="Variables").pack(anchor='w')
+    listbox = tk.Listbox(sidebar, selectmode='extended', exportselection=False, width=28)
+    listbox.pack(fill='y', expand=True)
+    for i, var in enumerate(variables):
+        listbox.insert('end', var)
+        if var in selected:
+            listbox.selection_set(i)
+    method_var = tk.StringVar(value=METHODS[0])
+    ttk.Combobox(sidebar, textvariable=method_var, values=METHODS, state='readonly', width=12).pack(pady=5)
+    status_var = tk.StringVar()
+    tk.Label(sidebar, textvariable=status_var, wraplength=180, justify='left').pack(anchor='w')
+
+    fig = plt.figure(figsize=(10, 5), layout="constrained")
+    ax_matrix = fig.add_subplot(121)
+    ax_scatter = fig.add_subplot(122)
+    canvas = FigureCanvasTkAgg(fig, master=parent_frame)
+    canvas.get_tk_widget().pack(side='top', fill='both', expand=True)
+    toolbar = NavigationToolbar2Tk(canvas, parent_frame)
+    toolbar.update()
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    pending = None
+    rerun = False
+    closed = False  # Set once the window is destroyed; a late result is then dropped
+    result = {}  # Latest {"variables", "method", "rows", "r", "counts"}
+    colorbars = []
+    pair = [0, 1]
+
+    def draw_matrix():
+        names, r = result["variables"], result["r"]
+        ax_matrix.clear()
+        image = ax_matrix.imshow(r, cmap='RdBu_r', vmin=-1, vmax=1)
+        ax_matrix.set_xticks(range(len(names)), names, rotation=90, fontsize=7)
+        ax_matrix.set_yticks(range(len(names)), names, fontsize=7)
+        if len(names) <= MAX_ANNOTATED:
+            for i in range(len(names)):
+                for j in range(len(names)):
+                    if not np.isnan(r[i, j]):
+                        ax_matrix.text(j, i, f"{r[i, j]:.2f}", ha='center', va='center', fontsize=7,
+                                       color='white' if abs(r[i, j]) > 0.6 else 'black')
+        ax_matrix.set_title(f"{result['method']} r over {len(result['rows']):,} running rows", fontsize=10)
+        while colorbars:
+            colorbars.pop().remove()
+        colorbars.append(fig.colorbar(image, ax=ax_matrix, fraction=0.046, pad=0.04))
+
+    def draw_scatter():
+        names, rows = result["variables"], result["rows"]
+        i, j = pair
+        ax_scatter.clear()
+        counts, x_edges, y_edges = density(rows[:, j], rows[:, i])
+        if counts.any():
+            ax_scatter.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts, 0), cmap='viridis',
+                                  norm=mcolors.LogNorm(vmin=1, vmax=counts.max()))
+        ax_scatter.set_xlabel(names[j])
+        ax_scatter.set_ylabel(names[i])
+        ax_scatter.set_title(f"r = {result['r'][i, j]:.3f} (n = {result['counts'][i, j]:,})", fontsize=10)
+        canvas.draw_idle()
+
+    def poll():
+        nonlocal pending, rerun
+        if closed:
+            return
+        if not pending.done():
+            parent_frame.after(POLL_MS, poll)
+            return
+        future, pending = pending, None
+        if rerun:  # Selection changed while computing; only the latest result is drawn
+            rerun = False
+            recompute()
+            return
+        try:
+            result.update(future.result())
+        except Exception as e:
+            log.error("❌ Correlation failed: %s", e)
+            status_var.set(f"Failed: {e}")
+            return
+        status_var.set("Click a cell to see that pair's density.")
+        if max(pair) >= len(result["variables"]):
+            pair[:] = [0, 1]
+        draw_matrix()
+        draw_scatter()
+
+    def run(names, method):
+        return dict(compute_correlation(dataset, names, spans, within, method), variables=names, method=method)
+
+    def recompute(event=None):
+        nonlocal pending, rerun
+        names = [variables[i] for i in listbox.curselection()]
+        if len(names) < 2:
+            status_var.set("Select at least two variables.")
+            return
+        if pending is not None:
+            rerun = True
+            return
+        status_var.set("Computing…")
+        pending = pool.submit(run, names, method_var.get())
+        parent_frame.after(POLL_MS, poll)
+
+    def on_click(event):
+        if event.inaxes is not ax_matrix or not result or event.xdata is None:
+            return
+        i, j = int(round(event.ydata)), int(round(event.xdata))
+        if 0 <= i < len(result["variables"]) and 0 <= j < len(result["variables"]) and i != j:
+            pair[:] = [i, j]
+            draw_scatter()
+
+    listbox.bind("<<ListboxSelect>>", recompute)
+    method_var.trace_add("write", lambda *_: recompute())
+    fig.canvas.mpl_connect("button_press_event", on_click)
+
+    def on_destroy(event):
+        nonlocal closed
+        if event.widget is parent_frame:
+            closed = True
+            pool.shutdown(wait=False, cancel_futures=True)
+            plt.close(fig)
+
+    parent_frame.bind("<Destroy>", on_destroy, add="+")
+
+    recompute()
+    return fig
@@ -0,0 +1,262 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+from app_logging import get_logger
+from file_parsing import get_local_config_dir
+
+log = get_logger("cache")
+
+CACHE_VERSION = 1
+MAX_CACHE_ENV = "LI7800_CACHE_MAX_MB"  # Environment override of the size cap
+MAX_CACHE_MB = 4096
+
+
+def get_cache_dir():
+    return os.path.join(os.path.dirname(get_local_config_dir()), "cache")
+
+
+def file_signatures(filepaths):
+    """[(absolute path, mtime_ns, size)] for each file, in the given order."""
+    signatures = []
+    for path in filepaths:
+        stat = os.stat(path)
+        signatures.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+    return signatures
+
+
+def cache_key(filepaths):
+    """Key of a file set's cache entry; changes whenever any of the files is modified."""
+    text = json.dumps(sorted(file_signatures(filepaths)))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:20]
+
+
+def _paths(key):
+    base = os.path.join(get_cache_dir(), key)
+    return base + ".npz", base + ".json"
+
+
+def has_cached_frame(key):
+    return all(os.path.exists(p) for p in _paths(key))
+
+
+def save_cached_frame(key, df, meta=None, sources=None):
+    """
+    Store `df` (numeric columns only) as an uncompressed .npz with a JSON sidecar holding the
+    column names, dtypes, attrs, `meta` and the signatures of the `sources` files it came from,
+    then prune the cache. Returns False if the frame cannot be cached.
+    """
+    if any(df[col].dtype == object for col in df.columns):
+        log.warning("⚠️ Not caching frame with non-numeric columns")
+        return False
+
+    os.makedirs(get_cache_dir(), exist_ok=True)
+    npz_path, json_path = _paths(key)
+    arrays = {f"c{i}": df[col].to_numpy() for i, col in enumerate(df.columns)}
+    sidecar = {
+        "version": CACHE_VERSION,
+        "columns": list(df.columns),
+        "attrs": df.attrs,
+        "meta": meta or {},
+        "sources": file_signatures(sources) if sources else [],
+    }
+    try:
+        tmp_npz = npz_path + ".tmp.npz"
+        np.savez(tmp_npz, **arrays)
+        with open(json_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(sidecar, f, default=_to_json)
+        os.replace(tmp_npz, npz_path)
+        os.replace(json_path + ".tmp", json_path)
+    except (OSError, TypeError, ValueError) as e:
+        log.warning("⚠️ Failed to cache parsed data: %s", e)
+        return False
+    log.info("💾 Cached %d rows as %s", len(df), key)
+    prune_cache(keep=(key,))
+    return True
+
+
+def load_cached_frame(key):
+    """(df, meta) from the cache, or None if there is no usable entry for `key`."""
+    npz_path, json_path = _paths(key)
+    if not has_cached_frame(key):
+        return None
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        if sidecar.get("version") != CACHE_VERSION:
+            return None
+        with np.load(npz_path, allow_pickle=False) as arrays:
+            data = {col: arrays[f"c{i}"] for i, col in enumerate(sidecar["columns"])}
+    except (OSError, ValueError, KeyError) as e:
+        log.warning("⚠️ Ignoring unreadable cache entry %s: %s", key, e)
+        return None
+
+    try:
+        os.utime(json_path)  # Last use, for pruning
+    except OSError:
+        pass
+    df = pd.DataFrame(data, columns=sidecar["columns"])
+    df.attrs.update(sidecar.get("attrs", {}))
+    log.debug("Loaded %d cached rows from %s", len(df), key)
+    return df, sidecar.get("meta", {})
+
+
+def load_cached_files(filepaths):
+    """
+    Read back a file set from per-file cache entries (as written by the ingest watcher), or None
+    unless every file has one. Raises ValueError if the serials differ.
+
+    Returns (frames, model, metadata, summaries, ranges): the frames in file order, each file's
+    span_summary (None if any entry lacks them) and the merged column min/max (likewise).
+    """
+    from file_parsing import get_serial
+    from manipulation import merge_column_ranges
+
+    entries = []
+    for path in filepaths:
+        cached = load_cached_frame(cache_key([path]))
+        if cached is None:
+            return None
+        entries.append(cached)
+
+    metas = [meta for _, meta in entries]
+    serials = {get_serial(meta.get("metadata", {})) for meta in metas}
+    if len(serials) > 1:
+        raise ValueError(f"Serial mismatch between cached files: {', '.join(sorted(map(str, serials)))}")
+
+    summaries = None
+    if all("span_summary" in meta for meta in metas):
+        summaries = [summary_from_json(meta["span_summary"]) for meta in metas]
+    ranges = None
+    if all("ranges" in meta for meta in metas):
+        ranges = merge_column_ranges(ranges_from_json(meta["ranges"]) for meta in metas)
+
+    log.info("⚡ Using pre-parsed data for %d file(s)", len(filepaths))
+    return [df for df, _ in entries], metas[0]["model"], metas[0]["metadata"], summaries, ranges
+
+
+def summary_from_json(summary):
+    """A manipulation.span_summary result from its JSON form (None stays None)."""
+    if summary is None:
+        return None
+    return {"blocks": np.asarray(summary["blocks"], dtype=float).reshape(-1, 2),
+            "warm": np.asarray(summary["warm"], dtype=float)}
+
+
+def ranges_from_json(ranges):
+    return {col: (np.nan if lo is None else lo, np.nan if hi is None else hi) for col, (lo, hi) in ranges.items()}
+
+
+def remove_cached_frame(key):
+    for path in _paths(key):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _is_stale(sources):
+    """True if any source file is gone or was modified since the entry was written."""
+    for path, mtime_ns, size in sources:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return True
+        if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+            return True
+    return False
+
+
+def max_cache_bytes():
+    try:
+        return int(float(os.getenv(MAX_CACHE_ENV, MAX_CACHE_MB)) * 1024 * 1024)
+    except ValueError:
+        return MAX_CACHE_MB * 1024 * 1024
+
+
+def prune_cache(max_bytes=None, keep=()):
+    """
+    Remove entries whose source files were deleted or modified (their keys can never match again),
+    then the least recently used ones until the cache fits in `max_bytes` (LI7800_CACHE_MAX_MB, or
+    MAX_CACHE_MB, by default). Keys in `keep` are never removed. Returns the number removed.
+    """
+    cache_dir = get_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return 0
+    max_bytes = max_cache_bytes() if max_bytes is None else max_bytes
+
+    entries = []  # (last use, bytes, key)
+    removed = 0
+    for name in os.listdir(cache_dir):
+        key, ext = os.path.splitext(name)
+        if ext != ".json" or key in keep:
+            continue
+        npz_path, json_path = _paths(key)
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                sidecar = json.load(f)
+            stale = sidecar.get("version") != CACHE_VERSION or _is_stale(sidecar.get("sources", []))
+            size = os.path.getsize(json_path) + (os.path.getsize(npz_path) if os.path.exists(npz_path) else 0)
+            last_use = os.path.getmtime(json_path)
+        except (OSError, ValueError, TypeError):
+            stale = True
+        if stale:
+            remove_cached_frame(key)
+            removed += 1
+        else:
+            entries.append((last_use, size, key))
+
+    total = sum(size for _, size, _ in entries) + sum(
+        os.path.getsize(p) for key in keep for p in _paths(key) if os.path.exists(p))
+    for _, size, key in sorted(entries):
+        if total <= max_bytes:
+            break
+        remove_cached_frame(key)
+        total -= size
+        removed += 1
+
+    if removed:
+        log.info("🧹 Pruned %d cache entr%s (%.0f MB left)", removed, "y" if removed == 1 else "ies", total / 1e6)
+    return removed
+
+
+def clear_cache():
+    """Remove every cache entry; returns the number of files deleted."""
+    cache_dir = get_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return 0
+    removed = 0
+    for name in os.listdir(cache_dir):
+        try:
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+        except OSError as e:
+            log.warning("⚠️ Could not remove %s: %s", name, e)
+    log.info("🧹 Cleared %d cache file(s)", removed)
+    return removed
+
+
+def _to_json(value):
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+if __name__ == "__main__":
+    import argparse
+    from app_logging import configure_logging
+
+    parser = argparse.ArgumentParser(description="Prune or clear the parse cache")
+    parser.add_argument("--clear", action="store_true", help="Remove every entry")
+    parser.add_argument("--max-mb", type=float, help=f"Size cap to prune to (default: ${MAX_CACHE_ENV} or {MAX_CACHE_MB})")
+    args = parser.parse_args()
+
+    configure_logging("INFO")
+    if args.clear:
+        clear_cache()
+    else:
+        prune_cache(int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None)
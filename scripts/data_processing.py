@@ -1,95 +1,135 @@
-import matplotlib.cm as cm
-import matplotlib.colors as mcolors
+import bisect
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import tkinter as tk
-from unicodedata import normalize
-from datetime import datetime
-import pytz
-from matplotlib.ticker import ScalarFormatter, FuncFormatter
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from packaging.version import Version
 from manipulation import *
 from file_parsing import *
+from app_logging import get_logger, configure_logging
+from dataset import Dataset
+from time_axis import HumanTimeFormatter, set_time_axis
+from data_registry import SharedData, acquire_dataset, release_dataset, detach_dataset
+from export import export_analysis, EXPORT_FORMATS
+from data_cache import (cache_key, has_cached_frame, load_cached_frame, load_cached_files, save_cached_frame,
+                        summary_from_json, ranges_from_json)
+from session import SESSION_EXTENSION, save_session, spans_to_json, spans_from_json
+from allan import embed_allan_plot
+from correlation import embed_correlation_plot
+from plot_layout import (figure_title, plottable_variables, variable_colors, autoplot_assignments,
+                         position_subplots, draw_spans, clear_spans, MAX_SUBPLOTS)
+
+log = get_logger("viewer")
+
+ROLLING_CACHE_SIZE = 16  # Rolling mean/std results kept per window
+MAX_LISTED_EVENTS = 1000  # Violation events shown in the navigator list (all can be stepped through)
+EVENT_MIN_VIEW = 120  # Seconds shown around a violation event when jumping to it
+ALL_VARIABLES = "All variables"
+RUN_THRESHOLD = 2  # Seconds; the default periods of a loaded file set
+
+
+def load_shared_data(filepaths):
+    # A file set saved with a session is reloaded from the parse cache while the files are unchanged
+    key = cache_key(filepaths)
+    cached = load_cached_frame(key)
+    if cached is not None:
+        df, meta = cached
+        time_col = meta["time_col"]
+        if meta.get("run_threshold", RUN_THRESHOLD) != RUN_THRESHOLD and "span_summary" in meta:
+            spans = spans_from_summaries([summary_from_json(meta["span_summary"])], RUN_THRESHOLD)
+        else:
+            spans = spans_from_json(meta["spans"])
+        shared = SharedData(Dataset(df, time_col), meta["model"], meta["metadata"], time_col, spans)
+        if "ranges" in meta:
+            shared.column_ranges = ranges_from_json(meta["ranges"])
+        shared.cache_key = key
+        return shared
+
+    # Files the ingest watcher already parsed are read back from their own cache entries, with
+    # their span summaries and column ranges
+    summaries = ranges = None
+    cached_files = load_cached_files(filepaths)
+    if cached_files is not None:
+        frames, model, metadata, summaries, ranges = cached_files
+    else:
+        # Files are parsed and searched for error codes in parallel, one worker per file
+        frames, model, metadata = load_data_files(filepaths, on_file=clean_error_codes)
+    df = merge_frames(frames)
 
+    time_col = next((col for col in df.columns if "SECONDS" in col.upper()), df.columns[0])
 
-def embed_plot_7800_data(parent_frame, filepaths):
-    df, model, metadata = load_and_merge_files(filepaths)
-
-    #Searches for error codes and identifies them
-    df = clean_error_codes(df)
+    # Sort merged files once by time; range lookups below then slice instead of masking
+    dataset = Dataset(df, time_col)
 
-    time_col = next((col for col in df.columns if "SECONDS" in col.upper()), df.columns[0])
-    x = df[time_col]
+    log.debug("🔍 Identifying startup and outlier regions...")
+    if summaries is not None:
+        spans = spans_from_summaries(summaries, RUN_THRESHOLD, timezone=df.attrs.get("timezone", "UTC"))
+    else:
+        spans = identify_spans_per_file(frames, RUN_THRESHOLD, time_col=time_col)
+    shared = SharedData(dataset, model, metadata, time_col, spans)
+    shared.column_ranges = ranges
+    shared.cache_key = key
+    return shared
+
+
+def embed_plot_7800_data(parent_frame, filepaths, session=None):
+    # Windows opened on the same files share one loaded copy until the last of them closes
+    shared = acquire_dataset(filepaths, load_shared_data)
+
+    # Bound before anything else can fail, so a window whose setup raised still lets go of the data
+    def release_on_destroy(event):
+        if event.widget is parent_frame:
+            release_dataset(shared)  # The private copy if follow mode detached one
+
+    parent_frame.bind("<Destroy>", release_on_destroy, add="+")
+    dataset, model, metadata, time_col = shared.dataset, shared.model, shared.metadata, shared.time_col
+    df = dataset.df
+    spans = list(shared.spans)
+
+    # A session restores the view; its spans and statuses are reused only if the files are unchanged
+    view = session["view"] if session else None
+    restored = bool(session) and session.get("cache") == shared.cache_key
+    if restored and session.get("spans") is not None:
+        spans = list(session["spans"])
+    elif session:
+        log.info("ℹ️ Session files changed since it was saved; recomputing periods and statuses")
 
     #load json config for the model
     tga_version = metadata.get("Software Version", "0.0.0")
-    raw_config = load_variable_config(model, tga_version, parent_frame)
-
-    def normalize_key(key):
-        return normalize('NFC', key.strip())
-
-    normalized_config = {normalize_key(k): v for k, v in raw_config.items()}
-    variable_config = {}
-
-    print("\n📄 Normalized config keys:")
-    for key in normalized_config:
-        print(f"  - {repr(key)}")
-
-    print("\n📊 Normalized DataFrame columns:")
-    for col in df.columns:
-        norm_col = normalize_key(col)
-        print(f"  - {repr(norm_col)}")
-        if norm_col in normalized_config:
-            variable_config[col] = normalized_config[norm_col]
-        else:
-            print(f"    ⚠️  No match found for: {repr(norm_col)}")
-
-    print("\n🔍 Identifying startup and outlier regions...")
-    spans = identify_operational_spans(df)
+    compiled_config = compile_variable_config(model, tga_version, list(df.columns), parent_frame)
+    variable_config = compiled_config["variable_config"]
 
     latest_stats = {}
     stats_win_ref = None
     stats_text_ref = None
 
     # Classify variable statuses
-    validation_results = {}
-    for var, conf in variable_config.items():
-        col_data = df.get(var)
-        if col_data is None:
-            continue
-        values = col_data.dropna()
-
-        status = "unclassified"
-        if "absolute" in conf and conf["absolute"][0] is not None and conf["absolute"][1] is not None:
-            out_abs = (values < conf["absolute"][0]) | (values > conf["absolute"][1])
-            if out_abs.any():
-                status = "outside absolute"
-            else:
-                if "typical" in conf and conf["typical"][0] is not None and conf["typical"][1] is not None:
-                    out_typ = (values < conf["typical"][0]) | (values > conf["typical"][1])
-                    if out_typ.any():
-                        status = "outside typical"
-                    else:
-                        status = "within typical"
-                else:
-                    status = "within absolute"
-        validation_results[var] = status
+    if restored and session.get("validation"):
+        validation_results = dict(session["validation"])
+    elif shared.column_ranges is not None:  # Pre-parsed files carry every column's min/max
+        validation_results = classify_ranges(
+            shared.column_ranges, compiled_config["names"], compiled_config["typical"], compiled_config["absolute"])
+    else:
+        validation_results = classify_variables(
+            df, compiled_config["names"], compiled_config["typical"], compiled_config["absolute"])
 
-    print("Loaded model config keys:", list(variable_config.keys()))
-    print("Available DataFrame columns:", list(df.columns))
+    log.debug("Loaded model config keys: %s", list(variable_config))
+    log.debug("Available DataFrame columns: %s", list(df.columns))
 
     plot_options = load_plot_options(model)
+    if view:
+        plot_options.update(view.get("options", {}))
+    human_time_formatter = HumanTimeFormatter(metadata.get("Timezone", "UTC"))
     
     #Make the overarching window
-    print(model)
+    log.info("Opening %s viewer for %d file(s)", model, len(filepaths))
     serial = metadata.get("SN", "Unknown SN")
     fig = plt.figure(figsize=(8, 5))
-    fig.suptitle(f"LI-78{model[2]}{model[3]}: {serial}", fontsize=14)
-    gs = fig.add_gridspec(4, 1, hspace=0.0)
+    fig.suptitle(figure_title(model, serial), fontsize=14)
+    gs = fig.add_gridspec(MAX_SUBPLOTS, 1, hspace=0.0)
 
 
-    subplot_axes = [fig.add_subplot(gs[i, 0]) for i in range(4)]
+    subplot_axes = [fig.add_subplot(gs[i, 0]) for i in range(MAX_SUBPLOTS)]
     for i, ax_sub in enumerate(subplot_axes):
         ax_sub.set_visible(i == 0) # Initialize only one subplot to begin
         ax_sub.sharex(subplot_axes[0])  # All axes share x-axis
@@ -101,39 +141,31 @@ def embed_plot_7800_data(parent_frame, filepaths):
     break_on_gaps_enabled = plot_options.get("break_on_gaps", True)
 
     lines = {i: {} for i in range(len(subplot_axes))}  # subplot_index -> { var_name: line }
-    colors = {}
+    rolling_overlays = {}  # overlay name -> (variable, window seconds, "mean" | "upper" | "lower")
+    rolling_drawn = set()  # Overlay names currently in `lines`
+    rolling_cache = {}
 
-    plottable_columns = [col for col in df.columns if
-                         col != time_col and col not in ['NANOSECONDS (nsecs)', 'DATE (date)', 'TIME (time)']]
-    colormap = cm.get_cmap('berlin', len(plottable_columns))
+    plottable_columns = plottable_variables(df.columns, time_col)
+    colors = variable_colors(plottable_columns)
 
-    for i, col in enumerate(plottable_columns):
-        color = mcolors.to_hex(colormap(i))
-        colors[col] = color
+    if view:  # Restore the session's subplot assignments instead of autoplotting
+        autoplotted = {col: int(idx) for col, idx in view.get("assignments", {}).items()}
+    else:
+        autoplotted = autoplot_assignments(plottable_columns, variable_config, len(subplot_axes))
 
-    # Preload lines[0] with invisible Line2D objects so variables show up in list
-    plotted = 0
     for col in plottable_columns:
-        color = colors[col]
-        y = df[col]
-        x_data = df[time_col]
+        if col not in autoplotted: #Autoplotting functionality
+            continue
+        subplot_idx = autoplotted[col]
+        subplot_assignments[col] = subplot_idx
 
         if break_on_gaps_enabled:
-            x_plot, y_plot = insert_nan_gaps(x_data, y, threshold=2)
+            x_plot, y_plot = insert_nan_gaps(df[time_col], df[col], threshold=2)
         else:
-            x_plot, y_plot = x_data, y
+            x_plot, y_plot = df[time_col], df[col]
 
-        should_autoplot = variable_config.get(col, {}).get("autoplot", False)
-
-        if should_autoplot: #Autoplotting functionality
-            subplot_idx = plotted % len(subplot_axes) # Determines which subplot the variable goes on (0-3)
-            plotted += 1
-            subplot_assignments[col] = subplot_idx
-            ax_target = subplot_axes[subplot_idx]
-
-            line, = ax_target.plot(x_plot, y_plot, label=col, linewidth=1.5, color=color)
-            line.set_visible(should_autoplot)
-            lines[subplot_idx][col] = line
+        line, = subplot_axes[subplot_idx].plot(x_plot, y_plot, label=col, linewidth=1.5, color=colors[col])
+        lines[subplot_idx][col] = line
 
     #ax.set_xlabel(time_col)
     #ax.set_ylabel("Value")
@@ -229,14 +261,14 @@ def embed_plot_7800_data(parent_frame, filepaths):
                     update_version_status()
                     if Version(tg) == Version(tga_version):
                         # using latest version
-                        print("Using Latest Version")
+                        log.info("Using Latest Version")
                     else:
                         versions = [tg, tga_version]
                         versions.sort(key=Version, reverse=True)
                         if Version(versions[0]) == Version(tga_version):
-                            print("Using Version Newer Than Recorded")
+                            log.info("Using Version Newer Than Recorded")
                         else:
-                            print("Using Old Version")
+                            log.info("Using Old Version")
 
             except Exception:
                 messagebox.showerror("Invalid Version",
@@ -255,7 +287,7 @@ def embed_plot_7800_data(parent_frame, filepaths):
                 plot_options["run_threshold"] = rt
                 if rt != run_threshold.get():
                     run_threshold.set(rt)
-                    spans = identify_operational_spans(df, run_threshold.get())
+                    spans = identify_operational_spans(dataset, run_threshold.get())
                     spans_changed = True
                 on_zoom()
             except ValueError:
@@ -269,6 +301,8 @@ def embed_plot_7800_data(parent_frame, filepaths):
                 for idx, ax_lines in lines.items():
                     for var, line in ax_lines.items():
                         line.set_linewidth(lw)
+                        if var in rolling_drawn:
+                            continue
 
                         # Reload x/y data with or without gaps
                         x = df[time_col]
@@ -286,6 +320,7 @@ def embed_plot_7800_data(parent_frame, filepaths):
                 for line in subplot_dict.values():
                     line.set_linewidth(lw)
 
+            draw_rolling_overlays()  # Spans or gap breaks may have changed
             rescale()
             
             plot_options["outliers"] = hide_outliers_mode.get()
@@ -331,6 +366,28 @@ def embed_plot_7800_data(parent_frame, filepaths):
     for event in ("<Button-1>", "<B1-Motion>", "<Double-1>", "<Triple-1>", "<ButtonRelease-1>"):
         textbox.bind(event, ignore_event)
 
+    def list_row(var):
+        """(text, color) of a variable's line in the list."""
+        for idx, subplot in lines.items():
+            if var in subplot:
+                line = subplot[var]
+                visible = line.get_visible()
+                break
+        else:
+            visible = False
+
+        checkmark = "☑" if visible else "☐"
+        status = validation_results.get(var, "unclassified")
+        icon, color = {
+            "within typical": ("⭕", "green"),
+            "outside typical": ("⚠️", "orange"),
+            "outside absolute": ("❌", "red"),
+            "unclassified": ("❓", "gray")
+        }.get(status, ("❓", "gray"))
+
+        display_name = re.match(r"^[^(]*", var).group().strip()
+        return f"{checkmark} {icon} {display_name}\n", color
+
     # Updating the variable list
     def update_listbox(*args):
         nonlocal variable_names
@@ -339,31 +396,13 @@ def embed_plot_7800_data(parent_frame, filepaths):
         textbox.delete("1.0", "end")
         # Keep original column order (as in the DataFrame)
         ordered_columns = list(df.columns)  # Or however you reference the original DataFrame
-        print("List Updating...")
+        log.debug("List Updating...")
         for var in variable_names:
             #print("Variable: " + var)
             if search_term not in var.lower() and search_term not in [""]:
                 continue
 
-            for idx, subplot in lines.items():
-                if var in subplot:
-                    line = subplot[var]
-                    visible = line.get_visible()
-                    break
-            else:
-                visible = False
-
-            checkmark = "☑" if visible else "☐"
-            status = validation_results.get(var, "unclassified")
-            icon, color = {
-                "within typical": ("⭕", "green"),
-                "outside typical": ("⚠️", "orange"),
-                "outside absolute": ("❌", "red"),
-                "unclassified": ("❓", "gray")
-            }.get(status, ("❓", "gray"))
-
-            display_name = re.match(r"^[^(]*", var).group().strip()
-            line_text = f"{checkmark} {icon} {display_name}\n"
+            line_text, color = list_row(var)
             start_idx = textbox.index("end-1c")
             end_idx = f"{start_idx}+{len(line_text)}c"
             textbox.insert("end", line_text)
@@ -383,6 +422,20 @@ def embed_plot_7800_data(parent_frame, filepaths):
             takefocus=0
         )
 
+    def update_list_rows(variables):
+        """Redraw only the list lines of `variables` (those hidden by the search are skipped)."""
+        textbox.config(state='normal')
+        for var in variables:
+            tag = f"var_{var}"
+            bounds = textbox.tag_ranges(tag)
+            if not bounds:
+                continue
+            line_text, color = list_row(var)
+            textbox.delete(bounds[0], bounds[1])
+            textbox.insert(bounds[0], line_text, (tag,))
+            textbox.tag_config(tag, foreground=color)
+        textbox.config(state='disabled')
+
     update_listbox()
 
     legend_frame = tk.Frame(control_frame)
@@ -446,17 +499,12 @@ def embed_plot_7800_data(parent_frame, filepaths):
         ymins, ymaxs = [], []
 
         xlim = ax.get_xlim()
-        visible_mask = (df[time_col] >= xlim[0]) & (df[time_col] <= xlim[1])
 
         if mode == "Running" or mode == "IQR":
-            # Combine all running span filters
-            running_mask = pd.Series(False, index=df.index)
-            for startup, running, stopping in spans:
-                r_start, r_end = running
-                running_mask |= (df[time_col] >= r_start) & (df[time_col] <= r_end)
-            combined_mask = visible_mask & running_mask
+            # Visible rows within any running span
+            visible_ranges = dataset.span_ranges(spans, within=xlim)
         else:
-            combined_mask = visible_mask
+            visible_ranges = [dataset.row_range(*xlim)]
 
         # Ensure only the bottom subplot shows x-axis labels
         visible_axes = [ax for ax in subplot_axes if ax.get_visible()]
@@ -473,10 +521,10 @@ def embed_plot_7800_data(parent_frame, filepaths):
 
             for subplot_index, subplot_dict in lines.items():
                 for var, line in subplot_dict.items():
-                    if subplot_assignments.get(var, 0) != idx or not line.get_visible():
+                    if var in rolling_drawn or subplot_assignments.get(var, 0) != idx or not line.get_visible():
                         continue
 
-                    y_data = df[var][combined_mask].dropna()
+                    y_data = pd.Series(dataset.take(var, visible_ranges)).dropna()
                     if y_data.empty:
                         continue
 
@@ -500,47 +548,29 @@ def embed_plot_7800_data(parent_frame, filepaths):
                     ax_sub.set_ylim(ymin - pad, ymax + pad)
 
                 else:
-                    print("⚠️ No data for rescaling. Skipping set_ylim.")
+                    log.debug("⚠️ No data for rescaling. Skipping set_ylim.")
 
                 # Remove old spans on each subplot
                 if (not draw_spans_var.get() and spans_drawn) or spans_changed:
                     spans_drawn = False
-                    for ax_target in subplot_axes:
-                        for patch in ax_target.patches[:]:
-                            if getattr(patch, "_span", False):
-                                patch.remove()
+                    clear_spans(subplot_axes)
 
                 # Draw new spans only if toggled on
                 if draw_spans_var.get() and (spans_changed or not spans_drawn):
                     spans_drawn = True
                     spans_changed = False
-                    print("✅ spans drawn")
-                    for ax_target in subplot_axes:
-                        for (startup_start, startup_end), (running_start, running_end), (shutdown_start, shutdown_end) in spans:
-                            start = ax_target.axvspan(startup_start, startup_end, color='blue', alpha=0.2)
-                            start._span = True
-                            run = ax_target.axvspan(running_start, running_end, color='green', alpha=0.1)
-                            run._span = True
-                            if (shutdown_start, shutdown_end) != (-1, -1):
-                                off = ax_target.axvspan(shutdown_start, shutdown_end, color='red', alpha=0.2)
-                                off._span = True
-
-
-                if use_human_time.get():
-                    tz = pytz.timezone(metadata.get("Timezone", "UTC"))
-                    ax_sub.xaxis.set_major_formatter(FuncFormatter(
-                        lambda x, _: datetime.fromtimestamp(x, tz).strftime("%Y-%m-%d %H:%M:%S") if x > 0 else ""
-                    ))
-                    ax_sub.tick_params(axis='x', rotation=45, labelsize=8)
-                else:
-                    ax_sub.xaxis.set_major_locator(plt.AutoLocator())
-                    ax_sub.xaxis.set_major_formatter(ScalarFormatter())
-                    ax_sub.ticklabel_format(style='sci', axis='x', scilimits=(9, 9))
+                    log.debug("✅ spans drawn")
+                    draw_spans(subplot_axes, spans)
+
+
+                # No-op unless the time display was toggled
+                set_time_axis(ax_sub, human_time_formatter if use_human_time.get() else None)
 
             # Update subplot legends
             for ax_sub in subplot_axes:
                 # Filter only visible lines
-                visible_lines = [line for line in ax_sub.lines if line.get_visible()]
+                visible_lines = [line for line in ax_sub.lines
+                                 if line.get_visible() and not line.get_label().startswith("_")]
                 if visible_lines:
                     ax_sub.legend(handles=visible_lines, loc='upper right', fontsize='small', frameon=True)
                 else:
@@ -581,6 +611,7 @@ def embed_plot_7800_data(parent_frame, filepaths):
 
             line, = ax_target.plot(x_plot, y_plot, label=var, linewidth=1.5, color=colors[var])
             lines[index][var] = line
+            draw_rolling_overlays()
 
             update_listbox()
             update_legend()
@@ -594,6 +625,7 @@ def embed_plot_7800_data(parent_frame, filepaths):
             if var in lines[subplot_index]:
                 lines[subplot_index][var].set_visible(False)
             subplot_assignments.pop(var, None)
+            draw_rolling_overlays()
 
             update_listbox()
             update_legend()
@@ -656,8 +688,14 @@ def embed_plot_7800_data(parent_frame, filepaths):
 
     zooming = False  # Define at the same level as on_zoom
 
+    # Prefix-sum/range tables for spec checks, so zooming does not rescan the visible rows
+    if shared.stats_index is None:
+        shared.stats_index = build_stats_index(dataset, variable_config, time_col)
+    stats_index = copy_stats_index(shared.stats_index)
+    event_index = None  # Built when the violation navigator is first opened
+
     def on_zoom(event=None):
-        nonlocal validation_results, latest_stats, variable_config, zooming
+        nonlocal validation_results, latest_stats, variable_config, zooming, stats_index
 
         if zooming:
             return
@@ -671,11 +709,17 @@ def embed_plot_7800_data(parent_frame, filepaths):
                 if ax_sub != source_ax and ax_sub.get_visible():
                     ax_sub.set_xlim(new_xlim)
 
+            # Cheap when nothing changed; rebuilds only variables whose bounds were edited
+            stats_index = build_stats_index(dataset, variable_config, time_col, previous=stats_index)
+            if event_index is not None:
+                refresh_events()
             validation_results, latest_stats = update_spec_checks(
-                subplot_axes[0], df, variable_config,
+                subplot_axes[0], dataset, variable_config,
                 spans,
                 validation_results,
-                hide_outliers_mode.get()
+                hide_outliers_mode.get(),
+                time_col=time_col,
+                stats_index=stats_index
             )
             update_listbox()
             update_stats_window()
@@ -684,6 +728,31 @@ def embed_plot_7800_data(parent_frame, filepaths):
 
     on_zoom()
 
+    def revalidate(variables):
+        """Spec status, stats and list rows for just `variables`, after their config was edited."""
+        nonlocal stats_index, latest_stats
+        # Only the edited variables' bounds differ, so only their tables are rebuilt
+        stats_index = build_stats_index(dataset, variable_config, time_col, previous=stats_index)
+        if event_index is not None:
+            refresh_events()
+
+        for var in variables:
+            if var not in variable_config:
+                validation_results[var] = "unclassified"
+        edited = {var: variable_config[var] for var in variables if var in variable_config}
+        _, stats = update_spec_checks(
+            subplot_axes[0], dataset, edited,
+            spans,
+            validation_results,
+            hide_outliers_mode.get(),
+            time_col=time_col,
+            stats_index=stats_index
+        )
+        latest_stats = {var: stats[var] if var in stats else latest_stats[var] for var in variable_config
+                        if var in stats or (var in latest_stats and var not in variables)}
+        update_list_rows(variables)
+        update_stats_window()
+
 
 
     def open_stats_window():
@@ -710,26 +779,286 @@ def embed_plot_7800_data(parent_frame, filepaths):
     stats_btn = tk.Button(toolbar, text="Statistics", command=open_stats_window)
     stats_btn.pack(side='left')
 
-    def layout_subplots():
-        visible_axes = [ax for ax in subplot_axes if ax.get_visible()]
-        n = len(visible_axes)
-        if n == 0:
+    def open_export_window():
+        export_win = tk.Toplevel(parent_frame)
+        export_win.title("Export")
+        export_win.geometry("280x260")
+
+        tk.Label(export_win, text="Format:").pack(pady=(5, 0))
+        format_var = tk.StringVar(value=plot_options.get("export_format", "csv"))
+        tk.OptionMenu(export_win, format_var, *EXPORT_FORMATS).pack(pady=5)
+
+        include_data_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(export_win, text="Include visible variables' data", variable=include_data_var).pack(pady=5)
+
+        tk.Label(export_win, text="Decimate data to N points (blank = full):").pack(pady=(5, 0))
+        points_entry = tk.Entry(export_win)
+        points_entry.insert(0, str(plot_options.get("export_max_points", "")))
+        points_entry.pack(pady=5, padx=10)
+
+        def do_export():
+            fmt = format_var.get()
+            try:
+                max_points = int(points_entry.get()) if points_entry.get().strip() else None
+            except ValueError:
+                messagebox.showerror("Invalid Input", "Decimation must be a whole number of points.", parent=export_win)
+                return
+
+            base = filedialog.asksaveasfilename(
+                parent=export_win,
+                initialfile=f"{metadata.get('SN', model)}_export",
+                filetypes=[("CSV", "*.csv")] if fmt == "csv" else [("Parquet", "*.parquet")]
+            )
+            if not base:
+                return
+
+            visible_vars = [var for subplot in lines.values() for var, line in subplot.items() if line.get_visible()]
+            try:
+                paths = export_analysis(
+                    base, dataset, variable_config, spans, ax.get_xlim(), hide_outliers_mode.get(), fmt,
+                    columns=visible_vars if include_data_var.get() else None, max_points=max_points,
+                    stats_index=stats_index, time_col=time_col
+                )
+            except Exception as e:
+                messagebox.showerror("Export Error", str(e), parent=export_win)
+                return
+
+            plot_options["export_format"] = fmt
+            plot_options["export_max_points"] = max_points or ""
+            save_plot_options(model, plot_options)
+            messagebox.showinfo("Export Complete", "Wrote:\n" + "\n".join(paths), parent=export_win)
+            export_win.destroy()
+
+        tk.Button(export_win, text="Export", command=do_export).pack(pady=10)
+
+    tk.Button(toolbar, text="Export", command=open_export_window).pack(side='left')
+
+    def open_allan_window():
+        allan_win = tk.Toplevel(parent_frame)
+        allan_win.title(f"Allan Deviation: {serial}")
+        allan_win.geometry("800x600")
+        set_icon(allan_win)
+        try:
+            # Running periods within the visible window
+            embed_allan_plot(allan_win, dataset, spans, within=ax.get_xlim())
+        except ValueError as e:
+            allan_win.destroy()
+            messagebox.showerror("Allan Deviation", str(e), parent=parent_frame)
+
+    tk.Button(toolbar, text="Allan Deviation", command=open_allan_window).pack(side='left')
+
+    def open_correlation_window():
+        corr_win = tk.Toplevel(parent_frame)
+        corr_win.title(f"Correlation: {serial}")
+        corr_win.geometry("1100x600")
+        set_icon(corr_win)
+        shown = [var for var, idx in subplot_assignments.items()
+                 if var not in rolling_drawn and var in lines[idx] and lines[idx][var].get_visible()]
+        try:
+            # Running periods within the visible window, starting from the variables on screen
+            embed_correlation_plot(corr_win, dataset, spans, plottable_columns, selected=shown, within=ax.get_xlim())
+        except ValueError as e:
+            corr_win.destroy()
+            messagebox.showerror("Correlation", str(e), parent=parent_frame)
+
+    tk.Button(toolbar, text="Correlation", command=open_correlation_window).pack(side='left')
+
+    # Rolling mean/std overlays: drawn on their variable's subplot like any other line, computed
+    # with prefix sums and cached per (variable, window, spans)
+    def rolling_data(var, window):
+        key = (var, window, tuple(spans), len(dataset))
+        if key not in rolling_cache:
+            if len(rolling_cache) >= ROLLING_CACHE_SIZE:
+                rolling_cache.pop(next(iter(rolling_cache)))  # Oldest first
+            mean, std = rolling_stats(dataset.seconds, dataset[var].to_numpy(dtype=float), window,
+                                      span_boundaries(spans))
+            rolling_cache[key] = (mean, std)
+        return rolling_cache[key]
+
+    def draw_rolling_overlays():
+        # Remove the drawn overlays, then redraw those whose variable is showing
+        for idx, ax_lines in lines.items():
+            for name in [name for name in ax_lines if name in rolling_drawn]:
+                ax_lines.pop(name).remove()
+                subplot_assignments.pop(name, None)
+        rolling_drawn.clear()
+
+        for name, (var, window, kind) in rolling_overlays.items():
+            idx = subplot_assignments.get(var)
+            if idx is None or var not in lines[idx] or not lines[idx][var].get_visible():
+                continue
+            mean, std = rolling_data(var, window)
+            y = {"mean": mean, "upper": mean + std, "lower": mean - std}[kind]
+            x_plot, y_plot = dataset.seconds, y
+            if break_on_gaps_enabled:
+                x_plot, y_plot = insert_nan_gaps(x_plot, y_plot, threshold=gap_threshold.get())
+            line, = subplot_axes[idx].plot(x_plot, y_plot, label=name, color=colors[var],
+                                           linewidth=2.0 if kind == "mean" else 1.0,
+                                           linestyle='-' if kind == "mean" else '--', alpha=0.9)
+            lines[idx][name] = line
+            subplot_assignments[name] = idx
+            rolling_drawn.add(name)
+
+    def open_rolling_window():
+        shown = [var for var in plottable_columns if var in subplot_assignments]
+        if not shown:
+            messagebox.showinfo("Rolling Statistics", "Plot a variable first.", parent=parent_frame)
             return
 
-        top_margin = 0.05
-        bottom_margin = 0.12
-        spacing = 0.02  # space between plots
-        available_height = 1.0 - top_margin - bottom_margin - (spacing * (n - 1))
-        subplot_height = available_height / n
+        rolling_win = tk.Toplevel(parent_frame)
+        rolling_win.title("Rolling Statistics")
+        rolling_win.geometry("280x240")
+
+        tk.Label(rolling_win, text="Variable:").pack(pady=(5, 0))
+        var_choice = tk.StringVar(value=shown[0])
+        tk.OptionMenu(rolling_win, var_choice, *shown).pack(pady=5)
 
-        for i, ax in enumerate(reversed(visible_axes)):
-            bottom = bottom_margin + i * (subplot_height + spacing)
-            ax.set_position([0.1, bottom, 0.85, subplot_height])
+        tk.Label(rolling_win, text="Window (minutes):").pack(pady=(5, 0))
+        window_entry = tk.Entry(rolling_win)
+        window_entry.insert(0, str(plot_options.get("rolling_window_min", 10)))
+        window_entry.pack(pady=5, padx=10)
+
+        band_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(rolling_win, text="Show ±1σ band", variable=band_var).pack(pady=5)
+
+        def add_overlay():
+            try:
+                minutes = float(window_entry.get())
+                if minutes <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Invalid Input", "Window must be a positive number of minutes.", parent=rolling_win)
+                return
+            var, window = var_choice.get(), minutes * 60
+            label = f"{re.match(r'^[^(]*', var).group().strip()} {minutes:g} min"
+            rolling_overlays[f"{label} mean"] = (var, window, "mean")
+            if band_var.get():
+                rolling_overlays[f"{label} ±1σ"] = (var, window, "upper")
+                rolling_overlays[f"_{label} -1σ"] = (var, window, "lower")  # Shares the ±1σ legend entry
+            plot_options["rolling_window_min"] = minutes
+            draw_rolling_overlays()
+            rescale()
+
+        def clear_overlays():
+            rolling_overlays.clear()
+            draw_rolling_overlays()
+            rescale()
 
-            # X-labels only on bottom
-            ax.tick_params(labelbottom=(i == n - 1))
-            ax.tick_params(axis='x', rotation=45, labelsize=8)
-            ax.tick_params(axis='y', labelleft=True)
+        tk.Button(rolling_win, text="Add Overlay", command=add_overlay).pack(pady=5)
+        tk.Button(rolling_win, text="Clear Overlays", command=clear_overlays).pack(pady=5)
+
+    tk.Button(toolbar, text="Rolling Stats", command=open_rolling_window).pack(side='left')
+
+    # Spec-violation events: runs of rows outside the bounds, re-scanned only for edited variables
+    event_nav_ref = None
+    show_events = None
+
+    def refresh_events():
+        nonlocal event_index
+        new_index = build_event_index(dataset, variable_config, time_col, previous=event_index,
+                                      max_gap=gap_threshold.get())
+        if new_index is not event_index:
+            event_index = new_index
+            if event_nav_ref is not None and event_nav_ref.winfo_exists():
+                show_events()
+
+    def open_event_navigator():
+        nonlocal event_nav_ref, show_events, event_index
+
+        if event_nav_ref and event_nav_ref.winfo_exists():
+            event_nav_ref.lift()
+            return
+        event_index = build_event_index(dataset, variable_config, time_col, previous=event_index,
+                                        max_gap=gap_threshold.get())
+
+        nav_win = tk.Toplevel(parent_frame)
+        nav_win.title("Spec Violations")
+        nav_win.geometry("760x420")
+        event_nav_ref = nav_win
+
+        controls = tk.Frame(nav_win)
+        controls.pack(side='top', fill='x', padx=5, pady=5)
+        tk.Label(controls, text="Variable:").pack(side='left')
+        filter_var = tk.StringVar(value=ALL_VARIABLES)
+        filter_box = ttk.Combobox(controls, textvariable=filter_var, state='readonly', width=30)
+        filter_box.pack(side='left', padx=5)
+        absolute_only = tk.BooleanVar(value=False)
+        tk.Checkbutton(controls, text="Outside absolute only", variable=absolute_only,
+                       command=lambda: show_events()).pack(side='left', padx=5)
+
+        event_columns = ("variable", "start", "duration", "peak", "severity")
+        tree = ttk.Treeview(nav_win, columns=event_columns, show='headings', selectmode='browse')
+        for col in event_columns:
+            tree.heading(col, text=col.title())
+            tree.column(col, width=220 if col == "variable" else 120, anchor='w' if col == "variable" else 'center')
+        tree.pack(side='top', fill='both', expand=True, padx=5)
+
+        status_var = tk.StringVar()
+        tk.Label(nav_win, textvariable=status_var, anchor='w').pack(side='bottom', fill='x', padx=5)
+
+        events = []
+        current = None
+        jumped_xlim = None
+
+        def show():
+            nonlocal events, current
+            names = [var for var, entry in event_index["vars"].items() if len(entry["events"]["start"])]
+            filter_box["values"] = [ALL_VARIABLES] + names
+            if filter_var.get() not in names:
+                filter_var.set(ALL_VARIABLES)
+            chosen = None if filter_var.get() == ALL_VARIABLES else [filter_var.get()]
+            events = [event for event in list_events(event_index, chosen) if event[6] or not absolute_only.get()]
+            current = None
+
+            tree.delete(*tree.get_children())
+            for i, (start, end, var, peak_time, peak_value, rows, absolute) in enumerate(events[:MAX_LISTED_EVENTS]):
+                tree.insert("", "end", iid=str(i), values=(
+                    var, human_time_formatter.format_data_short(start), f"{end - start:g} s", f"{peak_value:.4g}",
+                    "absolute" if absolute else "typical"))
+            listed = f" (first {MAX_LISTED_EVENTS} listed)" if len(events) > MAX_LISTED_EVENTS else ""
+            status_var.set(f"{len(events)} event(s){listed}")
+
+        show_events = show
+
+        def jump_to(i):
+            nonlocal current, jumped_xlim
+            start, end = events[i][0], events[i][1]
+            pad = max(end - start, EVENT_MIN_VIEW) / 2
+            toolbar.push_current()
+            ax.set_xlim(start - pad, end + pad)  # Triggers on_zoom through xlim_changed
+            rescale()
+            current, jumped_xlim = i, ax.get_xlim()
+            if i < MAX_LISTED_EVENTS:
+                tree.selection_set(str(i))
+                tree.see(str(i))
+            status_var.set(f"Event {i + 1} of {len(events)}: {events[i][2]}")
+
+        def step(direction):
+            if not events:
+                return
+            if current is not None and ax.get_xlim() == jumped_xlim:
+                i = current + direction
+            else:  # The view moved since the last jump: continue from its center
+                center = sum(ax.get_xlim()) / 2
+                starts = [event[0] for event in events]
+                i = bisect.bisect_right(starts, center) if direction > 0 else bisect.bisect_left(starts, center) - 1
+            if 0 <= i < len(events):
+                jump_to(i)
+
+        def on_pick(event=None):
+            if tree.focus():
+                jump_to(int(tree.focus()))
+
+        tk.Button(controls, text="◀ Previous", command=lambda: step(-1)).pack(side='left', padx=5)
+        tk.Button(controls, text="Next ▶", command=lambda: step(1)).pack(side='left', padx=5)
+        filter_box.bind("<<ComboboxSelected>>", lambda e: show())
+        tree.bind("<Double-1>", on_pick)
+        show()
+
+    tk.Button(toolbar, text="Violations", command=open_event_navigator).pack(side='left')
+
+    def layout_subplots():
+        position_subplots(subplot_axes)
 
     layout_subplots()
 
@@ -768,6 +1097,91 @@ def embed_plot_7800_data(parent_frame, filepaths):
 
     tk.Button(toolbar, text="Hide Subplot", command=remove_subplot).pack(side='left')
 
+    # Follow mode: poll the newest file for appended DATA rows instead of reloading everything
+    sources = [src for src in df.attrs.get("sources", []) if src]
+    # Only the newest file can still be growing; compressed archives have no offset to resume from
+    follow_source = dict(sources[-1]) if sources and sources[-1].get("offset") is not None else None
+    follow_var = tk.BooleanVar(value=False)
+    follow_interval_ms = int(plot_options.get("follow_interval_ms", 2000))
+    follow_header = None
+    follow_job = None
+    follow_last_time = df[time_col].max()
+    follow_block_start = last_active_block_start(dataset, time_col=time_col)
+
+    def append_rows(new_rows):
+        nonlocal df, spans, spans_changed, follow_last_time, follow_block_start
+
+        new_rows = clean_error_codes(new_rows).reindex(columns=df.columns)
+        new_x = new_rows[time_col].to_numpy()
+        following_edge = ax.get_xlim()[1] >= follow_last_time
+        prev_end = follow_last_time
+
+        df = dataset.append(new_rows).df
+        follow_last_time = max(follow_last_time, np.nanmax(new_x))
+
+        for subplot_dict in lines.values():
+            for var, line in subplot_dict.items():
+                if var in rolling_drawn:
+                    continue  # Recomputed below
+                y_new = new_rows[var].to_numpy()
+                x_plot, y_plot = new_x, y_new
+                if break_on_gaps_enabled:
+                    x_plot, y_plot = insert_nan_gaps(new_x, y_new, threshold=gap_threshold.get())
+                    if new_x[0] - prev_end > gap_threshold.get():
+                        x_plot, y_plot = np.r_[np.nan, x_plot], np.r_[np.nan, y_plot]
+                line.set_data(np.concatenate([np.asarray(line.get_xdata(), dtype=float), x_plot]),
+                              np.concatenate([np.asarray(line.get_ydata(), dtype=float), y_plot]))
+
+        # Only the last operational block can grow, so earlier spans are kept as they are
+        spans = extend_operational_spans(dataset, spans, follow_block_start, run_threshold.get(), time_col=time_col)
+        tail = dataset.slice_time(follow_block_start, np.inf) if follow_block_start is not None else df
+        follow_block_start = last_active_block_start(tail, time_col=time_col)
+        spans_changed = True
+        draw_rolling_overlays()
+
+        if following_edge:
+            xmin, xmax = ax.get_xlim()
+            ax.set_xlim(xmin, follow_last_time)  # Triggers on_zoom, which refreshes the spec checks
+        else:
+            on_zoom()
+        rescale()
+
+    def poll_followed_file():
+        nonlocal follow_header, follow_job
+        follow_job = None
+        if not follow_var.get():
+            return
+        try:
+            if not parent_frame.winfo_exists():
+                return
+            if follow_header is None:
+                follow_header = read_data_header(follow_source["path"])
+            new_rows, follow_source["offset"] = read_appended_rows(
+                follow_source["path"], follow_source["offset"], *follow_header, after=follow_last_time)
+            if not new_rows.empty:
+                log.debug("📥 %d new rows from %s", len(new_rows), follow_source["path"])
+                append_rows(new_rows)
+        except Exception as e:
+            follow_var.set(False)
+            messagebox.showerror("Follow Error", f"Stopped following {follow_source['path']}:\n{e}", parent=parent_frame)
+            return
+        follow_job = parent_frame.after(follow_interval_ms, poll_followed_file)
+
+    def toggle_follow():
+        nonlocal follow_job, shared, dataset, df
+        if follow_job is not None:
+            parent_frame.after_cancel(follow_job)
+            follow_job = None
+        if follow_var.get():
+            # Appending rows must not change the data other windows are showing
+            shared = detach_dataset(shared)
+            dataset = shared.dataset
+            df = dataset.df
+            poll_followed_file()
+
+    if follow_source:
+        tk.Checkbutton(toolbar, text="Follow File", variable=follow_var, command=toggle_follow).pack(side='left')
+
     def edit_variable_config(parent, model_id, available_columns):
         nonlocal variable_config
         window = tk.Toplevel(parent)
@@ -789,41 +1203,57 @@ def embed_plot_7800_data(parent_frame, filepaths):
         scrollbar.pack(side="right", fill="y")
         tree.configure(yscrollcommand=scrollbar.set)
 
+        dirty = set()  # Variables edited since the last revalidation
+        apply_job = None
+
+        def insert_row(var):
+            settings = variable_config[var]
+            typ = settings.get("typical", ["", ""])
+            abs_ = settings.get("absolute", ["", ""])
+            autoplot = settings.get("autoplot", False)
+            tree.insert("", "end", iid=var, values=(var, abs_[0], typ[0], typ[1], abs_[1], autoplot))
+
         def refresh_tree():
             tree.delete(*tree.get_children())
-            for var, settings in variable_config.items():
-                typ = settings.get("typical", ["", ""])
-                abs_ = settings.get("absolute", ["", ""])
-                autoplot = settings.get("autoplot", False)
-                tree.insert("", "end", iid=var, values=(var, abs_[0], typ[0], typ[1], abs_[1], autoplot))
-
-        def update():
-            selected = tree.get_children()
-            if not selected:
-                messagebox.showwarning("No Variables In Tree", "Select a variable to update.")
-                return
-            for var in selected:
-                values = tree.item(var, "values")
-                try:
-                    variable_config[var]["typical"] = [float(values[2]), float(values[3])]
-                    variable_config[var]["absolute"] = [float(values[1]), float(values[4])]
-                    variable_config[var]["autoplot"] = values[5].lower() in ("true", "1")
-                except Exception as e:
-                    messagebox.showerror("Update Error", f"{var}: {e}")
+            for var in variable_config:
+                insert_row(var)
+
+        def apply_dirty():
+            nonlocal apply_job
+            apply_job = None
+            edited = list(dirty)
+            dirty.clear()
             try:
-                on_zoom()
+                revalidate(edited)
             except Exception as e:
                 messagebox.showerror("Config Update Error", f"{e}")
 
+        def mark_dirty(variables):
+            # Several edits before the next idle moment are revalidated together
+            nonlocal apply_job
+            dirty.update(variables)
+            if apply_job is None:
+                apply_job = parent_frame.after_idle(apply_dirty)
+
+        def update(var):
+            values = tree.item(var, "values")
+            try:
+                typical = [float(values[2]), float(values[3])]
+                absolute = [float(values[1]), float(values[4])]
+            except Exception as e:
+                messagebox.showerror("Update Error", f"{var}: {e}")
+                return
+            variable_config[var]["typical"] = typical
+            variable_config[var]["absolute"] = absolute
+            variable_config[var]["autoplot"] = str(values[5]).lower() in ("true", "1")
+            mark_dirty([var])
+
         def remove_selected():
-            nonlocal validation_results
             selected = tree.selection()
             for var in selected:
                 variable_config.pop(var, None)
-                validation_results[var] = "unclassified"
-            refresh_tree()
-            update()
-            on_zoom()
+            tree.delete(*selected)
+            mark_dirty(selected)
 
         def add_variable():
             available = [col for col in available_columns if col not in variable_config]
@@ -846,8 +1276,8 @@ def embed_plot_7800_data(parent_frame, filepaths):
                         "absolute": [0.0, 1.0],
                         "autoplot": False
                     }
-                    refresh_tree()
-                    update()
+                    insert_row(var)
+                    mark_dirty([var])
                     top.destroy()
 
             ttk.Button(top, text="Add", command=confirm_add).pack(pady=10)
@@ -878,7 +1308,7 @@ def embed_plot_7800_data(parent_frame, filepaths):
                 values = list(tree.item(row)["values"])
                 values[col_idx] = new_value
                 tree.item(row, values=values)
-                update()
+                update(row)
                 entry.destroy()
 
             entry.bind("<Return>", save_edit)
@@ -900,19 +1330,69 @@ def embed_plot_7800_data(parent_frame, filepaths):
         parent_frame, model, df.columns.tolist())).pack(side='left')
 
 
-    if plotted == 2:
-        add_subplot()
-    elif plotted == 3:
-        add_subplot()
-        add_subplot()
-    elif plotted >= 4:
-        add_subplot()
-        add_subplot()
+    def on_destroy(event):
+        nonlocal follow_job
+        if event.widget is not parent_frame:
+            return
+        if follow_job is not None:
+            parent_frame.after_cancel(follow_job)
+            follow_job = None
+        plt.close(fig)  # pyplot would otherwise keep the figure, and through it this window's data
+
+    parent_frame.bind("<Destroy>", on_destroy, add="+")
+
+    def current_view():
+        visible = {var: idx for var, idx in subplot_assignments.items()
+                   if var not in rolling_drawn and var in lines[idx] and lines[idx][var].get_visible()}
+        return {
+            "subplots": sum(ax_sub.get_visible() for ax_sub in subplot_axes),
+            "assignments": visible,
+            "xlim": [float(v) for v in ax.get_xlim()],
+            "options": {
+                "outliers": hide_outliers_mode.get(),
+                "use_human_time": use_human_time.get(),
+                "draw_spans": draw_spans_var.get(),
+                "break_on_gaps": break_on_gaps_enabled,
+                "gap_threshold": gap_threshold.get(),
+                "run_threshold": run_threshold.get(),
+            },
+        }
+
+    def save_session_as():
+        path = filedialog.asksaveasfilename(
+            parent=parent_frame, title="Save Session", defaultextension=SESSION_EXTENSION,
+            filetypes=[("7800 Session", f"*{SESSION_EXTENSION}"), ("All File Types", "*")])
+        if not path:
+            return
+
+        # Followed windows hold rows the files on disk no longer match, so only their view is saved
+        cache = shared.cache_key if shared.key is not None else None
+        try:
+            if cache and not has_cached_frame(cache):
+                meta = {"model": model, "metadata": metadata, "time_col": time_col,
+                        "spans": spans_to_json(shared.spans)}
+                if not save_cached_frame(cache, dataset.df, meta, sources=filepaths):
+                    cache = None
+            save_session(path, filepaths, current_view(), spans, validation_results, cache)
+        except Exception as e:
+            messagebox.showerror("Session Error", f"Failed to save session:\n{e}", parent=parent_frame)
+
+    tk.Button(toolbar, text="Save Session", command=save_session_as).pack(side='left')
+
+    n_subplots = int(view.get("subplots", 1)) if view else min(len(autoplotted), len(subplot_axes))
+    for _ in range(n_subplots - 1):
         add_subplot()
 
+    if view and view.get("xlim"):
+        ax.set_xlim(view["xlim"])  # Refreshes the spec checks through on_zoom
+        rescale()
+        toolbar.push_current()
+        canvas.draw_idle()
+
 if __name__ == "__main__":
     import sys
 
+    configure_logging()
     root = tk.Tk()
     root.title("Embedded Plot Test")
 
@@ -0,0 +1,99 @@
+import os
+import threading
+
+from app_logging import get_logger
+from dataset import Dataset
+
+log = get_logger("registry")
+
+
+class SharedData:
+    """
+    One loaded file set: the sorted Dataset plus everything derived from it that does not depend
+    on a window's settings (model, metadata, default spans, the stats index tables).
+
+    Windows treat it as read-only; a window that needs to modify rows (follow mode) detaches first.
+    """
+
+    def __init__(self, dataset, model, metadata, time_col, spans):
+        self.dataset = dataset
+        self.model = model
+        self.metadata = metadata
+        self.time_col = time_col
+        self.spans = spans
+        self.stats_index = None
+        self.column_ranges = None  # {column: (min, max)} when known without scanning the rows
+        self.cache_key = None  # data_cache key of the files this was loaded from
+        self.key = None
+        self.refs = 0
+
+
+_entries = {}
+_lock = threading.Lock()
+
+
+def file_set_key(filepaths):
+    """Order-independent key of a file set; a file that was modified since loading gives a new key."""
+    key = []
+    for path in filepaths:
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+            key.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            key.append((path, None, None))
+    return frozenset(key)
+
+
+def acquire_dataset(filepaths, loader):
+    """
+    Return the shared data for `filepaths`, calling `loader(filepaths)` (which returns a SharedData)
+    only if no open window has loaded the same, unchanged files. Pair with release_dataset.
+    """
+    key = file_set_key(filepaths)
+    with _lock:
+        shared = _entries.get(key)
+        if shared is None:
+            shared = loader(filepaths)
+            shared.key = key
+            _entries[key] = shared
+            log.debug("Loaded file set of %d file(s)", len(filepaths))
+        else:
+            log.info("♻️ Reusing loaded data for %d file(s) (%d other window(s))", len(filepaths), shared.refs)
+        shared.refs += 1
+    return shared
+
+
+def release_dataset(shared):
+    """Drop one window's reference; the data is forgotten when the last window lets go."""
+    with _lock:
+        shared.refs -= 1
+        if shared.refs <= 0 and _entries.get(shared.key) is shared:
+            del _entries[shared.key]
+            log.debug("Released file set (%d still loaded)", len(_entries))
+
+
+def detach_dataset(shared):
+    """
+    Give the caller data it may modify: the same object if no other window uses it (it just stops
+    being offered to new windows), otherwise a private copy.
+    """
+    with _lock:
+        if _entries.get(shared.key) is not shared:
+            return shared  # Already private
+        if shared.refs <= 1:
+            del _entries[shared.key]
+            shared.key = None  # No longer the data of the files as loaded
+            return shared
+        shared.refs -= 1
+
+    private = SharedData(Dataset(shared.dataset.df.copy(), shared.time_col), shared.model,
+                         dict(shared.metadata), shared.time_col, list(shared.spans))
+    private.refs = 1
+    return private
+
+
+def loaded_file_sets():
+    """Number of file sets currently held in memory (for diagnostics)."""
+    with _lock:
+        return len(_entries)
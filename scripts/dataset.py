@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+TIME_COL = 'SECONDS (secs)'
+NANOS_COL = 'NANOSECONDS (nsecs)'
+
+_UNSET_NS = np.iinfo(np.int64).max  # Rows without a timestamp sort last
+
+
+def merge_ranges(ranges):
+    """Sort and merge half-open [a, b) row ranges, dropping empty ones."""
+    merged = []
+    for a, b in sorted(r for r in ranges if r[1] > r[0]):
+        if merged and a <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], b)
+        else:
+            merged.append([a, b])
+    return merged
+
+
+def _nanosecond_index(df, time_col, nanos_col):
+    seconds = df[time_col].to_numpy(dtype=float)
+    valid = ~np.isnan(seconds)
+    t_ns = np.full(len(seconds), _UNSET_NS, dtype=np.int64)
+    t_ns[valid] = seconds[valid].astype(np.int64) * 1_000_000_000
+    if nanos_col in df:
+        nanos = df[nanos_col].to_numpy(dtype=float)
+        ok = valid & ~np.isnan(nanos)
+        t_ns[ok] += nanos[ok].astype(np.int64)
+    return t_ns
+
+
+class Dataset:
+    """
+    A merged 7800 DataFrame sorted once by SECONDS + NANOSECONDS, with an int64 nanosecond
+    index for O(log n) time-range lookups.
+
+    Behaves like the underlying DataFrame for column access (`ds[col]`, `col in ds`, `len(ds)`),
+    so it can be passed anywhere a frame is expected; `ds.df` is the sorted frame itself.
+    """
+
+    def __init__(self, df, time_col=TIME_COL, nanos_col=NANOS_COL):
+        self.time_col = time_col
+        self.nanos_col = nanos_col
+        self._set_frame(df)
+
+    def _set_frame(self, df):
+        t_ns = _nanosecond_index(df, self.time_col, self.nanos_col)
+        if len(t_ns) > 1 and (np.diff(t_ns) < 0).any():
+            order = np.argsort(t_ns, kind="stable")
+            attrs = dict(df.attrs)
+            df = df.iloc[order].reset_index(drop=True)
+            df.attrs.update(attrs)
+            t_ns = t_ns[order]
+        elif not df.index.equals(pd.RangeIndex(len(df))):
+            df = df.reset_index(drop=True)
+
+        self.df = df
+        self.t_ns = t_ns
+        self.seconds = df[self.time_col].to_numpy(dtype=float)
+
+    # --- DataFrame-like access ---
+    def __len__(self):
+        return len(self.df)
+
+    def __getitem__(self, key):
+        return self.df[key]
+
+    def __contains__(self, key):
+        return key in self.df
+
+    @property
+    def columns(self):
+        return self.df.columns
+
+    @property
+    def attrs(self):
+        return self.df.attrs
+
+    @property
+    def empty(self):
+        return self.df.empty
+
+    # --- Range queries ---
+    def row_range(self, t0, t1):
+        """Half-open row range [a, b) of rows with t0 <= SECONDS <= t1."""
+        a = int(np.searchsorted(self.seconds, t0, side="left"))
+        b = int(np.searchsorted(self.seconds, t1, side="right"))
+        return a, max(a, b)
+
+    def slice_time(self, t0, t1):
+        """Rows with t0 <= SECONDS <= t1, as a view of the sorted frame."""
+        a, b = self.row_range(t0, t1)
+        return self.df.iloc[a:b]
+
+    def span_ranges(self, spans, period=1, within=None):
+        """
+        Merged row ranges covered by one period of each span (0 startup, 1 running, 2 shutdown),
+        optionally clipped to the (t0, t1) window `within`.
+        """
+        lo, hi = self.row_range(*within) if within is not None else (0, len(self.df))
+        ranges = []
+        for span in spans:
+            start, end = span[period]
+            if (start, end) == (-1, -1):
+                continue
+            a, b = self.row_range(start, end)
+            ranges.append((max(a, lo), min(b, hi)))
+        return merge_ranges(ranges)
+
+    def rows_in_spans(self, spans, period=1):
+        """One view of the sorted frame per span period (running by default)."""
+        return [self.df.iloc[a:b] for a, b in self.span_ranges(spans, period)]
+
+    def take(self, col, ranges):
+        """Values of `col` over the given row ranges (a view when there is a single range)."""
+        values = self.df[col].to_numpy()
+        if len(ranges) == 1:
+            a, b = ranges[0]
+            return values[a:b]
+        return np.concatenate([values[a:b] for a, b in ranges]) if ranges else values[:0]
+
+    def frame_for(self, ranges):
+        """Rows over the given row ranges as one frame (a view when there is a single range)."""
+        if len(ranges) == 1:
+            a, b = ranges[0]
+            return self.df.iloc[a:b]
+        return self.df.iloc[np.concatenate([np.arange(a, b) for a, b in ranges])] if ranges else self.df.iloc[:0]
+
+    def append(self, new_rows):
+        """Add rows (e.g. from follow mode); cheap when they all come after the current data."""
+        new_rows = new_rows.reindex(columns=self.df.columns)
+        new_ns = _nanosecond_index(new_rows, self.time_col, self.nanos_col)
+        merged = pd.concat([self.df, new_rows], ignore_index=True)
+        merged.attrs.update(self.df.attrs)
+        if len(new_ns) and len(self.t_ns) and (new_ns.min() < self.t_ns[-1] or (np.diff(new_ns) < 0).any()):
+            self._set_frame(merged)
+        else:
+            self.df = merged
+            self.t_ns = np.concatenate([self.t_ns, new_ns])
+            self.seconds = merged[self.time_col].to_numpy(dtype=float)
+        return self
+
+
+def as_frame(data):
+    """The DataFrame behind `data`, which may be a Dataset or already a DataFrame."""
+    return data.df if isinstance(data, Dataset) else data
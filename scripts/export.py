@@ -0,0 +1,216 @@
+import os
+import numpy as np
+import pandas as pd
+
+from app_logging import get_logger
+from dataset import Dataset, as_frame
+from manipulation import compute_spec_stats, minmax_decimate_indices
+
+log = get_logger("export")
+
+EXPORT_FORMATS = ("csv", "parquet")
+CHUNK_ROWS = 100_000
+
+PERIOD_NAMES = ("startup", "running", "shutdown")
+
+
+def stats_table(stats, results=None, mode="None", xlim=None):
+    """One row per variable with the stats panel values for the given window and outlier mode."""
+    results = results or {}
+    rows = []
+    for var, stat in stats.items():
+        rows.append({
+            "variable": var,
+            "mode": mode,
+            "window_start": xlim[0] if xlim else np.nan,
+            "window_end": xlim[1] if xlim else np.nan,
+            "mean": stat["mean"],
+            "min": stat["min"],
+            "max": stat["max"],
+            "total": stat["total"],
+            "in_typical": stat["in_typical"],
+            "in_absolute": stat["in_absolute"],
+            "status": results.get(var, "unclassified"),
+        })
+    columns = ["variable", "mode", "window_start", "window_end", "mean", "min", "max", "total",
+               "in_typical", "in_absolute", "status"]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def spans_table(spans):
+    """One row per startup/running/shutdown period; shutdown is omitted when none was allotted."""
+    rows = []
+    for i, span in enumerate(spans):
+        for name, (start, end) in zip(PERIOD_NAMES, span):
+            if (start, end) == (-1, -1):
+                continue
+            rows.append({"block": i, "period": name, "start": start, "end": end, "duration": end - start})
+    return pd.DataFrame(rows, columns=["block", "period", "start", "end", "duration"])
+
+
+def _parquet_module():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet export needs the optional 'pyarrow' package; export as CSV instead.")
+    return pyarrow
+
+
+def write_table(df, path, fmt="csv"):
+    if fmt == "parquet":
+        pa = _parquet_module()
+        pa.parquet.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def write_rows_chunked(df, rows, columns, path, fmt="csv", chunk_rows=CHUNK_ROWS):
+    """
+    Write `columns` of `df` for the row positions in `rows` (a slice or an index array) in chunks,
+    so only one chunk is ever copied out of the frame at a time.
+    """
+    if isinstance(rows, slice):
+        start, stop, _ = rows.indices(len(df))
+        chunks = (slice(a, min(a + chunk_rows, stop)) for a in range(start, stop, chunk_rows))
+        total = max(stop - start, 0)
+    else:
+        chunks = (rows[a:a + chunk_rows] for a in range(0, len(rows), chunk_rows))
+        total = len(rows)
+
+    writer = None
+    try:
+        if fmt == "parquet":
+            pa = _parquet_module()
+        wrote_header = False
+        for chunk_rows_idx in chunks:
+            chunk = df.iloc[chunk_rows_idx][columns]
+            if fmt == "parquet":
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pa.parquet.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(path, mode="a" if wrote_header else "w", header=not wrote_header, index=False)
+            wrote_header = True
+
+        if not wrote_header:  # Still produce a file with the column layout
+            write_table(df.iloc[:0][columns], path, fmt)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    log.info("💾 Wrote %d rows to %s", total, path)
+    return path
+
+
+def export_analysis(base_path, dataset, variable_config, spans, xlim=None, mode="None", fmt="csv",
+                    columns=None, max_points=None, stats=None, results=None, stats_index=None,
+                    time_col='SECONDS (secs)', chunk_rows=CHUNK_ROWS):
+    """
+    Export the stats for the window and mode, the span table and, optionally, the visible rows.
+
+    Files are written next to each other as <base>_stats, <base>_spans and <base>_data with the
+    format's extension. `columns` selects the data columns to export (None skips the data file);
+    `max_points` applies a min/max level-of-detail reduction to them. Returns the written paths.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'; expected one of {', '.join(EXPORT_FORMATS)}")
+    if fmt == "parquet":
+        _parquet_module()  # Fail before writing anything
+
+    if not isinstance(dataset, Dataset):
+        dataset = Dataset(as_frame(dataset), time_col)
+    df = dataset.df
+
+    if xlim is None:
+        xlim = (np.nanmin(dataset.seconds), np.nanmax(dataset.seconds)) if len(df) else (0, 0)
+    if stats is None:
+        results, stats = compute_spec_stats(dataset, variable_config, spans, xlim, results, mode, time_col, stats_index)
+
+    base_path = os.path.splitext(base_path)[0]
+    if os.path.dirname(base_path):
+        os.makedirs(os.path.dirname(base_path), exist_ok=True)
+    ext = "parquet" if fmt == "parquet" else "csv"
+    paths = [
+        write_table(stats_table(stats, results, mode, xlim), f"{base_path}_stats.{ext}", fmt),
+        write_table(spans_table(spans), f"{base_path}_spans.{ext}", fmt),
+    ]
+
+    if columns:
+        lead = [c for c in (time_col, dataset.nanos_col) if c in df and c not in columns]
+        columns = lead + [c for c in columns if c in df]
+        a, b = dataset.row_range(*xlim)
+        if max_points:
+            rows = a + minmax_decimate_indices([df[c].to_numpy()[a:b] for c in columns if c not in lead], max_points)
+        else:
+            rows = slice(a, b)
+        paths.append(write_rows_chunked(df, rows, columns, f"{base_path}_data.{ext}", fmt, chunk_rows))
+
+    return paths
+
+
+def load_file_set(filepaths, run_threshold=2, time_range=None):
+    """
+    Load and clean `filepaths` headlessly and detect their periods, like the viewer does.
+
+    Returns a dict with the model, metadata, time_col, sorted dataset, spans and compiled config.
+    With `time_range`, only the rows within it are parsed, so spans are detected from those rows.
+    """
+    from file_parsing import load_data_files, merge_frames, clean_error_codes, compile_variable_config
+    from manipulation import identify_spans_per_file
+
+    frames, model, metadata = load_data_files(filepaths, on_file=clean_error_codes, time_range=time_range)
+    df = merge_frames(frames)
+    time_col = next((col for col in df.columns if "SECONDS" in col.upper()), df.columns[0])
+    return {
+        "model": model,
+        "metadata": metadata,
+        "time_col": time_col,
+        "dataset": Dataset(df, time_col),
+        "spans": identify_spans_per_file(frames, run_threshold, time_col=time_col),
+        "compiled": compile_variable_config(model, metadata.get("Software Version", "0.0.0"), list(df.columns)),
+    }
+
+
+def export_files(filepaths, base_path, xlim=None, mode="None", fmt="csv", columns=None, max_points=None,
+                 run_threshold=2, window_only=False):
+    """
+    Headless export: load and clean `filepaths`, detect spans, and export like the viewer would.
+
+    With `window_only`, only the rows within `xlim` are parsed, so spans are detected from those rows.
+    """
+    loaded = load_file_set(filepaths, run_threshold, time_range=xlim if window_only else None)
+    dataset, time_col = loaded["dataset"], loaded["time_col"]
+
+    if columns == ["all"]:
+        columns = [c for c in dataset.columns if c != time_col]
+    return export_analysis(base_path, dataset, loaded["compiled"]["variable_config"], loaded["spans"], xlim,
+                           mode, fmt, columns, max_points, time_col=time_col)
+
+
+if __name__ == "__main__":
+    import argparse
+    from app_logging import configure_logging
+
+    parser = argparse.ArgumentParser(description="Export 7800 stats, spans and data without the GUI")
+    parser.add_argument("files", nargs="+", help=".data files from one instrument")
+    parser.add_argument("--out", required=True, help="Output base path, e.g. reports/TG10-01001")
+    parser.add_argument("--mode", default="None", choices=["None", "Running", "IQR"])
+    parser.add_argument("--format", default="csv", choices=EXPORT_FORMATS)
+    parser.add_argument("--start", type=float, help="Window start (epoch seconds)")
+    parser.add_argument("--end", type=float, help="Window end (epoch seconds)")
+    parser.add_argument("--columns", nargs="*", help="Data columns to export ('all' for every column)")
+    parser.add_argument("--max-points", type=int, help="Min/max decimate the data export to about this many rows")
+    parser.add_argument("--window-only", action="store_true",
+                        help="Parse only the rows between --start and --end (periods are detected from those rows)")
+    args = parser.parse_args()
+
+    configure_logging("INFO")
+    window = (args.start, args.end) if args.start is not None and args.end is not None else None
+    if args.window_only and window is None:
+        parser.error("--window-only needs --start and --end")
+    for p in export_files(args.files, args.out, window, args.mode, args.format, args.columns, args.max_points,
+                          window_only=args.window_only):
+        print(p)
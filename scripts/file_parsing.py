@@ -1,33 +1,262 @@
 import re
 import os
+import io
+import csv
+import gzip
+import lzma
+import bz2
 import pandas as pd
 import numpy as np
 import sys
 import json
-from PIL import Image, ImageTk
 import shutil
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from unicodedata import normalize
 from tkinter import messagebox
 from packaging.version import Version
+from app_logging import get_logger
+# Kept importable from here for existing callers; they live in the lightweight resources module
+from resources import resource_path, set_icon
+
+log = get_logger("parsing")
+
+DATA_PREFIX = b"DATA\t"
+HEADER_PREFIX = b"DATAH"
+UNITS_PREFIX = b"DATAU"
+MAX_REPORTED_LINES = 1000  # Dropped line numbers kept in the diagnostics; the count is always exact
+CHUNK_BYTES = 16 * 1024 * 1024  # Decompressed bytes parsed at a time
+SUMMARY_PROBE_BYTES = 64 * 1024  # Bytes read from each end of a file to summarize it
+
+# Archived logs may be compressed; the format is detected from the first bytes, not the extension
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"\xfd7zXZ\x00": "xz",
+    b"BZh": "bz2",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+COMPRESSED_EXTENSIONS = (".gz", ".xz", ".bz2", ".zst")
+
+def detect_compression(filepath):
+    """'gzip', 'xz', 'bz2' or 'zstd' from the file's magic bytes, or None for a plain file."""
+    with open(filepath, 'rb') as file:
+        head = file.read(6)
+    return next((kind for magic, kind in COMPRESSION_MAGIC.items() if head.startswith(magic)), None)
+
+def open_data_file(filepath, compression=None):
+    """Open a .data file for binary reading, decompressing on the fly if it is compressed."""
+    if compression is None:
+        compression = detect_compression(filepath)
+    if compression is None:
+        return open(filepath, 'rb')
+    if compression == "gzip":
+        return gzip.open(filepath, 'rb')
+    if compression == "xz":
+        return lzma.open(filepath, 'rb')
+    if compression == "bz2":
+        return bz2.open(filepath, 'rb')
+    try:
+        from compression import zstd  # Standard library from Python 3.14
+    except ImportError:
+        raise ValueError(f"{filepath} is zstd-compressed, which needs Python 3.14 or newer; "
+                         "recompress it with gzip, xz or bz2")
+    return zstd.open(filepath, 'rb')
+
+def _line_table(buf):
+    """
+    Start, content-end and next-line byte offsets of every line in `buf` (a uint8 array), plus
+    whether each line is terminated. LF, CRLF and lone CR endings are all accepted.
+    """
+    n = len(buf)
+    lf = buf == 10
+    cr = buf == 13
+    lone_cr = cr.copy()
+    lone_cr[:-1] &= ~lf[1:]
+    term = np.flatnonzero(lf | lone_cr)
+
+    crlf = np.zeros(len(term), dtype=bool)
+    has_prev = term > 0
+    crlf[has_prev] = lf[term[has_prev]] & cr[term[has_prev] - 1]
+
+    starts = np.r_[0, term + 1]
+    ends = np.r_[term - crlf, n]
+    nexts = np.r_[term + 1, n]
+    terminated = np.r_[np.ones(len(term), dtype=bool), False]
+    if starts[-1] == n:  # Nothing after the last line ending
+        starts, ends, nexts, terminated = starts[:-1], ends[:-1], nexts[:-1], terminated[:-1]
+
+    if not len(term):
+        ending = None
+    elif crlf.all():
+        ending = "CRLF"
+    elif not crlf.any():
+        ending = "CR" if lone_cr.any() and not lf.any() else ("LF" if not lone_cr.any() else "mixed")
+    else:
+        ending = "mixed"
+    return starts, ends, nexts, terminated, ending
+
+def _has_prefix(buf, starts, ends, prefix):
+    ok = (ends - starts) >= len(prefix)
+    last = max(len(buf) - 1, 0)
+    for k, byte in enumerate(prefix):  # One vectorized comparison per prefix byte
+        ok &= buf[np.minimum(starts + k, last)] == byte
+    return ok
+
+def _line_fields(raw, start, end):
+    return raw[start:end].decode('utf-8').split('\t')[1:]
+
+def _empty_frame(columns):
+    return pd.DataFrame(np.empty((0, len(columns))), columns=columns)
+
+def _read_rows(raw, starts, nexts, kept, headers, units):
+    """
+    Parse the (well-formed) DATA lines `kept` with pandas' C reader. Consecutive lines are passed
+    as one slice of `raw`, so the only Python-level work is per run of kept lines.
+
+    Returns the frame, {column: coerced cell count} for columns mixing numbers with text, and
+    the columns holding only text (e.g. DATE, TIME), which are NaN after numeric conversion.
+    """
+    columns = [f"{col} ({unit})" for col, unit in zip(headers, list(units) + [""] * len(headers))]
+    if not len(kept):
+        return _empty_frame(columns), {}, []
+
+    breaks = np.flatnonzero(np.diff(kept) != 1) + 1
+    firsts = kept[np.r_[0, breaks]]
+    lasts = kept[np.r_[breaks - 1, len(kept) - 1]]
+    view = memoryview(raw)
+    blob = b"".join(view[a:b] for a, b in zip(starts[firsts], nexts[lasts]))
+
+    df = pd.read_csv(io.BytesIO(blob), sep='\t', header=None, usecols=range(1, len(headers) + 1),
+                     quoting=csv.QUOTE_NONE, engine='c', low_memory=False, encoding='utf-8')
+    df.columns = columns
+
+    coerced, text_columns = {}, []
+    for col in df.columns[df.dtypes == object]:
+        present = df[col].notna()
+        numeric = pd.to_numeric(df[col], errors='coerce')
+        bad = int((present & numeric.isna()).sum())
+        if bad == int(present.sum()):
+            text_columns.append(col)
+        elif bad:
+            coerced[col] = bad
+        df[col] = numeric
+    return df, coerced, text_columns
+
+def parse_data_bytes(raw, headers=None, units=None, first_line=1):
+    """
+    Vectorized parse of the DATA rows in `raw` (bytes of a .data file or of a chunk of one).
+
+    DATAH/DATAU lines anywhere in `raw` (e.g. repeated after a firmware restart) switch the
+    columns for the rows that follow; rows before the first header use `headers`/`units`.
+    DATA rows with the wrong field count are dropped and reported, never silently skipped.
+
+    Returns (df, diagnostics, end, (headers, units)) where `end` is the byte offset just past
+    the last complete line, the last tuple is the header in effect at the end of `raw` (to
+    continue with the next chunk) and diagnostics is a small dict: lines, data_lines, rows,
+    dropped, dropped_lines (line numbers counted from `first_line`, the first
+    MAX_REPORTED_LINES of them), coerced_cells, text_columns, header_repeats and line_ending.
+    """
+    continued = headers is not None
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    starts, ends, nexts, terminated, ending = _line_table(buf)
+
+    is_data = _has_prefix(buf, starts, ends, DATA_PREFIX)
+    is_header = _has_prefix(buf, starts, ends, HEADER_PREFIX)
+    is_units = _has_prefix(buf, starts, ends, UNITS_PREFIX)
+
+    tab_count = np.r_[0, np.cumsum(buf == 9, dtype=np.int32 if len(buf) < 2**31 else np.int64)]
+    tabs = tab_count[ends] - tab_count[starts]
+
+    # Segments of lines sharing one header: [segment start, next header line)
+    header_lines = np.flatnonzero(is_header)
+    bounds = np.r_[0, header_lines, len(starts)]
+    units_lines = np.flatnonzero(is_units)
+
+    groups = []  # [(headers, units), kept line indices], consecutive segments with equal headers merged
+    good = np.zeros(len(starts), dtype=bool)
+    for seg in range(len(bounds) - 1):
+        first, stop = bounds[seg], bounds[seg + 1]
+        if seg > 0:
+            headers = _line_fields(raw, starts[first], ends[first])
+            following = units_lines[(units_lines > first) & (units_lines < stop)]
+            if len(following):
+                units = _line_fields(raw, starts[following[0]], ends[following[0]])
+            elif units is None or len(units) != len(headers):
+                units = [""] * len(headers)
+        if headers is None or first == stop:
+            continue
 
-def set_icon(r):
-    ico = Image.open(resource_path('assets/icon.png'))
-    photo = ImageTk.PhotoImage(ico)
-    r.wm_iconphoto(True, photo)
-
-def resource_path(relative_path):
-    base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
-    return os.path.join(base_path, relative_path)
-
-def parse_7800_data_file(filepath):
-    with open(filepath, 'r', encoding='utf-8') as file:
-        lines = file.readlines()
-
-    # --- Extract metadata from lines before DATAH ---
+        seg_good = is_data[first:stop] & (tabs[first:stop] == len(headers))
+        good[first:stop] = seg_good
+        kept = first + np.flatnonzero(seg_good)
+        key = (tuple(headers), tuple(units or ()))
+        if groups and groups[-1][0] == key:
+            groups[-1][1].append(kept)
+        else:
+            groups.append((key, [kept]))
+
+    frames, coerced, text_columns = [], {}, []
+    for (group_headers, group_units), kept in groups:
+        df, group_coerced, group_text = _read_rows(raw, starts, nexts, np.concatenate(kept),
+                                                   list(group_headers), list(group_units))
+        frames.append(df)
+        for col, count in group_coerced.items():
+            coerced[col] = coerced.get(col, 0) + count
+        text_columns += [col for col in group_text if col not in text_columns]
+
+    if not frames:
+        columns = [f"{h} ({u})" for h, u in zip(headers or [], list(units or []) + [""] * len(headers or []))]
+        df = _empty_frame(columns)
+    elif len(frames) == 1:
+        df = frames[0]
+    else:
+        df = pd.concat(frames, ignore_index=True)
+
+    dropped = np.flatnonzero(is_data & ~good)
+    diagnostics = {
+        "lines": len(starts),
+        "data_lines": int(is_data.sum()),
+        "rows": len(df),
+        "dropped": len(dropped),
+        "dropped_lines": (dropped[:MAX_REPORTED_LINES] + first_line).tolist(),
+        "coerced_cells": coerced,
+        "text_columns": text_columns,
+        "header_repeats": len(header_lines) if continued else max(len(header_lines) - 1, 0),
+        "line_ending": ending,
+    }
+    end = int(nexts[terminated][-1]) if terminated.any() else 0
+    return df, diagnostics, end, (headers, units)
+
+def _merge_diagnostics(total, diagnostics):
+    if total is None:
+        return dict(diagnostics)
+    for key in ("lines", "data_lines", "rows", "dropped", "header_repeats"):
+        total[key] += diagnostics[key]
+    total["dropped_lines"] = (total["dropped_lines"] + diagnostics["dropped_lines"])[:MAX_REPORTED_LINES]
+    coerced = dict(total["coerced_cells"])
+    for col, count in diagnostics["coerced_cells"].items():
+        coerced[col] = coerced.get(col, 0) + count
+    total["coerced_cells"] = coerced
+    text_columns = total["text_columns"] + [c for c in diagnostics["text_columns"] if c not in total["text_columns"]]
+    total["text_columns"] = [c for c in text_columns if c not in coerced]
+    if total["line_ending"] is None or diagnostics["line_ending"] not in (None, total["line_ending"]):
+        total["line_ending"] = diagnostics["line_ending"] if total["line_ending"] is None else "mixed"
+    return total
+
+def _last_line_end(data):
+    return data.rfind(b'\n') + 1 or data.rfind(b'\r') + 1
+
+def _find_header(data):
+    """(DATAH line start, offset past the DATAU line) in `data`, or None until both are complete."""
+    found = re.search(rb'(?:^|[\r\n])DATAH', data)
+    units_found = found and re.search(rb'[\r\n]DATAU[^\r\n]*[\r\n]', data[found.end():])
+    if not units_found:
+        return None
+    return found.end() - len(HEADER_PREFIX), found.end() + units_found.end()
+
+def _parse_metadata(preamble):
     metadata = {}
-    for line in lines:
-        if line.startswith("DATAH"):
-            break
-
+    for line in preamble.decode('utf-8').splitlines():
         line = line.strip()
         if not line:
             continue
@@ -42,61 +271,441 @@ def parse_7800_data_file(filepath):
             match = re.search(r'TG\d{2}-\d+', line)
             if match:
                 metadata["SerialNumber"] = match.group(0)
+    return metadata
 
+def _model_from(metadata, filepath):
     # Extract model from metadata or fallback to filename
     model_match = re.search(r'TG\d{2}', metadata.get("SerialNumber", ""))
     if not model_match:
         model_match = re.search(r'TG\d{2}', os.path.basename(filepath))
-    model_number = model_match.group(0) if model_match else "Unknown"
+    return model_match.group(0) if model_match else "Unknown"
+
+def _log_diagnostics(filepath, diagnostics):
+    if diagnostics["dropped"] and "region" in diagnostics:
+        log.warning("⚠️ %s: dropped %d malformed row(s) (first at line %d after byte %d)", filepath,
+                    diagnostics["dropped"], diagnostics["dropped_lines"][0], diagnostics["region"][0])
+    elif diagnostics["dropped"]:
+        log.warning("⚠️ %s: dropped %d malformed row(s) (first at line %d)", filepath,
+                    diagnostics["dropped"], diagnostics["dropped_lines"][0])
+    if diagnostics["coerced_cells"]:
+        log.warning("⚠️ %s: non-numeric values replaced with NaN: %s", filepath, diagnostics["coerced_cells"])
+    if diagnostics["header_repeats"]:
+        log.info("ℹ️ %s: header repeated %d time(s) mid-file", filepath, diagnostics["header_repeats"])
+
+def _time_field(headers):
+    """Index of the SECONDS field in a DATA line split on tabs (field 0 is the DATA tag)."""
+    index = next((i for i, name in enumerate(headers) if "SECONDS" in name.upper()), None)
+    return None if index is None else index + 1
+
+def _data_line_seconds(lines, field, width, reverse=False):
+    """SECONDS of the first (or, with `reverse`, last) complete DATA line of `width` fields in `lines`."""
+    for line in (reversed(lines) if reverse else lines):
+        if not line.startswith(DATA_PREFIX):
+            continue
+        fields = line.split(b'\t')
+        if len(fields) != width:
+            continue  # Malformed, or cut off while being written
+        try:
+            return float(fields[field])
+        except (IndexError, ValueError):
+            continue
+    return None
+
+def _next_data_line(file, offset, field, width, probe=SUMMARY_PROBE_BYTES):
+    """(start, end, SECONDS) of the first complete DATA line starting after byte `offset`, or None."""
+    file.seek(offset)
+    window = file.read(probe)
+    newline = re.search(rb'\r\n|\r|\n', window)
+    if not newline:
+        return None
+    pos = newline.end()
+    for line in window[pos:_last_line_end(window)].splitlines(keepends=True):
+        seconds = _data_line_seconds([line.rstrip(b'\r\n')], field, width)
+        if seconds is not None:
+            return offset + pos, offset + pos + len(line), seconds
+        pos += len(line)
+    return None
+
+def _bisect_offsets(file, before, lo, hi, field, width, probe=SUMMARY_PROBE_BYTES):
+    """
+    Binary-search the byte range [lo, hi) of a time-ordered file for the first DATA line whose
+    SECONDS fail `before(seconds)`. Returns line starts (lo, hi) at most about `probe` bytes apart
+    such that every line before lo passes and the line at hi (if any) fails.
+    """
+    while hi - lo > probe:
+        found = _next_data_line(file, (lo + hi) // 2, field, width, probe)
+        if found is None or found[0] >= hi:
+            break  # No timestamp to narrow on; the caller reads the whole remaining range
+        start, end, seconds = found
+        if before(seconds):
+            lo = end
+        else:
+            hi = start
+    return lo, hi
+
+def _headers_before(file, offset, lo, block_bytes=CHUNK_BYTES):
+    """Start offsets of the DATAH lines at or after line start `lo` and before `offset`, nearest first."""
+    pos = offset
+    while pos > lo:
+        begin = max(lo - 1, pos - block_bytes)  # From the line end before `lo`
+        file.seek(begin)
+        window = file.read(pos - begin + len(HEADER_PREFIX) - 1)  # Matches then start before `pos`
+        found = max(window.rfind(b'\n' + HEADER_PREFIX), window.rfind(b'\r' + HEADER_PREFIX))
+        if found < 0:
+            pos = begin + 1
+            continue
+        yield begin + found + 1
+        pos = begin + found + 1
+
+def _read_header_at(file, offset):
+    """The (headers, units) of the DATAH/DATAU pair starting at byte `offset`, or None if incomplete."""
+    file.seek(offset)
+    data = file.read(SUMMARY_PROBE_BYTES)
+    found = _find_header(data)
+    if not found:
+        return None
+    return parse_data_bytes(data[found[0]:found[1]])[3]
+
+def _find_time_region(file, time_range, filepath):
+    """
+    Locate the rows of a plain .data file within `time_range` without reading the rest.
+
+    Returns (preamble, (headers, units), start, stop): the bytes before DATAH, the header in effect
+    at `start`, and a byte range of whole lines holding every row with t0 <= SECONDS <= t1 (plus at
+    most a few neighbouring lines, which the caller filters out).
+
+    Header repeats (user-changed columns) between the data and `stop` are looked up by searching
+    backwards from `stop`. The region stands only if every one keeps the SECONDS field and line
+    width the search relied on; otherwise None is returned and the caller parses the file in chunks.
+    """
+    head = b""
+    while True:
+        block = file.read(SUMMARY_PROBE_BYTES)
+        head += block
+        found = _find_header(head)
+        if found or not block:
+            break
+    if not found:
+        raise ValueError(f"No DATAH/DATAU header found in {filepath}")
+
+    header_start, data_start = found
+    _, _, _, header = parse_data_bytes(head[header_start:data_start])
+    field = _time_field(header[0])
+    if field is None:
+        raise ValueError(f"No SECONDS column in {filepath}")
+    width = len(header[0]) + 1
+
+    t0, t1 = time_range
+    size = file.seek(0, os.SEEK_END)
+    start, _ = _bisect_offsets(file, lambda seconds: seconds < t0, data_start, size, field, width)
+    _, stop = _bisect_offsets(file, lambda seconds: seconds <= t1, start, size, field, width)
+
+    # The rows at `start` belong to the last header before it, which need not be the first one
+    region_header = header
+    for offset in _headers_before(file, stop, data_start):
+        repeat = _read_header_at(file, offset)
+        if repeat is None or _time_field(repeat[0]) != field or len(repeat[0]) + 1 != width:
+            log.debug("%s: header layout changes before the requested rows; parsing in chunks", filepath)
+            return None
+        if offset < start:
+            region_header = repeat
+            break
+    return head[:header_start], region_header, start, stop
+
+def _ends_before(part, header, t0):
+    """Whether every row of chunk `part` is before `t0` (judged by its last DATA line)."""
+    if header[0] is None or HEADER_PREFIX in part:
+        return False  # The first chunk, or one switching headers, is always parsed
+    field = _time_field(header[0])
+    tail = part[-SUMMARY_PROBE_BYTES:].splitlines()
+    last = _data_line_seconds(tail[1:] if len(part) > SUMMARY_PROBE_BYTES else tail, field,
+                              len(header[0]) + 1, reverse=True)
+    return last is not None and last < t0
+
+def _rows_in_range(df, time_range):
+    time_col = next((col for col in df.columns if "SECONDS" in col.upper()), None)
+    if time_col is None or df.empty:
+        return df, False
+    seconds = df[time_col]
+    past = bool((seconds > time_range[1]).any())
+    mask = (seconds >= time_range[0]) & (seconds <= time_range[1])
+    if mask.all():
+        return df, past
+    return df[mask].reset_index(drop=True), past
+
+def parse_7800_data_file(filepath, chunk_bytes=CHUNK_BYTES, time_range=None):
+    """
+    Parse a (possibly gzip/xz/bz2/zstd-compressed) .data file into (df, model, metadata).
+
+    The file is streamed `chunk_bytes` at a time, each chunk cut at a line end and parsed with
+    parse_data_bytes, so compressed files never need a temporary decompressed copy.
+
+    With `time_range` (t0, t1) only rows with t0 <= SECONDS <= t1 are returned. Rows are written
+    in time order, so a plain file is binary-searched for the matching byte range and only that
+    is parsed; a compressed file skips the chunks before the range and stops after it.
+    """
+    compression = detect_compression(filepath)
+    frames = []
+    diagnostics = None
+    header = (None, None)
+    preamble = None  # Bytes before the first DATAH, for the metadata
+    pending = b""
+    consumed = lines_read = end = 0
+    region = remaining = None
+    past_range = False
+
+    with open_data_file(filepath, compression) as file:
+        found = _find_time_region(file, time_range, filepath) if time_range is not None and compression is None else None
+        if found is not None:
+            preamble, header, start, stop = found
+            region, remaining, consumed = (start, stop), stop - start, start
+            file.seek(start)
+        elif time_range is not None and compression is None:
+            file.seek(0)
+
+        while not past_range:
+            block = file.read(chunk_bytes if remaining is None else min(chunk_bytes, remaining))
+            if remaining is not None:
+                remaining -= len(block)
+            data = pending + block
+            if preamble is None:
+                found = _find_header(data)
+                if block and not found:
+                    pending = data  # Keep reading until the whole header is in hand
+                    continue
+                if not found:
+                    raise ValueError(f"No DATAH/DATAU header found in {filepath}")
+                preamble = data[:found[0]]
+
+            cut = _last_line_end(data) if block else len(data)
+            part, pending = data[:cut], data[cut:]
+            if part and time_range is not None and _ends_before(part, header, time_range[0]):
+                consumed += len(part)  # Compressed chunk wholly before the range
+                lines_read += part.count(b'\n') or part.count(b'\r')
+            elif part:
+                df, part_diagnostics, part_end, header = parse_data_bytes(part, *header, first_line=lines_read + 1)
+                if time_range is not None:
+                    df, past_range = _rows_in_range(df, time_range)
+                frames.append(df)
+                diagnostics = _merge_diagnostics(diagnostics, part_diagnostics)
+                if part_end:
+                    end = consumed + part_end
+                consumed += len(part)
+                lines_read += part_diagnostics["lines"]
+            if not block:
+                break
 
-    # --- Parse data block ---
-    header_line_index = next(i for i, line in enumerate(lines) if line.startswith("DATAH"))
-    units_line_index = next(i for i, line in enumerate(lines) if line.startswith("DATAU"))
-    data_start_index = units_line_index + 1
+    # --- Extract metadata from lines before DATAH ---
+    metadata = _parse_metadata(preamble)
 
-    headers = lines[header_line_index].strip().split('\t')[1:]
-    units = lines[units_line_index].strip().split('\t')[1:]
-    expected_columns = len(headers)
+    model_number = _model_from(metadata, filepath)
 
-    data = []
-    for line in lines[data_start_index:]:
-        parts = line.strip().split('\t')
-        if len(parts) == expected_columns + 1:
-            data.append(parts[1:])  # Skip prefix (e.g., "DATA")
+    if diagnostics is None:  # Nothing in range
+        df, diagnostics, _, _ = parse_data_bytes(b"", *header)
+        frames.append(df)
+    if region is not None:
+        diagnostics["region"] = region
 
-    df = pd.DataFrame(data, columns=headers)
-    for col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
+    non_empty = [df for df in frames if len(df)]
+    if len(non_empty) > 1:
+        df = pd.concat(non_empty, ignore_index=True)
+    else:
+        df = non_empty[0] if non_empty else frames[-1]
+    diagnostics["rows"] = len(df)
+    _log_diagnostics(filepath, diagnostics)
 
-    df.columns = [f"{col} ({unit})" for col, unit in zip(headers, units)]
+    # Byte offset just past the last complete line, where a follower resumes reading. Compressed
+    # files are archives and time-range loads are partial, so neither can be followed.
+    followable = compression is None and time_range is None
+    df.attrs["source"] = {"path": filepath, "offset": end if followable else None, "compression": compression,
+                          "time_range": time_range}
+    df.attrs["diagnostics"] = diagnostics
 
-    print(metadata)
+    log.debug("Metadata for %s: %s", filepath, metadata)
 
     return df, model_number, metadata
 
-def load_and_merge_files(filepaths):
-    merged_df = None
-    model_number = None
-    base_metadata = None
-
-    for i, fp in enumerate(filepaths):
-        df, model, meta = parse_7800_data_file(fp)
-
-        serial = meta.get("SN") or meta.get("S/N") or meta.get("SerialNumber")
+def read_file_summary(filepath, probe_bytes=SUMMARY_PROBE_BYTES):
+    """
+    Summarize a .data file without parsing its rows: serial, model, software version, timezone and
+    the SECONDS of its first and last DATA lines.
+
+    Only the header and the first DATA lines are read, then the file's tail (seeking back further
+    while no complete DATA line is found). Compressed files cannot seek, so they are streamed to
+    the end instead.
+    """
+    compression = detect_compression(filepath)
+    with open_data_file(filepath, compression) as file:
+        head = b""
+        while True:
+            block = file.read(probe_bytes)
+            head += block
+            found = _find_header(head)
+            # The first DATA line must be complete too
+            if found and _last_line_end(head) > found[1] or not block:
+                break
+        if not found:
+            raise ValueError(f"No DATAH/DATAU header found in {filepath}")
+
+        header_start, data_start = found
+        metadata = _parse_metadata(head[:header_start])
+        header_line = head[header_start:].splitlines()[0]
+        headers = header_line.decode('utf-8').strip().split('\t')[1:]
+        field = _time_field(headers)
+        if field is None:
+            raise ValueError(f"No SECONDS column in {filepath}")
+
+        width = len(headers) + 1
+        body = head[data_start:]
+        start = _data_line_seconds(body.splitlines(), field, width)
+
+        if compression:
+            tail = head[-probe_bytes:]
+            while True:
+                block = file.read(CHUNK_BYTES)
+                if not block:
+                    break
+                tail = (tail + block)[-probe_bytes:]
+            end = _data_line_seconds(tail.splitlines()[1:], field, width, reverse=True)
+        else:
+            size = file.seek(0, os.SEEK_END)
+            end = None
+            probe = probe_bytes
+            while end is None:
+                offset = max(size - probe, 0)
+                file.seek(offset)
+                tail = file.read(size - offset)
+                lines = tail.splitlines()
+                end = _data_line_seconds(lines if offset == 0 else lines[1:], field, width, reverse=True)
+                if offset == 0:
+                    break
+                probe *= 4
+
+    return {
+        "path": os.path.abspath(filepath),
+        "serial": get_serial(metadata),
+        "model": _model_from(metadata, filepath),
+        "version": metadata.get("Software Version"),
+        "timezone": metadata.get("Timezone"),
+        "start": start,
+        "end": end,
+        "compression": compression,
+    }
+
+def read_data_header(filepath):
+    """Read only the DATAH/DATAU lines of a .data file and return (headers, units)."""
+    headers = units = None
+    with io.TextIOWrapper(open_data_file(filepath), encoding='utf-8', newline='') as file:
+        for line in file:
+            if line.startswith("DATAH"):
+                headers = line.strip().split('\t')[1:]
+            elif line.startswith("DATAU"):
+                units = line.strip().split('\t')[1:]
+                break
+    if headers is None or units is None:
+        raise ValueError(f"No DATAH/DATAU header found in {filepath}")
+    return headers, units
+
+def read_appended_rows(filepath, offset, headers, units, after=None):
+    """
+    Parse only the complete lines appended to `filepath` since byte `offset`.
+
+    Rows at or before time `after` (already loaded) are skipped. Returns (new_rows, new_offset).
+    """
+    with open(filepath, 'rb') as file:
+        file.seek(0, os.SEEK_END)
+        if file.tell() < offset:
+            raise ValueError(f"{filepath} shrank below the followed position; it was truncated or replaced")
+        file.seek(offset)
+        chunk = file.read()
+
+    end = max(chunk.rfind(b'\n'), chunk.rfind(b'\r')) + 1  # A trailing partial line is left for next time
+    df, diagnostics, _, _ = parse_data_bytes(chunk[:end], headers, units)
+    if diagnostics["dropped"] or diagnostics["coerced_cells"]:
+        _log_diagnostics(filepath, diagnostics)
+
+    time_col = next((col for col in df.columns if "SECONDS" in col.upper()), None)
+    if after is not None and time_col is not None and not df.empty:
+        df = df[df[time_col] > after].reset_index(drop=True)
+
+    return df, offset + end
+
+def load_data_files(filepaths, on_file=None, max_workers=None, time_range=None):
+    """
+    Parse `filepaths` concurrently and check they all come from one instrument.
+
+    `on_file(df)`, if given, runs in the worker right after each file is parsed and its result
+    replaces the frame (e.g. clean_error_codes). Returns (frames, model, metadata) with frames in
+    file order and the model and metadata of the first file.
+
+    With `time_range` (t0, t1), only rows within it are parsed (see parse_7800_data_file) and files
+    with no rows in it are left out of the frames, unless none overlap.
+    """
+    def load(fp):
+        df, model, meta = parse_7800_data_file(fp, time_range=time_range)
+        return (on_file(df) if on_file else df), model, meta
+
+    if len(filepaths) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            parsed = list(pool.map(load, filepaths))
+    else:
+        parsed = [load(fp) for fp in filepaths]
+
+    base_serial = None
+    for fp, (df, model, meta) in zip(filepaths, parsed):
+        serial = get_serial(meta)
         if not serial:
             raise ValueError(f"Missing serial number in file: {fp}")
-
-        if i == 0:
+        if base_serial is None:
             base_serial = serial
-            base_metadata = meta
-            model_number = model
-            merged_df = df
-        else:
-            if serial != base_serial:
-                raise ValueError(f"Serial mismatch: {serial} ≠ {base_serial} in {fp}")
-            merged_df = pd.concat([merged_df, df], ignore_index=True)
+        elif serial != base_serial:
+            raise ValueError(f"Serial mismatch: {serial} ≠ {base_serial} in {fp}")
+
+    frames = [df for df, _, _ in parsed]
+    if time_range is not None:
+        overlapping = [df for df in frames if len(df)]
+        if len(overlapping) < len(frames):
+            log.info("⏭ Skipped %d of %d file(s) with no rows in the time range",
+                     len(frames) - len(overlapping), len(frames))
+        frames = overlapping or frames[:1]
+    return frames, parsed[0][1], parsed[0][2]
+
+def merge_frames(frames):
+    """Concatenate per-file frames, keeping each file's source and diagnostics in the attrs."""
+    merged_df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    merged_df.attrs["sources"] = [df.attrs.get("source") for df in frames]
+    merged_df.attrs["diagnostics"] = [df.attrs.get("diagnostics") for df in frames]
+    return merged_df
+
+def load_and_merge_files(filepaths, max_workers=None, time_range=None):
+    frames, model_number, base_metadata = load_data_files(filepaths, max_workers=max_workers, time_range=time_range)
+    return merge_frames(frames), model_number, base_metadata
+
+def get_serial(metadata):
+    return metadata.get("SN") or metadata.get("S/N") or metadata.get("SerialNumber")
+
+def load_instruments(filepaths, max_workers=None):
+    """
+    Parse files concurrently and merge them per instrument serial, keeping file order within each.
+
+    Unlike load_and_merge_files, differing serials are expected. Returns an ordered
+    {serial: (df, model, metadata)} dict.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        parsed = list(pool.map(parse_7800_data_file, filepaths))
+
+    groups = {}
+    for fp, (df, model, meta) in zip(filepaths, parsed):
+        serial = get_serial(meta)
+        if not serial:
+            raise ValueError(f"Missing serial number in file: {fp}")
+        groups.setdefault(serial, []).append((df, model, meta))
 
-    return merged_df, model_number, base_metadata
+    instruments = {}
+    for serial, items in groups.items():
+        merged = merge_frames([df for df, _, _ in items])
+        instruments[serial] = (merged, items[0][1], items[0][2])
+    return instruments
 
 def clean_error_codes(df):
     path = resource_path(os.path.join("assets", "error_codes.json"))
@@ -104,11 +713,11 @@ def clean_error_codes(df):
         with open(path, 'r') as f:
             error_codes = json.load(f)
     except Exception as e:
-        print(f"⚠️ Failed to load error_codes.json: {e}")
+        log.warning("⚠️ Failed to load error_codes.json: %s", e)
         return df
 
     if not isinstance(error_codes, list):
-        print("⚠️ error_codes.json must be a list of values.")
+        log.warning("⚠️ error_codes.json must be a list of values.")
         return df
 
     for col in df.select_dtypes(include=["float", "int"]).columns:
@@ -129,10 +738,52 @@ def find_existing_versions(model):
         return []
     return [f.removesuffix(".json") for f in os.listdir(model_dir) if f.endswith(".json") and not f.startswith("plot_options")]
 
+# In-process config registry: (model, version) -> (file signature, parsed config)
+_config_registry = {}
+# Compiled column mappings: (model, version, file signature, columns) -> compiled config
+_compiled_registry = {}
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _remember_config(model_id, version, path, config):
+    try:
+        _config_registry[(model_id, str(version))] = (_file_signature(path), copy.deepcopy(config))
+    except OSError:
+        _config_registry.pop((model_id, str(version)), None)
+    return config
+
+
+def _cached_config(model_id, version):
+    """Return a copy of the registered config if its file is unchanged on disk, else None."""
+    entry = _config_registry.get((model_id, str(version)))
+    if entry is None:
+        return None
+    try:
+        if _file_signature(get_config_path(model_id, version)) != entry[0]:
+            return None
+    except OSError:
+        return None
+    return copy.deepcopy(entry[1])  # Callers edit their config in place
+
+
+def config_signature(model_id, version_str=None):
+    """Signature of the registered config file, or None if it has not been loaded yet."""
+    entry = _config_registry.get((model_id, str(Version(version_str or "0.0.0"))))
+    return entry[0] if entry else None
+
+
 def load_variable_config(model_id, version_str=None, master=None):
     # Determine software version
     version = Version(version_str or "0.0.0")
 
+    cached = _cached_config(model_id, version)
+    if cached is not None:
+        return cached
+
     # Ensure target path exists
     local_dir = os.path.join(get_local_config_dir(), model_id)
     os.makedirs(local_dir, exist_ok=True)
@@ -140,9 +791,9 @@ def load_variable_config(model_id, version_str=None, master=None):
     local_path = os.path.join(local_dir, f"{version}.json")
 
     if os.path.exists(local_path):
-        print(f"Config File Found: {version}")
+        log.info("Config File Found: %s", version)
         with open(local_path, "r", encoding='utf-8') as f:
-            return json.load(f)
+            return _remember_config(model_id, version, local_path, json.load(f))
 
     # Check for any previous versions
     existing_versions = find_existing_versions(model_id)
@@ -164,7 +815,7 @@ def load_variable_config(model_id, version_str=None, master=None):
             src = os.path.join(local_dir, f"{latest_version}.json")
             shutil.copy(src, local_path)
             with open(local_path, "r", encoding='utf-8') as f:
-                return json.load(f)
+                return _remember_config(model_id, version, local_path, json.load(f))
 
     # Fall back to default in assets
     try:
@@ -178,18 +829,74 @@ def load_variable_config(model_id, version_str=None, master=None):
             default_config = json.load(f)
         with open(local_path, "w", encoding='utf-8') as f: # Save the default where the current model/version is
             json.dump(default_config, f, indent=2)
-        return default_config
+        return _remember_config(model_id, version, local_path, default_config)
 
     # If all else fails, create an empty config
     with open(local_path, "w", encoding='utf-8') as f:
         json.dump({}, f, indent=2)
-    return {}
+    return _remember_config(model_id, version, local_path, {})
 
 def save_variable_config(model_id, version, config_dict):
     path = get_config_path(model_id, version)
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "w", encoding='utf-8') as f:
         json.dump(config_dict, f, indent=2)
+    _remember_config(model_id, Version(str(version)), path, config_dict)
+
+
+def normalize_key(key):
+    return normalize('NFC', key.strip())
+
+
+def _bound_pair(conf, key):
+    pair = conf.get(key)
+    if not pair or len(pair) != 2 or pair[0] is None or pair[1] is None:
+        return np.nan, np.nan
+    return float(pair[0]), float(pair[1])
+
+
+def compile_variable_config(model_id, version_str, columns, master=None):
+    """
+    Match the model's config to DataFrame `columns` once per config file and column set.
+
+    Returns a dict with:
+        variable_config: column -> config entry (a fresh copy the caller may edit)
+        names: configured columns, in DataFrame order
+        typical, absolute: (n, 2) float arrays of [low, high] bounds aligned with `names`, NaN when unset
+    """
+    raw_config = load_variable_config(model_id, version_str, master)
+    signature = config_signature(model_id, version_str)
+    key = (model_id, str(Version(version_str or "0.0.0")), signature, tuple(columns))
+
+    compiled = _compiled_registry.get(key) if signature else None
+    if compiled is None:
+        normalized_config = {normalize_key(k): k for k in raw_config}
+        log.debug("📄 Normalized config keys: %r", list(normalized_config))
+
+        mapping = {}
+        for col in columns:
+            raw_key = normalized_config.get(normalize_key(col))
+            if raw_key is None:
+                log.debug("⚠️ No config match found for: %r", col)
+                continue
+            mapping[col] = raw_key
+
+        names = list(mapping)
+        compiled = {
+            "mapping": mapping,
+            "names": names,
+            "typical": np.array([_bound_pair(raw_config[mapping[n]], "typical") for n in names], dtype=float).reshape(-1, 2),
+            "absolute": np.array([_bound_pair(raw_config[mapping[n]], "absolute") for n in names], dtype=float).reshape(-1, 2),
+        }
+        if signature:
+            _compiled_registry[key] = compiled
+
+    return {
+        "variable_config": {col: raw_config[raw_key] for col, raw_key in compiled["mapping"].items()},
+        "names": list(compiled["names"]),
+        "typical": compiled["typical"].copy(),
+        "absolute": compiled["absolute"].copy(),
+    }
 
 
 #Plot Options Saving/Loading
@@ -205,7 +912,7 @@ def save_plot_options(model, options_dict):
         with open(path, "w") as f:
             json.dump(options_dict, f, indent=4)
     except Exception as e:
-        print(f"❌ Failed to save plot options: {e}")
+        log.error("❌ Failed to save plot options: %s", e)
 
 def load_plot_options(model):
     path = get_plot_options_path(model)
@@ -214,7 +921,7 @@ def load_plot_options(model):
             with open(path, "r") as f:
                 return json.load(f)
         except Exception as e:
-            print(f"⚠️ Failed to load plot options: {e}")
+            log.warning("⚠️ Failed to load plot options: %s", e)
     return {}
 
 
@@ -0,0 +1,222 @@
+import os
+import time
+import json
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from app_logging import get_logger, configure_logging
+from catalog import find_data_files
+from data_cache import cache_key, file_signatures, has_cached_frame, save_cached_frame, remove_cached_frame
+
+log = get_logger("ingest")
+
+POLL_SECONDS = 10
+SETTLE_SECONDS = 5  # A file must keep its size and mtime this long before it is parsed
+LOG_EVERY = 60  # Seconds between metrics log lines
+
+
+def ingest_file(path, run_threshold=2):
+    """
+    Parse one .data file like the viewer does and store it as its own cache entry. The sidecar also
+    holds what the viewer would otherwise derive from the rows: the periods (plus the per-file span
+    summary, to stitch multi-file sets and apply other run thresholds) and every column's min/max,
+    which the spec validation classifies against the current bounds. Returns a summary dict for the
+    watcher's metrics.
+    """
+    from file_parsing import parse_7800_data_file, clean_error_codes, compile_variable_config
+    from manipulation import span_summary, spans_from_summaries, column_ranges, classify_ranges
+    from session import spans_to_json
+
+    started = time.perf_counter()
+    key = cache_key([path])  # Taken before parsing, so a file growing meanwhile is seen as changed
+    df, model, metadata = parse_7800_data_file(path)
+    df = clean_error_codes(df)
+    time_col = next((col for col in df.columns if "SECONDS" in col.upper()), df.columns[0])
+
+    summary = span_summary(df, time_col=time_col)
+    spans = spans_from_summaries([summary], run_threshold, timezone=df.attrs.get("timezone", "UTC"))
+    ranges = column_ranges(df)
+    compiled = compile_variable_config(model, metadata.get("Software Version", "0.0.0"), list(df.columns))
+    validation = classify_ranges(ranges, compiled["names"], compiled["typical"], compiled["absolute"])
+    meta = {
+        "model": model,
+        "metadata": metadata,
+        "time_col": time_col,
+        "spans": spans_to_json(spans),
+        "run_threshold": run_threshold,
+        "span_summary": summary,
+        "ranges": ranges,
+        "source": os.path.abspath(path),
+    }
+    if not save_cached_frame(key, df, meta, sources=[path]):
+        raise ValueError("parsed data could not be cached")
+    return {"path": path, "key": key, "rows": len(df), "bytes": os.path.getsize(path), "spans": len(spans),
+            "failed_checks": sorted(var for var, status in validation.items() if status == "outside absolute"),
+            "seconds": time.perf_counter() - started}
+
+
+class IngestDaemon:
+    """
+    Watches a folder for new or changed .data files and pre-parses them on a bounded process pool,
+    so the viewer opens them straight from the parse cache.
+
+    Each poll lists the folder and stats the files; a file is queued once it has been unchanged for
+    `settle_seconds` (instruments append to the file being logged) and it has no cache entry yet. At
+    most `max_workers` files are parsed at a time; the rest wait in a FIFO queue.
+    """
+
+    def __init__(self, root, max_workers=2, poll_seconds=POLL_SECONDS, settle_seconds=SETTLE_SECONDS,
+                 run_threshold=2):
+        self.root = root
+        self.max_workers = max(1, max_workers)
+        self.poll_seconds = poll_seconds
+        self.settle_seconds = settle_seconds
+        self.run_threshold = run_threshold
+        self.queue = deque()
+        self.queued = set()
+        self.in_flight = {}  # future -> path
+        self.seen = {}  # path -> (signature, time it last changed)
+        self.done = {}  # path -> cache key of its last ingest
+        self.ingested = self.failed = self.rows = self.bytes = 0
+        self.busy_seconds = 0.0
+        self.last_error = None
+        self.started = time.time()
+
+    def poll(self):
+        """Queue the settled files that have no cache entry; returns how many were queued."""
+        now = time.time()
+        paths = find_data_files(self.root)
+        for path in set(self.seen) - set(paths):
+            del self.seen[path]
+        added = 0
+        for path in paths:
+            try:
+                signature = file_signatures([path])[0]
+            except OSError:
+                continue
+            if path not in self.seen or self.seen[path][0] != signature:
+                self.seen[path] = (signature, min(now, signature[1] / 1e9))  # Unchanged since its mtime
+            if now - self.seen[path][1] < self.settle_seconds or path in self.queued:
+                continue
+            key = cache_key([path])
+            if self.done.get(path) == key:
+                continue
+            if has_cached_frame(key):
+                self.done[path] = key
+                continue
+            self.queue.append(path)
+            self.queued.add(path)
+            added += 1
+        if added:
+            log.info("📥 Queued %d file(s); %d waiting", added, len(self.queue))
+        return added
+
+    def submit(self, pool):
+        while self.queue and len(self.in_flight) < self.max_workers:
+            path = self.queue.popleft()
+            self.in_flight[pool.submit(ingest_file, path, self.run_threshold)] = path
+
+    def collect(self, finished):
+        for future in finished:
+            path = self.in_flight.pop(future)
+            self.queued.discard(path)
+            try:
+                result = future.result()
+            except Exception as e:
+                self.failed += 1
+                self.last_error = f"{os.path.basename(path)}: {e}"
+                self.done[path] = cache_key([path]) if os.path.exists(path) else None  # Not retried until it changes
+                log.error("❌ Failed to ingest %s: %s", path, e)
+                continue
+
+            stale = self.done.get(path)
+            if stale and stale != result["key"]:
+                remove_cached_frame(stale)  # The entry for the file's previous contents
+            self.done[path] = result["key"]
+            self.ingested += 1
+            self.rows += result["rows"]
+            self.bytes += result["bytes"]
+            self.busy_seconds += result["seconds"]
+            log.info("✅ Ingested %s: %d rows, %d period(s) in %.1fs%s", os.path.basename(path), result["rows"],
+                     result["spans"], result["seconds"],
+                     f"; absolute fails: {', '.join(result['failed_checks'])}" if result["failed_checks"] else "")
+
+    def metrics(self):
+        """Queue depth and throughput since the watcher started."""
+        elapsed = max(time.time() - self.started, 1e-9)
+        busy = max(self.busy_seconds, 1e-9)
+        return {
+            "queue_depth": len(self.queue),
+            "in_flight": len(self.in_flight),
+            "ingested": self.ingested,
+            "failed": self.failed,
+            "files_per_minute": 60.0 * self.ingested / elapsed,
+            "rows_per_second": self.rows / busy,  # Per worker, while parsing
+            "mb_per_second": self.bytes / busy / 1e6,
+            "last_error": self.last_error,
+        }
+
+    def run(self, stop_event=None, metrics_path=None, once=False):
+        """Poll and ingest until `stop_event` is set (or, with `once`, until the queue drains)."""
+        stop_event = stop_event or threading.Event()
+        log.info("👀 Watching %s with %d worker(s)", self.root, self.max_workers)
+        last_log = time.time()
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=configure_logging,
+                                 initargs=(log.getEffectiveLevel(),)) as pool:
+            next_poll = 0.0
+            while not stop_event.is_set():
+                if time.time() >= next_poll:
+                    self.poll()
+                    next_poll = time.time() + self.poll_seconds
+                    if metrics_path:
+                        self.write_metrics(metrics_path)
+                self.submit(pool)
+                if once and not self.queue and not self.in_flight and all(path in self.done for path in self.seen):
+                    break
+
+                timeout = max(next_poll - time.time(), 0.05)
+                if self.in_flight:
+                    finished, _ = wait(list(self.in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+                    self.collect(finished)
+                else:
+                    stop_event.wait(timeout)
+
+                if time.time() - last_log >= LOG_EVERY:
+                    last_log = time.time()
+                    m = self.metrics()
+                    log.info("📊 %d ingested, %d failed, %d queued, %d in flight, %.1f files/min, %.0f rows/s",
+                             m["ingested"], m["failed"], m["queue_depth"], m["in_flight"], m["files_per_minute"],
+                             m["rows_per_second"])
+        if metrics_path:
+            self.write_metrics(metrics_path)
+
+    def write_metrics(self, path):
+        try:
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self.metrics(), f, indent=2)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            log.warning("⚠️ Failed to write metrics to %s: %s", path, e)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pre-parse new .data files in a folder so the viewer opens them instantly")
+    parser.add_argument("folder", help="Folder to watch (searched recursively)")
+    parser.add_argument("--workers", type=int, default=2, help="Files parsed at a time (default: 2)")
+    parser.add_argument("--poll", type=float, default=POLL_SECONDS, help="Seconds between folder scans")
+    parser.add_argument("--settle", type=float, default=SETTLE_SECONDS,
+                        help="Seconds a file must stay unchanged before it is parsed")
+    parser.add_argument("--metrics-file", help="JSON file rewritten with the queue and throughput metrics each poll")
+    parser.add_argument("--once", action="store_true", help="Ingest what is there, then exit")
+    args = parser.parse_args()
+
+    configure_logging("INFO")
+    daemon = IngestDaemon(args.folder, args.workers, args.poll, args.settle)
+    try:
+        daemon.run(metrics_path=args.metrics_file, once=args.once)
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(daemon.metrics(), indent=2))
@@ -1,5 +1,10 @@
+import logging
 import numpy as np
 import pandas as pd
+from app_logging import get_logger
+from dataset import Dataset, as_frame, merge_ranges
+
+log = get_logger("manipulation")
 
 def insert_nan_gaps(x, y, threshold):
     """Insert NaN between time gaps greater than `threshold`."""
@@ -11,72 +16,131 @@ def insert_nan_gaps(x, y, threshold):
 
     dx = np.diff(x)
     gap_indices = np.where(dx > threshold)[0]
+    if not gap_indices.size:
+        return x.copy(), y.copy()
 
-    x_new = []
-    y_new = []
-
-    for i in range(len(x)):
-        x_new.append(x[i])
-        y_new.append(y[i])
-        if i in gap_indices:
-            x_new.append(np.nan)
-            y_new.append(np.nan)
+    # One NaN after each row that precedes a gap
+    return (np.insert(x.astype(float), gap_indices + 1, np.nan),
+            np.insert(y.astype(float), gap_indices + 1, np.nan))
 
-    return np.array(x_new), np.array(y_new)
 
-
-def identify_operational_spans(df, threshold= 2, time_col='SECONDS (secs)', cavity_col='CAVITY_T (°C)', enclosure_col='THERMAL_ENCLOSURE_T (°C)', index_col='NDX (index)', warmup_thresholds=(55, 54.5), max_gap=10):
+def minmax_decimate_indices(columns, max_points):
     """
-    Identify startup and running spans based on NDX activity and component temperature thresholds.
+    Row indices for a level-of-detail reduction to about `max_points` rows: the first and last
+    row plus, for every column, the min and max row of each equal-width row bin.
+    """
+    columns = [np.asarray(c, dtype=float) for c in columns]
+    n = len(columns[0]) if columns else 0
+    if n <= max_points or not columns:
+        return np.arange(n)
+
+    n_bins = max(max_points // (2 * len(columns)), 1)
+    bin_size = -(-n // n_bins)
+    starts = np.arange(n_bins) * bin_size
+
+    keep = [np.array([0, n - 1])]
+    for values in columns:
+        padded = np.full(n_bins * bin_size, np.nan)
+        padded[:n] = values
+        blocks = padded.reshape(n_bins, bin_size)
+        missing = np.isnan(blocks)
+        keep.append(starts + np.where(missing, np.inf, blocks).argmin(axis=1))
+        keep.append(starts + np.where(missing, -np.inf, blocks).argmax(axis=1))
+
+    idx = np.unique(np.concatenate(keep))
+    return idx[idx < n]
+
+def classify_variables(df, names, typical, absolute):
+    """
+    Classify each configured variable against its bounds using whole-column min/max.
 
-    Returns:
-        List of (startup_start, startup_end, running_start, running_end) tuples.
+    `typical` and `absolute` are (n, 2) arrays of [low, high] aligned with `names` (NaN when unset).
+    Returns a dict of variable -> status string.
+    """
+    present = [n for n in names if n in df]
+    if not present:
+        return {}
+    return classify_ranges(dict(zip(present, zip(df[present].min().to_numpy(dtype=float),
+                                                  df[present].max().to_numpy(dtype=float)))),
+                           names, typical, absolute)
+
+def column_ranges(df):
+    """{column: (min, max)} of the numeric columns, NaN for a column with no values."""
+    numeric = df.select_dtypes(include="number")
+    return dict(zip(numeric.columns, zip(numeric.min().to_numpy(dtype=float), numeric.max().to_numpy(dtype=float))))
+
+def merge_column_ranges(ranges):
+    """Combine the column_ranges of several frames into those of their concatenation."""
+    merged = {}
+    for entry in ranges:
+        for col, (lo, hi) in entry.items():
+            old_lo, old_hi = merged.get(col, (np.nan, np.nan))
+            merged[col] = (float(np.fmin(old_lo, lo)), float(np.fmax(old_hi, hi)))
+    return merged
+
+def classify_ranges(ranges, names, typical, absolute):
+    """classify_variables from precomputed {column: (min, max)} instead of the rows."""
+    rows = [i for i, n in enumerate(names) if n in ranges]
+    if not rows:
+        return {}
+
+    names = [names[i] for i in rows]
+    mins = np.array([ranges[n][0] for n in names], dtype=float)
+    maxs = np.array([ranges[n][1] for n in names], dtype=float)
+    typical = np.asarray(typical, dtype=float).reshape(-1, 2)[rows]
+    absolute = np.asarray(absolute, dtype=float).reshape(-1, 2)[rows]
+
+    abs_defined = ~np.isnan(absolute).any(axis=1)
+    typ_defined = ~np.isnan(typical).any(axis=1)
+    out_abs = (mins < absolute[:, 0]) | (maxs > absolute[:, 1])
+    out_typ = (mins < typical[:, 0]) | (maxs > typical[:, 1])
+
+    status = np.where(~abs_defined, "unclassified",
+             np.where(out_abs, "outside absolute",
+             np.where(typ_defined, np.where(out_typ, "outside typical", "within typical"), "within absolute")))
+    return dict(zip(names, status.tolist()))
+
+def active_blocks(df, time_col='SECONDS (secs)', index_col='NDX (index)', max_gap=10):
+    """(n, 2) array of [start, end] times of NDX activity, split wherever active rows are more than `max_gap` apart."""
+    df = as_frame(df)
+    times = df.loc[df[index_col].notna(), time_col].to_numpy()
+    if times.dtype.kind == "f":
+        times = times[~np.isnan(times)]  # Rows without a timestamp cannot be placed in a block
+    if times.size == 0:
+        return np.empty((0, 2))
+    if (np.diff(times) < 0).any():
+        times = np.sort(times)
+
+    breaks = np.flatnonzero(np.diff(times) > max_gap)
+    return np.column_stack([times[np.r_[0, breaks + 1]], times[np.r_[breaks, times.size - 1]]])
+
+def warm_times(df, time_col='SECONDS (secs)', cavity_col='CAVITY_T (°C)', enclosure_col='THERMAL_ENCLOSURE_T (°C)', warmup_thresholds=(55, 54.5)):
+    """Sorted times of the rows where both temperatures have reached their warm-up thresholds."""
+    df = as_frame(df)
+    warmed_up = (df[cavity_col] >= warmup_thresholds[0]) & (df[enclosure_col] >= warmup_thresholds[1])
+    return np.sort(df.loc[warmed_up, time_col].to_numpy())
+
+def spans_from_blocks(blocks, warm, threshold=2, timezone="UTC"):
+    """
+    Build (startup, running, shutdown) spans from activity `blocks` and the sorted `warm` times:
+    startup runs until the first warmed-up row of the block, shutdown is the last `threshold` seconds.
     """
     from datetime import datetime
     import pytz
 
-    if time_col not in df or index_col not in df:
-        print("❌ Required columns missing.")
-        return []
-
-    df = df.sort_values(time_col).reset_index(drop=True)
-
-    # Identify all rows where NDX is present (device active)
-    active = df[index_col].notna()
-    active_times = df[time_col][active]
-
-    if active_times.empty:
-        print("⚠️ No active NDX entries.")
-        return []
-
-    # Group into blocks based on time gap > max_gap
-    blocks = []
-    current_block = [active_times.iloc[0]]
-    for prev, curr in zip(active_times, active_times.iloc[1:]):
-        if curr - prev > max_gap:
-            blocks.append(current_block)
-            current_block = []
-        current_block.append(curr)
-    if current_block:
-        blocks.append(current_block)
-
     spans = []
-    tz = pytz.timezone(df.attrs.get("timezone", "UTC")) if hasattr(df, "attrs") else pytz.UTC
+    tz = pytz.timezone(timezone) if log.isEnabledFor(logging.DEBUG) else None
 
-    for i, block in enumerate(blocks):
-        t_start = block[0]
-        t_end = block[-1]
+    for i, (t_start, t_end) in enumerate(blocks):
         if t_end - t_start < threshold:
             continue
 
-        block_df = df[(df[time_col] >= t_start) & (df[time_col] <= t_end)]
-
-        warmed_up = (block_df[cavity_col] >= warmup_thresholds[0]) & (block_df[enclosure_col] >= warmup_thresholds[1])
-        if not warmed_up.any():
-            print(f"⛔ Block {i}: No stable temperature — skipping")
+        first_warm = np.searchsorted(warm, t_start, side="left")
+        if first_warm == len(warm) or warm[first_warm] > t_end:
+            log.debug("⛔ Block %d: No stable temperature — skipping", i)
             continue
 
-        startup_end_time = block_df[warmed_up].iloc[0][time_col]
+        startup_end_time = warm[first_warm]
         startup_span = (t_start, startup_end_time)
         running_end_time = t_end - threshold
         running_span = (startup_end_time, running_end_time)
@@ -86,38 +150,499 @@ def identify_operational_spans(df, threshold= 2, time_col='SECONDS (secs)', cavi
             shutdown_span = (t_end - threshold, t_end)
         spans.append((startup_span, running_span, shutdown_span))
 
-        def fmt(ts): return datetime.fromtimestamp(ts, tz).strftime("%Y-%m-%d %H:%M:%S")
+        # Formatting timestamps per span is only worth doing when someone is reading it
+        if tz is not None:
+            def fmt(ts): return datetime.fromtimestamp(ts, tz).strftime("%Y-%m-%d %H:%M:%S")
 
-        print(f"🟦 Startup span: {fmt(startup_span[0])} to {fmt(startup_span[1])}")
-        print(f"🟩 Running span: {fmt(running_span[0])} to {fmt(running_span[1])}")
-        if shutdown_span != (-1, -1):
-            print(f"🟥 Shutdown span: {fmt(shutdown_span[0])} to {fmt(shutdown_span[1])}")
+            log.debug("🟦 Startup span: %s to %s", fmt(startup_span[0]), fmt(startup_span[1]))
+            log.debug("🟩 Running span: %s to %s", fmt(running_span[0]), fmt(running_span[1]))
+            if shutdown_span != (-1, -1):
+                log.debug("🟥 Shutdown span: %s to %s", fmt(shutdown_span[0]), fmt(shutdown_span[1]))
 
-    print(f"✅ Done: {len(spans)} periods identified")
+    log.info("✅ Done: %d periods identified", len(spans))
     return spans
 
-def update_spec_checks(ax, df, variable_config, spans, results = {}, mode = "None", time_col='SECONDS (secs)'):
+def identify_operational_spans(df, threshold= 2, time_col='SECONDS (secs)', cavity_col='CAVITY_T (°C)', enclosure_col='THERMAL_ENCLOSURE_T (°C)', index_col='NDX (index)', warmup_thresholds=(55, 54.5), max_gap=10):
+    """
+    Identify startup and running spans based on NDX activity and component temperature thresholds.
+
+    Returns:
+        List of ((startup_start, startup_end), (running_start, running_end), (shutdown_start, shutdown_end)) tuples.
+    """
+    if time_col not in df or index_col not in df:
+        log.warning("❌ Required columns missing.")
+        return []
+
+    blocks = active_blocks(df, time_col, index_col, max_gap)
+    if not len(blocks):
+        log.info("⚠️ No active NDX entries.")
+        return []
+
+    warm = warm_times(df, time_col, cavity_col, enclosure_col, warmup_thresholds)
+    return spans_from_blocks(blocks, warm, threshold, as_frame(df).attrs.get("timezone", "UTC"))
+
+def span_summary(df, time_col='SECONDS (secs)', cavity_col='CAVITY_T (°C)', enclosure_col='THERMAL_ENCLOSURE_T (°C)', index_col='NDX (index)', warmup_thresholds=(55, 54.5), max_gap=10):
+    """The per-file part of span detection: activity blocks and warm-up times, ready to stitch."""
+    if time_col not in df or index_col not in df:
+        return None
+    return {
+        "blocks": active_blocks(df, time_col, index_col, max_gap),
+        "warm": warm_times(df, time_col, cavity_col, enclosure_col, warmup_thresholds),
+    }
+
+def stitch_span_summaries(summaries, max_gap=10):
+    """
+    Combine per-file summaries into the blocks and warm-up times of the merged data. Blocks from
+    different files that are no more than `max_gap` apart (or overlap) become one block, exactly
+    as if the active rows had been grouped after merging.
+    """
+    summaries = [s for s in summaries if s is not None]
+    all_blocks = np.concatenate([s["blocks"] for s in summaries]) if summaries else np.empty((0, 2))
+    warm = np.sort(np.concatenate([s["warm"] for s in summaries])) if summaries else np.empty(0)
+    if not len(all_blocks):
+        return all_blocks, warm
+
+    all_blocks = all_blocks[np.argsort(all_blocks[:, 0], kind="stable")]
+    # A block starts a new group unless it begins within max_gap of the furthest end so far
+    reach = np.maximum.accumulate(all_blocks[:, 1])
+    new_group = np.r_[True, all_blocks[1:, 0] - reach[:-1] > max_gap]
+    starts = all_blocks[new_group, 0]
+    ends = np.maximum.reduceat(all_blocks[:, 1], np.flatnonzero(new_group))
+    return np.column_stack([starts, ends]), warm
+
+def identify_spans_per_file(frames, threshold=2, time_col='SECONDS (secs)', max_gap=10, max_workers=None, **kwargs):
+    """
+    identify_operational_spans for files that will be merged, computed per file on a thread pool
+    and stitched across file boundaries. Gives the same spans as running it on the merged frame.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def summarize(frame):
+        return span_summary(frame, time_col=time_col, max_gap=max_gap, **kwargs)
+
+    if len(frames) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            summaries = list(pool.map(summarize, frames))
+    else:
+        summaries = [summarize(frame) for frame in frames]
+
+    timezone = as_frame(frames[0]).attrs.get("timezone", "UTC") if frames else "UTC"
+    return spans_from_summaries(summaries, threshold, max_gap, timezone)
+
+def spans_from_summaries(summaries, threshold=2, max_gap=10, timezone="UTC"):
+    """Spans of merged files from their span_summary results (None for a file missing the columns)."""
+    if all(s is None for s in summaries):
+        log.warning("❌ Required columns missing.")
+        return []
+
+    blocks, warm = stitch_span_summaries(summaries, max_gap)
+    if not len(blocks):
+        log.info("⚠️ No active NDX entries.")
+        return []
+    return spans_from_blocks(blocks, warm, threshold, timezone)
+
+def last_active_block_start(df, time_col='SECONDS (secs)', index_col='NDX (index)', max_gap=10):
+    """Start time of the last block of NDX activity (the only block new rows can extend), or None."""
+    df = as_frame(df)
+    if time_col not in df or index_col not in df:
+        return None
+
+    times = np.sort(df.loc[df[index_col].notna(), time_col].to_numpy())
+    if times.size == 0:
+        return None
+
+    breaks = np.flatnonzero(np.diff(times) > max_gap)
+    return times[breaks[-1] + 1] if breaks.size else times[0]
+
+def extend_operational_spans(df, spans, block_start, threshold=2, time_col='SECONDS (secs)', **kwargs):
+    """
+    Update `spans` after rows were appended to `df`, re-running span detection only from
+    `block_start` (see last_active_block_start) onward. Earlier blocks cannot change.
+    """
+    if block_start is None:
+        return identify_operational_spans(df, threshold, time_col=time_col, **kwargs)
+
+    kept = [span for span in spans if span[0][0] < block_start]
+    if isinstance(df, Dataset):
+        tail = df.slice_time(block_start, np.inf)
+    else:
+        tail = df[df[time_col] >= block_start]
+    return kept + identify_operational_spans(tail, threshold, time_col=time_col, **kwargs)
+
+def rolling_stats(seconds, values, window, boundaries=(), max_gap=None, min_periods=2):
+    """
+    Rolling mean and standard deviation of `values` over a centered time window of `window`
+    seconds, for every row of the time-sorted `seconds`.
+
+    Windows skip NaNs and are cut at each time in `boundaries` (e.g. span period edges) and at
+    gaps longer than `max_gap`, so no window mixes rows from different segments. Uses prefix sums
+    of counts, values and squares: O(n) for any window length. Rows whose window holds fewer than
+    `min_periods` values get NaN. Returns (mean, std).
+    """
+    t = np.asarray(seconds, dtype=float)
+    y = np.asarray(values, dtype=float)
+    n = len(t)
+    if not n:
+        return np.empty(0), np.empty(0)
+
+    # Segment of each row: a new one starts after every boundary and every long gap
+    side = np.searchsorted(np.sort(np.asarray(boundaries, dtype=float)), t, side="right")
+    new_segment = np.r_[True, side[1:] != side[:-1]]
+    if max_gap is not None:
+        new_segment[1:] |= np.diff(t) > max_gap
+    first = np.flatnonzero(new_segment)
+    segment = np.cumsum(new_segment) - 1
+    seg_start = first[segment]
+    seg_end = np.r_[first[1:], n][segment]
+
+    lo = np.maximum(np.searchsorted(t, t - window / 2, side="left"), seg_start)
+    hi = np.minimum(np.searchsorted(t, t + window / 2, side="right"), seg_end)
+
+    valid = ~np.isnan(y)
+    offset = y[valid].mean() if valid.any() else 0.0  # Centering keeps the sums of squares precise
+    centered = np.where(valid, y - offset, 0.0)
+    counts = _prefix(valid.astype(np.int64))
+    sums = _prefix(centered)
+    squares = _prefix(centered * centered)
+
+    count = counts[hi] - counts[lo]
+    total = sums[hi] - sums[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        var = (squares[hi] - squares[lo] - total * mean) / (count - 1)
+    enough = count >= max(min_periods, 2)
+    mean = np.where(count >= max(min_periods, 1), mean + offset, np.nan)
+    std = np.where(enough, np.sqrt(np.maximum(var, 0.0)), np.nan)
+    return mean, std
+
+def span_boundaries(spans):
+    """Every period edge of `spans`, for cutting rolling windows at startup/running/shutdown changes."""
+    return sorted({t for span in spans for period in span if tuple(period) != (-1, -1) for t in period})
+
+STATS_BLOCK = 64  # Rows per block of the range min/max sparse table
+
+def _config_bounds(config):
+    """(typical, absolute) as hashable tuples, or None when unset, for change detection."""
+    def pair(key):
+        value = config.get(key)
+        return tuple(value) if value is not None else None
+    return pair("typical"), pair("absolute")
+
+def _prefix(values):
+    out = np.zeros(len(values) + 1, dtype=values.dtype if values.dtype.kind == 'f' else np.int64)
+    np.cumsum(values, out=out[1:])
+    return out
+
+def _out_of_bounds_prefix(values, bounds):
+    if bounds is None or None in bounds:
+        return None
+    low, high = bounds
+    return _prefix((values < low) | (values > high))
+
+def _block_sparse_table(values, reduce):
+    """Sparse table of `reduce` (np.fmin/np.fmax) over fixed-size blocks; level k covers 2**k blocks."""
+    n_blocks = -(-len(values) // STATS_BLOCK)
+    padded = np.full(n_blocks * STATS_BLOCK, np.nan)
+    padded[:len(values)] = values
+    table = [reduce.reduce(padded.reshape(n_blocks, STATS_BLOCK), axis=1)]
+    width = 1
+    while width * 2 <= n_blocks:
+        prev = table[-1]
+        table.append(reduce(prev[:-width], prev[width:]))
+        width *= 2
+    return table
+
+def _range_reduce(entry, table_key, reduce, a, b):
+    """NaN-ignoring min/max of sorted values[a:b] from whole-block table lookups plus the ragged ends."""
+    values = entry["values"]
+    first_block = -(-a // STATS_BLOCK)
+    last_block = b // STATS_BLOCK
+    if first_block >= last_block:
+        return reduce.reduce(values[a:b]) if b > a else np.nan
+
+    table = entry[table_key]
+    level = int(np.log2(last_block - first_block))
+    result = reduce(table[level][first_block], table[level][last_block - (1 << level)])
+    for part in (values[a:first_block * STATS_BLOCK], values[last_block * STATS_BLOCK:b]):
+        if part.size:
+            result = reduce(result, reduce.reduce(part))
+    return result
+
+def build_stats_index(df, variable_config, time_col='SECONDS (secs)', previous=None):
+    """
+    Precompute per-variable prefix sums and range min/max tables so update_spec_checks can answer
+    any visible-window query without rescanning the rows.
+
+    Pass the `previous` index to reuse it: only variables whose typical/absolute bounds changed
+    get their out-of-range counts rebuilt. Returns None if `time_col` is missing.
+    """
     if time_col not in df:
-        print("⚠️ DataFrame missing required time column for spec checks.")
+        return None
+
+    times = df[time_col].to_numpy(dtype=float)
+    if previous is not None and previous["time_col"] == time_col and previous["n"] == len(times):
+        index = previous
+    else:
+        if isinstance(df, Dataset) and df.time_col == time_col:
+            order = np.arange(len(times))  # Already in time order
+        else:
+            order = np.argsort(times, kind="stable")
+        index = {"time_col": time_col, "n": len(times), "order": order, "times": times[order], "vars": {}}
+
+    order = index["order"]
+    for var, config in variable_config.items():
+        if var not in df:
+            continue
+        bounds = _config_bounds(config)
+        entry = index["vars"].get(var)
+        if entry is None:
+            values = df[var].to_numpy(dtype=float)[order]
+            valid = ~np.isnan(values)
+            entry = {
+                "values": values,
+                "sum": _prefix(np.where(valid, values, 0.0)),
+                "count": _prefix(valid),
+                "min": _block_sparse_table(values, np.fmin),
+                "max": _block_sparse_table(values, np.fmax),
+                "bounds": None,
+            }
+            index["vars"][var] = entry
+        if entry["bounds"] != bounds:
+            entry["out_typical"] = _out_of_bounds_prefix(entry["values"], bounds[0])
+            entry["out_absolute"] = _out_of_bounds_prefix(entry["values"], bounds[1])
+            entry["bounds"] = bounds
+
+    for var in [v for v in index["vars"] if v not in variable_config]:
+        del index["vars"][var]
+
+    return index
+
+def copy_stats_index(index):
+    """
+    A copy of a stats index that shares its row tables but keeps its own bound-dependent counts,
+    so build_stats_index(previous=copy) with different bounds leaves the original untouched.
+    """
+    if index is None:
+        return None
+    return {**index, "vars": {var: dict(entry) for var, entry in index["vars"].items()}}
+
+def violation_events(times, values, typical=None, absolute=None, max_gap=None):
+    """
+    Contiguous runs of rows outside the typical bounds (or the absolute bounds when no typical
+    range is set), found in one vectorized run-length pass over time-sorted `times`/`values`.
+
+    NaN rows and gaps longer than `max_gap` end a run. Returns a dict of equal-length arrays:
+    start, end (times), peak_time, peak_value (the row furthest outside the bounds), rows and
+    absolute (whether any row of the run is also outside the absolute bounds).
+    """
+    empty = {"start": np.empty(0), "end": np.empty(0), "peak_time": np.empty(0), "peak_value": np.empty(0),
+             "rows": np.empty(0, dtype=np.int64), "absolute": np.empty(0, dtype=bool)}
+    bounds = typical if typical is not None else absolute
+    if bounds is None:
+        return empty
+
+    low, high = bounds
+    with np.errstate(invalid="ignore"):
+        out = (values < low) | (values > high)
+    new_run = out.copy()
+    new_run[1:] &= ~out[:-1]
+    if max_gap is not None:
+        new_run[1:] |= out[1:] & (np.diff(times) > max_gap)
+
+    rows = np.flatnonzero(out)
+    if not rows.size:
+        return empty
+    firsts = np.flatnonzero(new_run[rows])  # Position in `rows` where each run starts
+    lasts = np.r_[firsts[1:] - 1, rows.size - 1]
+    run = np.repeat(np.arange(firsts.size), np.diff(np.r_[firsts, rows.size]))
+
+    v = values[rows]
+    excursion = np.maximum(low - v, v - high)
+    worst = np.maximum.reduceat(excursion, firsts)
+    peak = np.minimum.reduceat(np.where(excursion == worst[run], np.arange(rows.size), rows.size), firsts)
+
+    if absolute is not None and bounds is not absolute:
+        with np.errstate(invalid="ignore"):
+            out_absolute = (v < absolute[0]) | (v > absolute[1])
+        severe = np.logical_or.reduceat(out_absolute, firsts)
+    else:
+        severe = np.full(firsts.size, absolute is not None)
+
+    return {
+        "start": times[rows[firsts]],
+        "end": times[rows[lasts]],
+        "peak_time": times[rows[peak]],
+        "peak_value": v[peak],
+        "rows": lasts - firsts + 1,
+        "absolute": severe,
+    }
+
+def build_event_index(df, variable_config, time_col='SECONDS (secs)', previous=None, max_gap=None):
+    """
+    violation_events for every configured variable, as {"n", "time_col", "vars": {var: {"bounds",
+    "events"}}}. Gaps longer than `max_gap` seconds split events. Pass the `previous` index to
+    recompute only variables whose bounds changed (or that were added); `previous` itself is
+    returned when nothing changed, and it is left untouched.
+    """
+    if time_col not in df:
+        return None
+
+    if (previous is not None and previous["time_col"] == time_col and previous["n"] == len(df)
+            and previous.get("max_gap") == max_gap):
+        index = previous
+    else:
+        index = {"time_col": time_col, "n": len(df), "max_gap": max_gap, "vars": {}}
+
+    times = None
+    for var, config in variable_config.items():
+        if var not in df:
+            continue
+        bounds = _config_bounds(config)
+        entry = index["vars"].get(var)
+        if entry is not None and entry["bounds"] == bounds:
+            continue
+        if index is previous:
+            index = {**previous, "vars": dict(previous["vars"])}
+        if times is None:
+            data = df if isinstance(df, Dataset) and df.time_col == time_col else Dataset(as_frame(df), time_col)
+            times = data.seconds
+        values = data[var].to_numpy(dtype=float)
+        typical = bounds[0] if bounds[0] is not None and None not in bounds[0] else None
+        absolute = bounds[1] if bounds[1] is not None and None not in bounds[1] else None
+        index["vars"][var] = {"bounds": bounds, "events": violation_events(times, values, typical, absolute, max_gap)}
+
+    removed = [v for v in index["vars"] if v not in variable_config]
+    if removed and index is previous:
+        index = {**previous, "vars": dict(previous["vars"])}
+    for var in removed:
+        del index["vars"][var]
+    return index
+
+def list_events(index, variables=None):
+    """All events of `variables` (every indexed variable by default) as (start, end, var, peak_time,
+    peak_value, rows, absolute) tuples sorted by start time."""
+    if index is None:
+        return []
+    events = []
+    for var, entry in index["vars"].items():
+        if variables is not None and var not in variables:
+            continue
+        e = entry["events"]
+        events.extend(zip(e["start"].tolist(), e["end"].tolist(), [var] * len(e["start"]), e["peak_time"].tolist(),
+                          e["peak_value"].tolist(), e["rows"].tolist(), e["absolute"].tolist()))
+    events.sort(key=lambda event: (event[0], event[2]))
+    return events
+
+def _index_ranges(index, xlim, spans, mode):
+    """Row ranges (in the index's time order) covering the visible window, limited to running spans if needed."""
+    times = index["times"]
+    lo = np.searchsorted(times, xlim[0], side="left")
+    hi = np.searchsorted(times, xlim[1], side="right")
+    if mode not in ["Running", "IQR"]:
+        return [[lo, hi]]
+
+    ranges = []
+    for startup, running, stopping in spans:
+        r_start, r_end = running
+        a = max(lo, np.searchsorted(times, r_start, side="left"))
+        b = min(hi, np.searchsorted(times, r_end, side="right"))
+        ranges.append((a, b))
+    return merge_ranges(ranges)
+
+def spec_status(config, out_typical, out_absolute):
+    """Spec status of a variable from its out-of-typical and out-of-absolute counts under `config`."""
+    status = "undefined"
+
+    if "typical" in config:
+        if out_typical:
+            status = "outside typical"
+        else:
+            status = "within typical"
+
+    if "absolute" in config:
+        if out_absolute:
+            status = "outside absolute"
+        elif status not in ["within typical"]:
+            status = "outside typical"
+
+    return status
+
+def query_stats_index(index, variable_config, xlim, spans, mode="None", results=None):
+    """Answer a spec-check query from a stats index in O(spans) per variable, independent of window size."""
+    results = {} if results is None else results
+    ranges = _index_ranges(index, xlim, spans, mode)
+    if sum(b - a for a, b in ranges) == 0:
+        log.debug("⚠️ No data in view and running spans.")
+        return results, {}
+
+    stats = {}
+    for var, config in variable_config.items():
+        entry = index["vars"].get(var)
+        if entry is None:
+            continue
+
+        count = sum(entry["count"][b] - entry["count"][a] for a, b in ranges)
+        if count == 0:
+            continue
+
+        total = sum(entry["sum"][b] - entry["sum"][a] for a, b in ranges)
+        out_typical = sum(entry["out_typical"][b] - entry["out_typical"][a] for a, b in ranges) \
+            if entry["out_typical"] is not None else 0
+        out_absolute = sum(entry["out_absolute"][b] - entry["out_absolute"][a] for a, b in ranges) \
+            if entry["out_absolute"] is not None else 0
+
+        stat = {
+            "mean": total / count,
+            "min": np.fmin.reduce([_range_reduce(entry, "min", np.fmin, a, b) for a, b in ranges]),
+            "max": np.fmax.reduce([_range_reduce(entry, "max", np.fmax, a, b) for a, b in ranges]),
+            "total": int(count),
+            "in_typical": int(count - out_typical) if "typical" in config else None,
+            "in_absolute": int(count - out_absolute) if "absolute" in config else None
+        }
+
+        results[var] = spec_status(config, out_typical, out_absolute)
+        stats[var] = stat
+
+    return results, stats
+
+def update_spec_checks(ax, df, variable_config, spans, results = {}, mode = "None", time_col='SECONDS (secs)', stats_index=None):
+    return compute_spec_stats(df, variable_config, spans, ax.get_xlim(), results, mode, time_col, stats_index)
+
+def compute_spec_stats(df, variable_config, spans, xlim, results=None, mode="None", time_col='SECONDS (secs)', stats_index=None):
+    """Spec statuses and stats for the rows within `xlim` (limited to running spans for Running/IQR)."""
+    results = {} if results is None else results
+    if time_col not in df:
+        log.warning("⚠️ DataFrame missing required time column for spec checks.")
         return results, {}
 
-    xlim = ax.get_xlim()
-    visible_mask = (df[time_col] >= xlim[0]) & (df[time_col] <= xlim[1])
+    # Prefix-sum fast path; IQR filtering needs the actual values, so it always scans
+    if stats_index is not None and mode != "IQR" and stats_index["n"] == len(df):
+        return query_stats_index(stats_index, variable_config, xlim, spans, mode, results)
 
-    # Combine all running span filters if needed
-    if mode in ["Running", "IQR"]:
-        running_mask = pd.Series(False, index=df.index)
-        for startup, running, stopping in spans:
-            r_start, r_end = running
-            running_mask |= (df[time_col] >= r_start) & (df[time_col] <= r_end)
-        combined_mask = visible_mask & running_mask
+    if isinstance(df, Dataset) and df.time_col == time_col:
+        # Sorted rows: the visible (and running) rows are a few contiguous ranges, no masks needed
+        if mode in ["Running", "IQR"]:
+            ranges = df.span_ranges(spans, within=xlim)
+        else:
+            ranges = [df.row_range(*xlim)]
+        subset = df.frame_for(ranges)
     else:
-        combined_mask = visible_mask
+        visible_mask = (df[time_col] >= xlim[0]) & (df[time_col] <= xlim[1])
+
+        # Combine all running span filters if needed
+        if mode in ["Running", "IQR"]:
+            running_mask = pd.Series(False, index=df.index)
+            for startup, running, stopping in spans:
+                r_start, r_end = running
+                running_mask |= (df[time_col] >= r_start) & (df[time_col] <= r_end)
+            combined_mask = visible_mask & running_mask
+        else:
+            combined_mask = visible_mask
 
-    subset = df[combined_mask]
+        subset = df[combined_mask]
 
     if subset.empty:
-        print("⚠️ No data in view and running spans.")
+        log.debug("⚠️ No data in view and running spans.")
         return results, {}
 
     stats = {}
@@ -149,27 +674,19 @@ def update_spec_checks(ax, df, variable_config, spans, results = {}, mode = "Non
             "in_absolute": None
         }
 
-        status = "undefined"
+        out_typical = out_abs = 0
 
         if "typical" in config:
             low, high = config["typical"]
-            out_typical = (values < low) | (values > high)
-            stat["in_typical"] = len(values) - out_typical.sum()
-            if out_typical.any():
-                status = "outside typical"
-            else:
-                status = "within typical"
+            out_typical = ((values < low) | (values > high)).sum()
+            stat["in_typical"] = len(values) - out_typical
 
         if "absolute" in config:
             low, high = config["absolute"]
-            out_abs = (values < low) | (values > high)
-            stat["in_absolute"] = len(values) - out_abs.sum()
-            if out_abs.any():
-                status = "outside absolute"
-            elif status not in ["within typical"]:
-                status = "outside typical"
-
-        results[var] = status
+            out_abs = ((values < low) | (values > high)).sum()
+            stat["in_absolute"] = len(values) - out_abs
+
+        results[var] = spec_status(config, out_typical, out_abs)
         stats[var] = stat
 
     return results, stats
@@ -0,0 +1,66 @@
+import matplotlib.cm as cm
+import matplotlib.colors as mcolors
+
+MAX_SUBPLOTS = 4
+HIDDEN_COLUMNS = ('NANOSECONDS (nsecs)', 'DATE (date)', 'TIME (time)')
+
+# (color, alpha) of the startup, running and shutdown shading
+SPAN_STYLES = (('blue', 0.2), ('green', 0.1), ('red', 0.2))
+
+
+def figure_title(model, serial):
+    return f"LI-78{model[2]}{model[3]}: {serial}"
+
+
+def plottable_variables(columns, time_col):
+    return [col for col in columns if col != time_col and col not in HIDDEN_COLUMNS]
+
+
+def variable_colors(variables):
+    """One color per variable, spread over the 'berlin' colormap in column order."""
+    colormap = cm.get_cmap('berlin', len(variables))
+    return {var: mcolors.to_hex(colormap(i)) for i, var in enumerate(variables)}
+
+
+def autoplot_assignments(variables, variable_config, n_subplots=MAX_SUBPLOTS):
+    """{variable: subplot index} for the variables configured to autoplot, dealt round-robin."""
+    autoplotted = [var for var in variables if variable_config.get(var, {}).get("autoplot", False)]
+    return {var: i % n_subplots for i, var in enumerate(autoplotted)}
+
+
+def position_subplots(axes, top_margin=0.05, bottom_margin=0.12, spacing=0.02):
+    """Stack the visible `axes` evenly down the figure; only the top one gets x tick labels, as in the viewer."""
+    visible_axes = [ax for ax in axes if ax.get_visible()]
+    n = len(visible_axes)
+    if n == 0:
+        return
+
+    available_height = 1.0 - top_margin - bottom_margin - (spacing * (n - 1))
+    subplot_height = available_height / n
+
+    for i, ax in enumerate(reversed(visible_axes)):
+        bottom = bottom_margin + i * (subplot_height + spacing)
+        ax.set_position([0.1, bottom, 0.85, subplot_height])
+
+        # X-labels only on bottom
+        ax.tick_params(labelbottom=(i == n - 1))
+        ax.tick_params(axis='x', rotation=45, labelsize=8)
+        ax.tick_params(axis='y', labelleft=True)
+
+
+def draw_spans(axes, spans):
+    """Shade every startup/running/shutdown period on each of `axes` (shutdown only when allotted)."""
+    for ax in axes:
+        for span in spans:
+            for (start, end), (color, alpha) in zip(span, SPAN_STYLES):
+                if (start, end) == (-1, -1):
+                    continue
+                patch = ax.axvspan(start, end, color=color, alpha=alpha)
+                patch._span = True
+
+
+def clear_spans(axes):
+    for ax in axes:
+        for patch in ax.patches[:]:
+            if getattr(patch, "_span", False):
+                patch.remove()
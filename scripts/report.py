@@ -0,0 +1,226 @@
+import os
+import json
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+
+from app_logging import get_logger, configure_logging
+from time_axis import HumanTimeFormatter, set_time_axis
+from manipulation import minmax_decimate_indices
+from plot_layout import (figure_title, plottable_variables, variable_colors, autoplot_assignments,
+                         position_subplots, draw_spans, MAX_SUBPLOTS)
+from export import load_file_set
+
+log = get_logger("report")
+
+REPORT_FORMATS = ("pdf", "png")
+MAX_POINTS = 4000  # Per line and page
+GAP_THRESHOLD = 2  # Seconds; longer gaps break the lines, as in the viewer
+PAGE_SIZE = (11, 8.5)  # Inches (landscape letter)
+DPI = 150
+
+# "window" is "all", "running" (one page per running period) or [start, end] in epoch seconds;
+# "subplots" lists the variables of each subplot and defaults to the autoplot assignment
+DEFAULT_PAGES = [
+    {"title": "Overview"},
+    {"title": "Running period {n}", "window": "running"},
+]
+
+
+def load_pages(path):
+    """Page definitions from a JSON file holding a list of pages or {"pages": [...]}."""
+    with open(path, "r", encoding="utf-8") as f:
+        pages = json.load(f)
+    if isinstance(pages, dict):
+        pages = pages.get("pages", [])
+    if not isinstance(pages, list) or not all(isinstance(p, dict) for p in pages):
+        raise ValueError(f"{path} must hold a list of page objects")
+    return pages
+
+
+def expand_pages(pages, dataset, spans):
+    """(title, window, page) for every page to draw, repeating "running" pages per running period."""
+    full = (float(np.nanmin(dataset.seconds)), float(np.nanmax(dataset.seconds)))
+    for page in pages:
+        window = page.get("window", "all")
+        title = page.get("title", "")
+        if window == "running":
+            for n, (_, running, _) in enumerate(spans, 1):
+                yield title.format(n=n), tuple(running), page
+        elif window == "all":
+            yield title.format(n=1), full, page
+        else:
+            yield title.format(n=1), (float(window[0]), float(window[1])), page
+
+
+def page_subplots(page, variables, variable_config):
+    """Variables of each subplot: the page's own list, or the autoplot assignment."""
+    if page.get("subplots"):
+        groups = [[var for var in group if var in variables] for group in page["subplots"][:MAX_SUBPLOTS]]
+    else:
+        groups = [[] for _ in range(MAX_SUBPLOTS)]
+        for var, idx in autoplot_assignments(variables, variable_config).items():
+            groups[idx].append(var)
+    return [group for group in groups if group]
+
+
+def decimated_line(dataset, variable, window, max_points=MAX_POINTS, gap_threshold=GAP_THRESHOLD):
+    """
+    Min/max-decimated (x, y) of `variable` within `window`, with a NaN wherever the full-resolution
+    rows between two kept points contain a time gap longer than `gap_threshold`.
+    """
+    a, b = dataset.row_range(*window)
+    a, b = max(a - 1, 0), min(b + 1, len(dataset))
+    x = dataset.seconds[a:b]
+    y = dataset[variable].to_numpy(dtype=float)[a:b]
+    idx = minmax_decimate_indices([y], max_points)
+    if gap_threshold is None or len(idx) < 2:
+        return x[idx], y[idx]
+
+    gaps = np.flatnonzero(np.diff(x) > gap_threshold)  # Row k is followed by a gap
+    broken = np.searchsorted(gaps, idx[1:]) > np.searchsorted(gaps, idx[:-1])
+    breaks = np.flatnonzero(broken) + 1
+    return np.insert(x[idx], breaks, np.nan), np.insert(y[idx], breaks, np.nan)
+
+
+def render_page(loaded, title, window, subplots, colors, max_points=MAX_POINTS, human_time=True):
+    """One report page as an Agg figure: stacked subplots over `window` with the periods shaded."""
+    dataset, metadata = loaded["dataset"], loaded["metadata"]
+    fig = Figure(figsize=PAGE_SIZE)
+    FigureCanvasAgg(fig)
+    heading = figure_title(loaded["model"], metadata.get("SN", "Unknown SN"))
+    fig.suptitle(f"{heading} — {title}" if title else heading, fontsize=14)
+
+    axes = [fig.add_subplot(len(subplots), 1, i + 1) for i in range(len(subplots))]
+    formatter = HumanTimeFormatter(metadata.get("Timezone", "UTC")) if human_time else None
+    spans = [span for span in loaded["spans"]
+             if max(end for _, end in span) >= window[0] and span[0][0] <= window[1]]
+
+    for ax, variables in zip(axes, subplots):
+        for var in variables:
+            x, y = decimated_line(dataset, var, window, max_points)
+            ax.plot(x, y, label=var, linewidth=1.0, color=colors[var])
+        ax.set_xlim(*window)
+        ax.grid(True)
+        if variables:
+            ax.legend(loc='upper right', fontsize='small', frameon=True)
+        set_time_axis(ax, formatter)
+    draw_spans(axes, spans)
+    for ax in axes:
+        ax.set_xlim(*window)  # Shading outside the window must not widen it
+    position_subplots(axes)
+    return fig
+
+
+def render_report(filepaths, out_path, pages=None, fmt=None, max_points=MAX_POINTS, run_threshold=2,
+                  human_time=True, dpi=DPI):
+    """
+    Render the report pages for one file set: a multi-page PDF at `out_path`, or for PNG one
+    <out_path>_pNN.png per page. The format defaults to the extension of `out_path`.
+    Returns the written paths.
+    """
+    base, ext = os.path.splitext(out_path)
+    fmt = fmt or ext.lstrip(".").lower() or "pdf"
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format '{fmt}'; expected one of {', '.join(REPORT_FORMATS)}")
+
+    loaded = load_file_set(filepaths, run_threshold)
+    dataset = loaded["dataset"]
+    if not len(dataset):
+        raise ValueError("No data rows in the selected files.")
+    variables = plottable_variables(dataset.columns, loaded["time_col"])
+    variable_config = loaded["compiled"]["variable_config"]
+    colors = variable_colors(variables)
+
+    if os.path.dirname(base):
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+    written = []
+    pdf = PdfPages(f"{base}.pdf") if fmt == "pdf" else None
+    try:
+        for n, (title, window, page) in enumerate(expand_pages(pages or DEFAULT_PAGES, dataset, loaded["spans"]), 1):
+            subplots = page_subplots(page, variables, variable_config)
+            if not subplots:
+                log.warning("⚠️ Skipping page '%s': none of its variables are in the data", title)
+                continue
+            started = time.perf_counter()
+            fig = render_page(loaded, title, window, subplots, colors, max_points, human_time)
+            if pdf is not None:
+                pdf.savefig(fig)
+            else:
+                written.append(f"{base}_p{n:02d}.png")
+                fig.savefig(written[-1], dpi=dpi)
+            log.debug("Rendered page %d (%s) in %.2fs", n, title, time.perf_counter() - started)
+    finally:
+        if pdf is not None:
+            pdf.close()
+            written.append(f"{base}.pdf")
+
+    log.info("📄 Wrote report for %d file(s) to %s", len(filepaths), ", ".join(written))
+    return written
+
+
+def group_by_serial(filepaths):
+    """
+    ({serial: [paths]}, {path: error message}) from each file's header, serials in the order they
+    first appear. Files whose header cannot be read are left out of the groups and reported instead.
+    """
+    from file_parsing import read_file_summary
+
+    groups, unreadable = {}, {}
+    for path in filepaths:
+        try:
+            serial = read_file_summary(path).get("serial") or "unknown"
+        except (OSError, ValueError, UnicodeDecodeError, EOFError) as e:
+            log.error("❌ Skipping %s: %s", path, e)
+            unreadable[path] = str(e)
+            continue
+        groups.setdefault(serial, []).append(path)
+    return groups, unreadable
+
+
+def render_reports(file_sets, out_dir, pages=None, fmt="pdf", max_workers=None, log_level=None, **options):
+    """
+    render_report for every {name: filepaths} entry across a process pool, writing <out_dir>/<name>.<fmt>.
+    Returns ({name: written paths}, {name: error message}) so one bad file set does not stop the rest.
+    """
+    written, failed = {}, {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=configure_logging,
+                             initargs=(log_level,)) as pool:
+        futures = {pool.submit(render_report, paths, os.path.join(out_dir, f"{name}.{fmt}"), pages, fmt,
+                               **options): name for name, paths in file_sets.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                written[name] = future.result()
+            except Exception as e:
+                log.error("❌ Report for %s failed: %s", name, e)
+                failed[name] = str(e)
+    return written, failed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render 7800 report pages to PDF/PNG without the GUI")
+    parser.add_argument("files", nargs="+", help=".data files; one report is written per instrument serial")
+    parser.add_argument("--out", required=True, help="Output folder")
+    parser.add_argument("--format", default="pdf", choices=REPORT_FORMATS)
+    parser.add_argument("--pages", help="JSON file with the page definitions (default: overview + running periods)")
+    parser.add_argument("--workers", type=int, help="Reports rendered in parallel (default: one per CPU)")
+    parser.add_argument("--max-points", type=int, default=MAX_POINTS, help="Decimate each line to about this many points")
+    parser.add_argument("--seconds", action="store_true", help="Label the time axis in epoch seconds")
+    args = parser.parse_args()
+
+    configure_logging("INFO")
+    pages = load_pages(args.pages) if args.pages else None
+    file_sets, unreadable = group_by_serial(args.files)
+    written, failed = render_reports(file_sets, args.out, pages, args.format, args.workers,
+                                     log_level="INFO", max_points=args.max_points, human_time=not args.seconds)
+    failed.update(unreadable)
+    for name in sorted(written):
+        for p in written[name]:
+            print(p)
+    raise SystemExit(1 if failed else 0)
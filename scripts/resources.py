@@ -0,0 +1,21 @@
+import os
+import sys
+
+
+def resource_path(relative_path):
+    base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, relative_path)
+
+
+_icon_cache = {}
+
+def set_icon(r):
+    from PIL import Image, ImageTk
+
+    # PhotoImages belong to one Tk interpreter, so cache per root
+    root = r.winfo_toplevel()._root()
+    photo = _icon_cache.get(id(root))
+    if photo is None:
+        photo = ImageTk.PhotoImage(Image.open(resource_path('assets/icon.png')), master=root)
+        _icon_cache[id(root)] = photo
+    r.wm_iconphoto(True, photo)
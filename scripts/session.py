@@ -0,0 +1,59 @@
+import os
+import json
+
+from app_logging import get_logger
+
+log = get_logger("session")
+
+SESSION_VERSION = 1
+SESSION_EXTENSION = ".7800session"
+
+
+def spans_to_json(spans):
+    return [[[float(a), float(b)] for a, b in span] for span in spans]
+
+
+def spans_from_json(spans):
+    return [tuple(tuple(period) for period in span) for span in spans]
+
+
+def save_session(path, filepaths, view, spans=None, validation=None, cache=None):
+    """
+    Write a session file describing one viewer window.
+
+    `view` holds the window state (subplots, assignments, xlim and options); `spans` and
+    `validation` are the computed results to reuse when the files are unchanged, and `cache`
+    the data_cache key of the parsed data.
+    """
+    session = {
+        "version": SESSION_VERSION,
+        "files": [os.path.abspath(p) for p in filepaths],
+        "cache": cache,
+        "view": view,
+        "spans": spans_to_json(spans) if spans is not None else None,
+        "validation": validation,
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(session, f, indent=2)
+    os.replace(tmp, path)
+    log.info("💾 Saved session for %d file(s) to %s", len(filepaths), path)
+    return path
+
+
+def load_session(path):
+    """Read a session file, checking its version and that its data files still exist."""
+    with open(path, "r", encoding="utf-8") as f:
+        session = json.load(f)
+
+    if session.get("version") != SESSION_VERSION:
+        raise ValueError(f"Unsupported session version {session.get('version')} in {path}")
+    missing = [p for p in session.get("files", []) if not os.path.exists(p)]
+    if not session.get("files"):
+        raise ValueError(f"Session {path} does not list any data files")
+    if missing:
+        raise ValueError("Session data files are missing:\n" + "\n".join(missing))
+
+    if session.get("spans") is not None:
+        session["spans"] = spans_from_json(session["spans"])
+    return session
@@ -2,12 +2,39 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk
 import sys
-from data_processing import embed_plot_7800_data
+import threading
 
-# To allow the exe to access assets
-from file_parsing import resource_path, set_icon
+# To allow the exe to access assets (kept free of pandas/matplotlib so the launcher opens quickly)
+from resources import resource_path, set_icon
 
 from version import __version__
+from app_logging import configure_logging, get_logger
+
+log = get_logger("launcher")
+
+# The plot viewer pulls in matplotlib, the TkAgg backend, pandas and pytz. It is imported on first
+# use (or pre-warmed in the background once the launcher is showing) instead of at startup.
+_viewer_lock = threading.Lock()
+
+
+def load_viewer():
+    with _viewer_lock:
+        import data_processing
+    return data_processing
+
+
+def load_comparison_viewer():
+    with _viewer_lock:
+        import compare
+    return compare
+
+
+def prewarm_viewer():
+    try:
+        load_viewer()
+        log.debug("Viewer modules pre-warmed")
+    except Exception as e:  # The real import in plot_file will surface the error
+        log.warning("⚠️ Failed to pre-warm viewer modules: %s", e)
 
 class App:
     def __init__(self, root):
@@ -33,7 +60,18 @@ class App:
         self.data_path = []
         self.add_file_selector(file_frame, ".data File:", self.data_path, self.browse_data)
 
-        tk.Button(root, text="Open Plot", font=("Helvetica", 12), command=self.plot_file).pack(pady=10)
+        button_row = tk.Frame(root)
+        button_row.pack(pady=10)
+        tk.Button(button_row, text="Open Plot", font=("Helvetica", 12), command=self.plot_file).pack(side='left', padx=5)
+        tk.Button(button_row, text="Compare Instruments", font=("Helvetica", 12),
+                  command=self.compare_files).pack(side='left', padx=5)
+        tk.Button(button_row, text="Open Session", font=("Helvetica", 12),
+                  command=self.open_session).pack(side='left', padx=5)
+        tk.Button(button_row, text="Catalog", font=("Helvetica", 12),
+                  command=self.open_catalog).pack(side='left', padx=5)
+
+        # Start importing the viewer once the launcher has been drawn
+        self.root.after(100, lambda: threading.Thread(target=prewarm_viewer, daemon=True).start())
 
     def add_file_selector(self, parent, label, var, command):
         row = tk.Frame(parent)
@@ -52,34 +90,102 @@ class App:
     def browse_data(self):
         paths = filedialog.askopenfilenames(filetypes=[
             ("7800 Data Files", "*.data"),
+            ("Compressed 7800 Data Files", "*.data.gz *.data.xz *.data.bz2 *.data.zst *.gz *.xz *.bz2 *.zst"),
             ("All File Types", "*")
         ])
 
         if paths:
-            self.data_paths = list(paths)
-            num_files = len(self.data_paths)
-            if num_files == 1:
-                display_text = f"{num_files} file selected"
-            else:
-                display_text = f"{num_files} files selected"
-            self.file_display_var.set(display_text)
+            self.set_data_paths(paths)
+
+    def set_data_paths(self, paths):
+        self.data_paths = list(paths)
+        num_files = len(self.data_paths)
+        if num_files == 1:
+            display_text = f"{num_files} file selected"
+        else:
+            display_text = f"{num_files} files selected"
+        self.file_display_var.set(display_text)
 
     def plot_file(self):
         if not self.data_paths:
             messagebox.showerror("Missing File", "Please select a .data file.")
             return
+        self.open_viewer(self.data_paths)
 
+    def open_viewer(self, paths, session=None):
+        self.root.config(cursor="watch")
+        self.root.update_idletasks()
         try:
+            viewer = load_viewer()
             plot_window = tk.Toplevel(self.root)
             plot_window.title("Data Plot Viewer")
             plot_window.geometry("1600x800")
             set_icon(plot_window)
-            embed_plot_7800_data(plot_window, self.data_paths)
+            viewer.embed_plot_7800_data(plot_window, paths, session=session)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to plot:\n{paths}\n\n{e}")
+        finally:
+            self.root.config(cursor="")
+
+    def open_session(self):
+        from session import SESSION_EXTENSION, load_session
+
+        path = filedialog.askopenfilename(filetypes=[
+            ("7800 Session", f"*{SESSION_EXTENSION}"),
+            ("All File Types", "*")
+        ])
+        if not path:
+            return
+        try:
+            session = load_session(path)
+        except Exception as e:
+            messagebox.showerror("Session Error", f"Failed to open session:\n{path}\n\n{e}")
+            return
+        self.open_viewer(session["files"], session=session)
+
+    def open_catalog(self):
+        self.root.config(cursor="watch")
+        self.root.update_idletasks()
+        try:
+            with _viewer_lock:
+                import catalog
+            catalog_window = tk.Toplevel(self.root)
+            catalog_window.title("Data File Catalog")
+            catalog_window.geometry("1100x500")
+            set_icon(catalog_window)
+
+            def use_files(paths):
+                self.set_data_paths(paths)
+                catalog_window.destroy()
+
+            catalog.embed_catalog_browser(catalog_window, use_files)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open the catalog:\n\n{e}")
+        finally:
+            self.root.config(cursor="")
+
+    def compare_files(self):
+        if not self.data_paths:
+            messagebox.showerror("Missing File", "Please select .data files from the instruments to compare.")
+            return
+
+        self.root.config(cursor="watch")
+        self.root.update_idletasks()
+        try:
+            compare = load_comparison_viewer()
+            compare_window = tk.Toplevel(self.root)
+            compare_window.title("Instrument Comparison")
+            compare_window.geometry("1600x800")
+            set_icon(compare_window)
+            compare.embed_comparison_plot(compare_window, self.data_paths)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to plot:\n{self.data_paths}\n\n{e}")
+            messagebox.showerror("Error", f"Failed to compare:\n{self.data_paths}\n\n{e}")
+        finally:
+            self.root.config(cursor="")
 
 
 if __name__ == "__main__":
+    configure_logging()
     root = tk.Tk()
     set_icon(root)
 
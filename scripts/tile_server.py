@@ -0,0 +1,283 @@
+import os
+import gzip
+import json
+import math
+import asyncio
+import numpy as np
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+
+from app_logging import get_logger
+from resources import resource_path
+from data_cache import cache_key
+from export import load_file_set
+from manipulation import build_stats_index, compute_spec_stats
+from plot_layout import plottable_variables, variable_colors
+
+log = get_logger("tiles")
+
+TILE_BINS = 512  # Min/max bins per tile
+TILE_CACHE_SIZE = 2048  # Tiles kept in memory (about 10 KB of JSON each)
+GZIP_MIN_BYTES = 1024
+VIEWER_PAGE = os.path.join("assets", "viewer", "index.html")
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def minmax_tile(seconds, values, t0, t1, bins=TILE_BINS):
+    """
+    Min and max of `values` in each of `bins` equal-width time bins over [t0, t1) (NaN where a bin
+    has no valid rows). `seconds` must be sorted; each tile costs one pass over its own rows.
+    """
+    a = int(np.searchsorted(seconds, t0, side="left"))
+    b = int(np.searchsorted(seconds, t1, side="left"))
+    mins = np.full(bins, np.nan)
+    maxs = np.full(bins, np.nan)
+    if b <= a:
+        return mins, maxs
+
+    idx = ((seconds[a:b] - t0) * (bins / (t1 - t0))).astype(np.int64).clip(0, bins - 1)
+    starts = np.flatnonzero(np.r_[True, idx[1:] != idx[:-1]])
+    mins[idx[starts]] = np.fmin.reduceat(values[a:b], starts)
+    maxs[idx[starts]] = np.fmax.reduceat(values[a:b], starts)
+    return mins, maxs
+
+
+def _json_list(values, digits=6):
+    return [None if v != v else float(f"{v:.{digits}g}") for v in values.tolist()]
+
+
+def _json_default(value):
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class TileServer:
+    """
+    Serves one loaded file set over HTTP: min/max tiles per variable and zoom level, the periods,
+    spec stats for a window and the browser viewer page.
+
+    Zoom level z splits the dataset's time range into 2**z tiles of TILE_BINS bins. Tiles are kept
+    in an LRU cache, and their ETags derive from the files' cache key, so a browser revalidating an
+    unchanged tile gets a 304 without it being recomputed.
+    """
+
+    def __init__(self, filepaths, run_threshold=2, cache_size=TILE_CACHE_SIZE, bins=TILE_BINS):
+        loaded = load_file_set(filepaths, run_threshold)
+        self.dataset = loaded["dataset"]
+        if not len(self.dataset):
+            raise ValueError("No data rows in the selected files.")
+        self.model = loaded["model"]
+        self.metadata = loaded["metadata"]
+        self.time_col = loaded["time_col"]
+        self.spans = loaded["spans"]
+        self.variable_config = loaded["compiled"]["variable_config"]
+        self.variables = plottable_variables(self.dataset.columns, self.time_col)
+        self.stats_index = build_stats_index(self.dataset, self.variable_config, self.time_col)
+        self.tag = cache_key(filepaths)
+        self.bins = bins
+        self.cache_size = cache_size
+        self.tiles = OrderedDict()
+        self.hits = self.misses = self.not_modified = 0
+        self._values = {}
+
+        seconds = self.dataset.seconds
+        self.start = float(np.nanmin(seconds))
+        self.end = float(np.nanmax(seconds)) + 1.0  # Tiles are half-open; keep the last row inside
+        rows_per_tile = len(seconds) / bins
+        self.max_level = max(int(math.ceil(math.log2(rows_per_tile))), 0) if rows_per_tile > 1 else 0
+
+    # --- Data ---
+    def values(self, variable):
+        if variable not in self._values:
+            self._values[variable] = self.dataset[variable].to_numpy(dtype=float)
+        return self._values[variable]
+
+    def tile_bounds(self, z, x):
+        width = (self.end - self.start) / 2 ** z
+        return self.start + x * width, self.start + (x + 1) * width
+
+    def render_tile(self, variable, z, x):
+        """JSON bytes of one tile (safe to call from a worker thread)."""
+        t0, t1 = self.tile_bounds(z, x)
+        mins, maxs = minmax_tile(self.dataset.seconds, self.values(variable), t0, t1, self.bins)
+        return json.dumps({"z": z, "x": x, "t0": t0, "t1": t1,
+                           "min": _json_list(mins), "max": _json_list(maxs)}).encode("utf-8")
+
+    async def tile(self, variable, z, x):
+        """JSON bytes of one tile from the LRU cache, rendering it off the event loop on a miss."""
+        key = (variable, z, x)
+        body = self.tiles.get(key)
+        if body is not None:
+            self.tiles.move_to_end(key)
+            self.hits += 1
+            return body
+
+        self.misses += 1
+        body = await asyncio.get_running_loop().run_in_executor(None, self.render_tile, variable, z, x)
+        self.tiles[key] = body
+        if len(self.tiles) > self.cache_size:
+            self.tiles.popitem(last=False)
+        return body
+
+    def meta(self):
+        colors = variable_colors(self.variables)
+        return {
+            "serial": self.metadata.get("SN", "Unknown SN"),
+            "model": self.model,
+            "timezone": self.metadata.get("Timezone", "UTC"),
+            "start": self.start,
+            "end": self.end,
+            "rows": len(self.dataset),
+            "bins": self.bins,
+            "max_level": self.max_level,
+            "variables": [{
+                "name": var,
+                "color": colors[var],
+                "typical": self.variable_config.get(var, {}).get("typical"),
+                "absolute": self.variable_config.get(var, {}).get("absolute"),
+                "autoplot": bool(self.variable_config.get(var, {}).get("autoplot", False)),
+            } for var in self.variables],
+        }
+
+    def stats(self, t0, t1, mode="None"):
+        results, stats = compute_spec_stats(self.dataset, self.variable_config, self.spans, (t0, t1), {}, mode,
+                                            self.time_col, self.stats_index)
+        return {var: dict(stat, status=results.get(var, "unclassified")) for var, stat in stats.items()}
+
+    def metrics(self):
+        return {"tiles_cached": len(self.tiles), "hits": self.hits, "misses": self.misses,
+                "not_modified": self.not_modified}
+
+    # --- HTTP ---
+    async def route(self, path, query, headers):
+        """(status, content type, body, etag) for a GET request."""
+        if path in ("/", "/index.html"):
+            with open(resource_path(VIEWER_PAGE), "rb") as f:
+                return 200, "text/html; charset=utf-8", f.read(), None
+        if path == "/api/meta":
+            return 200, "application/json", json.dumps(self.meta()).encode("utf-8"), None
+        if path == "/api/spans":
+            spans = [[list(period) for period in span] for span in self.spans]
+            return 200, "application/json", json.dumps(spans, default=_json_default).encode("utf-8"), None
+        if path == "/api/metrics":
+            return 200, "application/json", json.dumps(self.metrics()).encode("utf-8"), None
+
+        if path == "/api/stats":
+            try:
+                t0, t1 = float(query["start"][0]), float(query["end"][0])
+            except (KeyError, ValueError):
+                raise HTTPError(400, "stats needs numeric start and end")
+            mode = query.get("mode", ["None"])[0]
+            if mode not in ("None", "Running", "IQR"):
+                raise HTTPError(400, f"unknown mode {mode}")
+            stats = await asyncio.get_running_loop().run_in_executor(None, self.stats, t0, t1, mode)
+            return 200, "application/json", json.dumps(stats, default=_json_default).encode("utf-8"), None
+
+        if path == "/api/tile":
+            try:
+                variable = query["var"][0]
+                z, x = int(query["z"][0]), int(query["x"][0])
+            except (KeyError, ValueError):
+                raise HTTPError(400, "tile needs var, z and x")
+            if variable not in self.variables:
+                raise HTTPError(404, f"unknown variable {variable}")
+            if not 0 <= z <= self.max_level or not 0 <= x < 2 ** z:
+                raise HTTPError(404, f"no tile {z}/{x}")
+
+            etag = f'"{self.tag}-{self.variables.index(variable)}-{z}-{x}-{self.bins}"'
+            if etag in [tag.strip() for tag in headers.get("if-none-match", "").split(",")]:
+                self.not_modified += 1
+                return 304, "application/json", b"", etag
+            return 200, "application/json", await self.tile(variable, z, x), etag
+
+        raise HTTPError(404, f"no such path {path}")
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                url = urlsplit(target)
+                etag = None
+                content_type = "application/json"
+                try:
+                    if method not in ("GET", "HEAD"):
+                        raise HTTPError(405, f"{method} is not supported")
+                    status, content_type, body, etag = await self.route(url.path, parse_qs(url.query), headers)
+                except HTTPError as e:
+                    status, body = e.status, json.dumps({"error": str(e)}).encode("utf-8")
+                except Exception as e:
+                    log.error("❌ %s %s failed: %s", method, target, e)
+                    status, body = 500, json.dumps({"error": str(e)}).encode("utf-8")
+
+                response = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}", f"Content-Type: {content_type}",
+                            "Cache-Control: no-cache"]
+                if etag:
+                    response.append(f"ETag: {etag}")
+                if len(body) >= GZIP_MIN_BYTES and "gzip" in headers.get("accept-encoding", ""):
+                    body = gzip.compress(body, compresslevel=5)
+                    response.append("Content-Encoding: gzip")
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                response.append(f"Content-Length: {len(body)}")
+                response.append("Connection: " + ("keep-alive" if keep_alive else "close"))
+                writer.write(("\r\n".join(response) + "\r\n\r\n").encode("latin-1"))
+                if method != "HEAD":
+                    writer.write(body)
+                await writer.drain()
+                log.debug("%s %s -> %d", method, target, status)
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8780):
+        server = await asyncio.start_server(self.handle, host, port)
+        address = server.sockets[0].getsockname()
+        log.info("🌐 Serving %d rows of %s on http://%s:%d/", len(self.dataset), self.metadata.get("SN", "?"),
+                 address[0], address[1])
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    import argparse
+    import webbrowser
+    from app_logging import configure_logging
+
+    parser = argparse.ArgumentParser(description="Serve 7800 data as min/max tiles to a browser viewer")
+    parser.add_argument("files", nargs="+", help=".data files from one instrument")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: this machine only)")
+    parser.add_argument("--port", type=int, default=8780)
+    parser.add_argument("--open", action="store_true", help="Open the viewer in the default browser")
+    args = parser.parse_args()
+
+    configure_logging("INFO")
+    tile_server = TileServer(args.files)
+    if args.open:
+        webbrowser.open(f"http://{'localhost' if args.host in ('127.0.0.1', '0.0.0.0') else args.host}:{args.port}/")
+    try:
+        asyncio.run(tile_server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,66 @@
+from datetime import datetime
+from functools import lru_cache
+
+import pandas as pd
+import pytz
+import matplotlib.pyplot as plt
+from matplotlib.ticker import Formatter, ScalarFormatter
+
+HUMAN_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name):
+    try:
+        return pytz.timezone(name or "UTC")
+    except pytz.UnknownTimeZoneError:
+        return pytz.utc
+
+
+class HumanTimeFormatter(Formatter):
+    """
+    Tick labels for an epoch-seconds axis in the instrument's timezone.
+
+    Labels are memoized per tick value (pans and redraws mostly revisit the same ticks), and the
+    uncached ticks of a draw are converted together in one vectorized call.
+    """
+
+    def __init__(self, tz, fmt=HUMAN_TIME_FORMAT, memo_size=4096):
+        self.tz = get_timezone(tz) if isinstance(tz, str) else tz
+        self.fmt = fmt
+        self.memo_size = memo_size
+        self._labels = {}
+
+    def _convert(self, values):
+        stamps = pd.to_datetime(pd.Series(values, dtype=float), unit="s", utc=True).dt.tz_convert(self.tz)
+        return stamps.dt.strftime(self.fmt).tolist()
+
+    def format_ticks(self, values):
+        missing = [v for v in values if v > 0 and v not in self._labels]
+        if missing:
+            if len(self._labels) + len(missing) > self.memo_size:
+                self._labels.clear()
+            self._labels.update(zip(missing, self._convert(missing)))
+        return [self._labels[v] if v > 0 else "" for v in values]
+
+    def __call__(self, x, pos=None):
+        return self.format_ticks([x])[0]
+
+    def format_data_short(self, value):
+        # Cursor readout: changes on every mouse move, so it bypasses the memo
+        return datetime.fromtimestamp(value, self.tz).strftime(self.fmt) if value > 0 else ""
+
+
+def set_time_axis(ax, human_formatter=None):
+    """
+    Install `human_formatter` (or a plain seconds axis when None) on `ax`, doing nothing if it is
+    already in place, so this can be called on every redraw.
+    """
+    current = ax.xaxis.get_major_formatter()
+    if human_formatter is not None:
+        if current is not human_formatter:
+            ax.xaxis.set_major_formatter(human_formatter)
+    elif type(current) is not ScalarFormatter:
+        ax.xaxis.set_major_locator(plt.AutoLocator())
+        ax.xaxis.set_major_formatter(ScalarFormatter())
+        ax.ticklabel_format(style='sci', axis='x', scilimits=(9, 9))